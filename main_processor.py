@@ -15,7 +15,6 @@ from typing import List, Dict, Optional, Tuple
 from dotenv import load_dotenv
 load_dotenv()  # toto načíta premenné z .env súboru do prostredia
 import schedule
-import newspaper
 import re
 import argparse
 
@@ -24,6 +23,11 @@ from utils.source_relevance import SourceRelevanceTester, DEFAULT_SOURCES
 from utils.article_processor import ArticleProcessor
 from utils.file_manager import FileManager
 from utils.email_processor import EmailProcessor
+from utils.concurrency import ConcurrentProcessor
+from utils.api_key_manager import get_openai_key_pool
+from utils.link_discovery import LinkDiscoverer
+from utils.article_store import ArticleStore, STATE_FAILED, STATE_IRRELEVANT, STATE_PENDING, STATE_SUMMARIZED
+from utils.urls import canonicalize_url
 
 # Konfigurácia loggeru
 logging.basicConfig(
@@ -40,22 +44,57 @@ logger = logging.getLogger("main_processor")
 MAX_SUMMARY_ARTICLES = 5  # Maximálny počet článkov v súhrnnom dokumente
 CYCLE_START_HOUR = 8  # Hodina, kedy sa začína denný cyklus (8:00)
 EMAIL_PROCESSING_DAYS = 1  # Počet dní do minulosti, z ktorých sa majú spracovať e-maily
+MAX_CONCURRENT_ARTICLES = 8  # Globálny limit súbežne spracovávaných článkov
+MAX_CONCURRENT_PER_HOST = 2  # Maximálny počet súbežne spracovávaných článkov z jedného hostu
+MAX_ARTICLES_TO_PROCESS = None  # Voliteľný limit počtu článkov za hodinu (None = bez limitu)
+# Maximálny počet sumarizovaných článkov z jedného zdroja za hodinu (None = všetky relevantné);
+# nastaviteľné cez MAX_HOURLY_ARTICLES, nepublikované relevantné články idú do denného súhrnu
+def _parse_max_hourly_articles(value: Optional[str]) -> Optional[int]:
+    """Načíta limit MAX_HOURLY_ARTICLES; neplatná hodnota alebo hodnota menšia ako 1 znamená bez limitu."""
+    if not value:
+        return None
+    try:
+        limit = int(value)
+    except ValueError:
+        logger.warning(f"Neplatná hodnota MAX_HOURLY_ARTICLES={value!r}, limit sa nepoužije")
+        return None
+    if limit < 1:
+        logger.warning(f"MAX_HOURLY_ARTICLES musí byť aspoň 1 (zadané {limit}), limit sa nepoužije")
+        return None
+    return limit
+
+MAX_HOURLY_ARTICLES = _parse_max_hourly_articles(os.getenv("MAX_HOURLY_ARTICLES"))
 
 class NewsProcessor:
     """Hlavná trieda pre spracovanie správ."""
     
-    def __init__(self):
-        """Inicializácia procesora správ."""
+    def __init__(self, max_workers: int = MAX_CONCURRENT_ARTICLES, max_per_host: int = MAX_CONCURRENT_PER_HOST):
+        """
+        Inicializácia procesora správ.
+        
+        Args:
+            max_workers: Globálny limit súbežne spracovávaných článkov.
+            max_per_host: Limit súbežne spracovávaných článkov z jedného hostu.
+        """
         self.source_tester = SourceRelevanceTester()
         self.article_processor = ArticleProcessor()
         self.file_manager = FileManager()
         self.email_processor = EmailProcessor()
-        self.daily_summary_articles = []  # Zoznam článkov pre denný súhrn
+        self.concurrent_processor = ConcurrentProcessor(max_workers, max_per_host)
+        self.link_discoverer = LinkDiscoverer()
+        self.article_store = ArticleStore()
+        self.pending_articles = []  # Relevantné, ale zatiaľ nesumarizované články z aktuálnej hodiny
         self.current_date = datetime.now().date()
         
         # Vytvorenie priečinkov logs a output, ak neexistujú
         os.makedirs("logs", exist_ok=True)
         os.makedirs("output", exist_ok=True)
+        
+        # Obnovenie zoznamu článkov pre denný súhrn (prežije reštart plánovača)
+        day_start = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        self.daily_summary_articles = self.article_store.load_articles_since(day_start)  # Zoznam článkov pre denný súhrn
+        if self.daily_summary_articles:
+            logger.info(f"Obnovených {len(self.daily_summary_articles)} článkov pre denný súhrn z úložiska.")
     
     def _is_new_day_cycle(self) -> bool:
         """
@@ -69,32 +108,46 @@ class NewsProcessor:
                 (now.date() == self.current_date and now.hour >= CYCLE_START_HOUR and 
                  self.current_date < now.date()))
     
-    def _get_links_from_source(self, source: Dict) -> List[str]:
+    def _get_links_from_source(self, source: Dict) -> List[Dict]:
         """
-        Získa zoznam odkazov na články z daného zdroja.
+        Získa zoznam položiek (odkazov na články) z daného zdroja.
         
         Args:
             source: Dictionary s informáciami o zdroji.
             
         Returns:
-            Zoznam URL adries článkov.
+            Zoznam položiek s kľúčmi 'url', 'title', 'content', 'published'.
         """
         try:
-            # Stiahnutie článkov pomocou newspaper3k
-            news_source = newspaper.build(source['url'], memoize_articles=False)
-            
-            # Získanie odkazov na články
-            article_urls = []
-            for article in news_source.articles:
-                article_urls.append(article.url)
+            # Získanie odkazov podľa stratégie zdroja (feed, autodiscovery alebo odkazy zo stránky)
+            entries = self.link_discoverer.discover(source)
             
-            logger.info(f"Získaných {len(article_urls)} odkazov zo zdroja {source['name']}")
-            return article_urls
+            logger.info(f"Získaných {len(entries)} odkazov zo zdroja {source['name']}")
+            return entries
         
         except Exception as e:
             logger.error(f"Chyba pri získavaní odkazov zo zdroja {source['name']}: {str(e)}")
             return []
     
+    def _add_to_daily_summary(self, articles: List[Dict]) -> None:
+        """
+        Pridá články do zoznamu pre denný súhrn. Článok s rovnakou kanonickou URL adresou
+        nahradí svoju staršiu verziu, takže zoznam neobsahuje duplicity.
+        
+        Args:
+            articles: Zoznam článkov na pridanie.
+        """
+        positions = {canonicalize_url(article.get('store_url', article.get('url', ''))): index
+                     for index, article in enumerate(self.daily_summary_articles)}
+        
+        for article in articles:
+            key = canonicalize_url(article.get('store_url', article.get('url', '')))
+            if key in positions:
+                self.daily_summary_articles[positions[key]] = article
+            else:
+                positions[key] = len(self.daily_summary_articles)
+                self.daily_summary_articles.append(article)
+    
     def _filter_relevant_articles(self, articles: List[Dict]) -> List[Dict]:
         """
         Filtruje a zoraďuje články podľa relevancie.
@@ -135,6 +188,159 @@ class NewsProcessor:
         sorted_articles = sorted(relevant_articles, key=lambda x: x.get('relevance_score', 0), reverse=True)
         return sorted_articles[:MAX_SUMMARY_ARTICLES]
     
+    def _extract_and_score_article(self, url: str, feed_entry: Optional[Dict] = None) -> Optional[Dict]:
+        """
+        Stiahne a extrahuje jeden článok a ohodnotí jeho relevanciu (bez prekladu a sumarizácie).
+        Volá sa súbežne z viacerých vlákien.
+        
+        Args:
+            url: URL adresa článku.
+            feed_entry: Voliteľná položka feedu (ak má dosť textu, článok sa nesťahuje).
+            
+        Returns:
+            Dictionary s extrahovaným článkom a skóre relevancie alebo None v prípade chyby.
+        """
+        try:
+            article_data = self.article_processor.extract_article(url, feed_entry)
+            if not article_data:
+                self.article_store.save(url, STATE_FAILED)
+                return None
+            
+            # Článok, ktorého obsah sa od posledného spracovania nezmenil, sa znovu nespracúva
+            if self.article_store.is_unchanged(url, article_data):
+                logger.info(f"Obsah článku sa nezmenil, preskakujem: {url}")
+                self.article_store.touch(url)
+                return None
+            
+            # Kontrola relevancie článku
+            is_relevant, relevance_score, reason = self.source_tester.check_article_relevance(article_data)
+            
+            # Uloženie skóre a dôvodu
+            article_data['relevance_score'] = relevance_score
+            article_data['relevance_reason'] = reason
+            article_data['is_relevant'] = is_relevant
+            article_data['store_url'] = url
+            
+            self.article_store.save(url, STATE_PENDING if is_relevant else STATE_IRRELEVANT, article_data)
+            return article_data
+        
+        except Exception as e:
+            logger.error(f"Chyba pri spracovaní článku {url}: {str(e)}")
+            self.article_store.save(url, STATE_FAILED)
+            return None
+    
+    def _summarize_article(self, article: Dict) -> Dict:
+        """
+        Preloží a štylizuje extrahovaný článok. Výsledok zapíše priamo do pôvodného dictionary,
+        aby sa prejavil aj v zozname článkov pre denný súhrn. Ak súhrn zlyhá u všetkých poskytovateľov,
+        článok sa uloží ako zlyhaný (v ďalšom behu sa skúsi znovu, kým neminie MAX_ATTEMPTS)
+        a do výstupu sa nedostane.
+        
+        Args:
+            article: Extrahovaný a ohodnotený článok.
+            
+        Returns:
+            Ten istý dictionary doplnený o štylizovaný súhrn (pri zlyhaní bez neho).
+        """
+        if 'stylized_summary' not in article and not article.get('summary_failed'):
+            summary = self.article_processor.summarize_article(article)
+            store_url = article.get('store_url', article['url'])
+            if summary.get('summary_failed'):
+                article['summary_failed'] = True
+                self.article_store.save(store_url, STATE_FAILED)
+            else:
+                article.update(summary)
+                self.article_store.save(store_url, STATE_SUMMARIZED, article)
+        return article
+    
+    def _summarize_articles(self, articles: List[Dict]) -> List[Dict]:
+        """
+        Súbežne sumarizuje články, ktoré ešte nemajú štylizovaný súhrn.
+        
+        Args:
+            articles: Zoznam extrahovaných článkov.
+            
+        Returns:
+            Zoznam úspešne sumarizovaných článkov v pôvodnom poradí.
+        """
+        pending = [article for article in articles
+                   if 'stylized_summary' not in article and not article.get('summary_failed')]
+        if pending:
+            logger.info(f"Sumarizujem {len(pending)} vybraných článkov...")
+            
+            # Dávkový preklad názvov a textov všetkých vybraných článkov naraz
+            self.article_processor.translate_articles(pending)
+            
+            self.concurrent_processor.map_items(self._summarize_article, pending, key=lambda article: article.get('url', ''))
+        
+        return [article for article in articles if 'stylized_summary' in article]
+    
+    def _select_candidates(self, articles: List[Dict]) -> Tuple[List[Dict], List[Dict]]:
+        """
+        Vyberie relevantné články na publikovanie v hodinovom výstupe.
+        
+        Args:
+            articles: Zoznam extrahovaných a ohodnotených článkov.
+            
+        Returns:
+            Dvojica (články na publikovanie, relevantné ale nepublikované články).
+            Oba zoznamy zachovávajú pôvodné poradie článkov.
+        """
+        relevant_articles = [article for article in articles if article.get('is_relevant', False)]
+        
+        if MAX_HOURLY_ARTICLES is None or len(relevant_articles) <= MAX_HOURLY_ARTICLES:
+            return relevant_articles, []
+        
+        # Najrelevantnejšie články (stabilné zoradenie zachová poradie pri rovnakom skóre)
+        ranked = sorted(relevant_articles, key=lambda x: x.get('relevance_score', 0), reverse=True)
+        selected_ids = {id(article) for article in ranked[:MAX_HOURLY_ARTICLES]}
+        
+        selected = [article for article in relevant_articles if id(article) in selected_ids]
+        remaining = [article for article in relevant_articles if id(article) not in selected_ids]
+        return selected, remaining
+    
+    def _process_urls(self, urls: List[str], source_label: str,
+                      feed_entries: Optional[Dict[str, Dict]] = None) -> List[Dict]:
+        """
+        Spracuje URL adresy po etapách: extrakcia, hodnotenie relevancie, výber kandidátov
+        a až nakoniec preklad a sumarizácia vybraných článkov.
+        
+        Relevantné, ale nepublikované články sa uložia (bez súhrnu) do self.pending_articles,
+        aby mohli byť sumarizované neskôr, ak sa dostanú do denného súhrnu.
+        
+        Args:
+            urls: Zoznam URL adries na spracovanie.
+            source_label: Označenie zdroja pre logovanie.
+            feed_entries: Voliteľné položky feedov podľa URL adresy (pre zostavenie článku bez sťahovania).
+            
+        Returns:
+            Zoznam publikovaných (sumarizovaných) relevantných článkov.
+        """
+        # Preskočenie už spracovaných URL adries
+        urls = self.article_store.filter_unprocessed(urls)
+        
+        # 1. a 2. etapa: súbežná extrakcia a hodnotenie relevancie (výsledky sú v pôvodnom poradí)
+        feed_entries = feed_entries or {}
+        results = self.concurrent_processor.map(
+            lambda url: self._extract_and_score_article(url, feed_entries.get(url)), urls)
+        scored_articles = [article for article in results if article]
+        
+        for article in scored_articles:
+            if not article['is_relevant']:
+                logger.info(f"Článok ({source_label}) nie je relevantný: {article['title']} - {article['relevance_reason']}")
+        
+        # 3. etapa: výber kandidátov
+        selected, remaining = self._select_candidates(scored_articles)
+        self.pending_articles.extend(remaining)
+        logger.info(f"Vybraných {len(selected)} článkov ({source_label}) na sumarizáciu, {len(remaining)} relevantných článkov odložených.")
+        
+        # 4. etapa: preklad a sumarizácia len vybraných článkov
+        processed_articles = self._summarize_articles(selected)
+        for article in processed_articles:
+            logger.info(f"Článok ({source_label}) úspešne spracovaný a relevantný: {article['title']}")
+        
+        return processed_articles
+    
     def process_email_sources(self) -> List[Dict]:
         """
         Spracuje zdravotnícke a vedecké zdroje z e-mailovej schránky.
@@ -148,31 +354,8 @@ class NewsProcessor:
         urls = self.email_processor.get_urls_from_emails(days=EMAIL_PROCESSING_DAYS)
         logger.info(f"Získaných {len(urls)} URL adries z e-mailov.")
         
-        # Spracovanie URL adries
-        processed_articles = []
-        
-        for url in urls:
-            try:
-                # Spracovanie článku z URL
-                article_data = self.article_processor.process_article(url)
-                
-                if article_data:
-                    # Kontrola relevancie článku
-                    is_relevant, relevance_score, reason = self.source_tester.check_article_relevance(article_data)
-                    
-                    # Uloženie skóre a dôvodu
-                    article_data['relevance_score'] = relevance_score
-                    article_data['relevance_reason'] = reason
-                    article_data['is_relevant'] = is_relevant
-                    
-                    if is_relevant:
-                        processed_articles.append(article_data)
-                        logger.info(f"URL z e-mailu úspešne spracovaná: {url}")
-                    else:
-                        logger.info(f"URL z e-mailu nie je relevantná: {url} - {reason}")
-            
-            except Exception as e:
-                logger.error(f"Chyba pri spracovaní URL z e-mailu {url}: {str(e)}")
+        # Etapové spracovanie URL adries
+        processed_articles = self._process_urls(urls, "e-mail")
         
         logger.info(f"Spracovaných {len(processed_articles)} relevantných článkov z e-mailov.")
         return processed_articles
@@ -189,6 +372,9 @@ class NewsProcessor:
             self.current_date = datetime.now().date()
             self.daily_summary_articles = []  # Reset zoznamu článkov
         
+        # Reset odložených článkov z predchádzajúcej hodiny
+        self.pending_articles = []
+        
         # Aktuálny čas
         now = datetime.now()
         
@@ -213,11 +399,15 @@ class NewsProcessor:
             # Upload súborov na FTP
             self.file_manager.upload_multiple_to_ftp([docx_file, html_file])
             
-            # Aktualizácia zoznamu článkov pre denný súhrn
-            self.daily_summary_articles.extend(all_articles)
+            # Aktualizácia zoznamu článkov pre denný súhrn (vrátane odložených, zatiaľ nesumarizovaných)
+            self._add_to_daily_summary(all_articles + self.pending_articles)
+            self.pending_articles = []
             
             # Filtrovanie a zoradenie článkov pre súhrn
             summary_articles = self._filter_relevant_articles(self.daily_summary_articles)
+            
+            # Sumarizácia odložených článkov, ktoré sa dostali do denného súhrnu
+            summary_articles = self._summarize_articles(summary_articles)
             logger.info(f"Vybraných {len(summary_articles)} článkov pre denný súhrn.")
             
             # Vytvorenie súhrnných súborov
@@ -229,6 +419,22 @@ class NewsProcessor:
         else:
             logger.warning("Neboli nájdené žiadne relevantné články v tejto hodine.")
         
+        # Štatistiky cache súhrnov a kaskády relevancie (od spustenia)
+        cache_stats = self.article_processor.summary_cache.stats()
+        logger.info(f"Cache súhrnov: {cache_stats['hits']} zásahov, {cache_stats['misses']} miss, {cache_stats['entries']} záznamov")
+        relevance_stats = self.source_tester.relevance_stats()
+        logger.info(f"Kaskáda relevancie: {relevance_stats['articles']} článkov, {relevance_stats['accepted_locally']} prijatých "
+                    f"a {relevance_stats['rejected_locally']} zamietnutých bez AI, {relevance_stats['ai_checks']} AI kontrol "
+                    f"({relevance_stats['ai_calls_avoided']} ušetrených AI volaní)")
+        key_stats = get_openai_key_pool().stats()
+        logger.info(f"OpenAI kľúče: {key_stats['available']}/{key_stats['keys']} dostupných, "
+                    + ", ".join(f"{key}: {stats['requests']} požiadaviek ({stats['throttled']}x 429)"
+                                for key, stats in key_stats['per_key'].items()))
+        for name, stats in self.article_processor.llm_router.stats().items():
+            if stats['queue_wait_avg'] is not None:
+                logger.info(f"LLM {name}: čakanie vo fronte limitera priem. {stats['queue_wait_avg']:.1f}s, "
+                            f"max {stats['queue_wait_max']:.1f}s")
+        
         logger.info("=== Hodinové spracovanie správ ukončené ===")
     
     def process_web_sources(self) -> List[Dict]:
@@ -240,48 +446,30 @@ class NewsProcessor:
         """
         logger.info("Začínam spracovanie webových zdrojov...")
         
-        # Testovanie relevancie zdrojov
-        relevant_sources = []
-        for source in DEFAULT_SOURCES:
-            result = self.source_tester.test_source(source['name'], source['url'])
-            if result['is_relevant']:
-                relevant_sources.append(source)
+        # Testovanie relevancie zdrojov (verdikty sú v cache s TTL, zdroje sa testujú súbežne)
+        results = self.source_tester.test_sources(DEFAULT_SOURCES)
+        relevant_sources = [source for source, result in zip(DEFAULT_SOURCES, results) if result['is_relevant']]
         
         logger.info(f"Identifikovaných {len(relevant_sources)} relevantných zdrojov z {len(DEFAULT_SOURCES)} testovaných.")
         
-        # Získanie odkazov na články
-        all_article_urls = []
-        for source in relevant_sources:
-            article_urls = self._get_links_from_source(source)
-            all_article_urls.extend(article_urls)
+        # Získanie odkazov na články (zdroje sa spracujú súbežne, poradie odkazov zodpovedá poradiu zdrojov)
+        entries_per_source = self.concurrent_processor.map_items(self._get_links_from_source, relevant_sources,
+                                                                 key=lambda source: source['url'])
+        # Položky podľa URL adresy (odstráni duplicitné odkazy, zachováva poradie)
+        feed_entries = {}
+        for entries in entries_per_source:
+            for entry in entries or []:
+                feed_entries.setdefault(entry['url'], entry)
+        all_article_urls = list(feed_entries)
         
         logger.info(f"Celkovo získaných {len(all_article_urls)} odkazov na články.")
         
-        # Spracovanie článkov (kvôli výkonu obmedzíme počet)
-        max_articles_to_process = 20
-        processed_articles = []
+        # Voliteľné obmedzenie počtu článkov
+        if MAX_ARTICLES_TO_PROCESS is not None:
+            all_article_urls = all_article_urls[:MAX_ARTICLES_TO_PROCESS]
         
-        for url in all_article_urls[:max_articles_to_process]:
-            try:
-                article_data = self.article_processor.process_article(url)
-                
-                if article_data:
-                    # Kontrola relevancie článku
-                    is_relevant, relevance_score, reason = self.source_tester.check_article_relevance(article_data)
-                    
-                    # Uloženie skóre a dôvodu
-                    article_data['relevance_score'] = relevance_score
-                    article_data['relevance_reason'] = reason
-                    article_data['is_relevant'] = is_relevant
-                    
-                    if is_relevant:
-                        processed_articles.append(article_data)
-                        logger.info(f"Článok úspešne spracovaný a relevantný: {article_data['title']}")
-                    else:
-                        logger.info(f"Článok nie je relevantný: {article_data['title']} - {reason}")
-            
-            except Exception as e:
-                logger.error(f"Chyba pri spracovaní článku {url}: {str(e)}")
+        # Etapové spracovanie článkov
+        processed_articles = self._process_urls(all_article_urls, "web", feed_entries)
         
         logger.info(f"Spracovaných {len(processed_articles)} relevantných článkov z webových zdrojov.")
         return processed_articles
@@ -307,9 +495,11 @@ def main():
     parser.add_argument('--run-once', action='store_true', help='Spustí spracovanie jedenkrát a skončí')
     parser.add_argument('--web-only', action='store_true', help='Spracuje len webové zdroje')
     parser.add_argument('--email-only', action='store_true', help='Spracuje len e-mailové zdroje')
+    parser.add_argument('--max-workers', type=int, default=MAX_CONCURRENT_ARTICLES, help='Globálny limit súbežne spracovávaných článkov')
+    parser.add_argument('--max-per-host', type=int, default=MAX_CONCURRENT_PER_HOST, help='Limit súbežne spracovávaných článkov z jedného hostu')
     args = parser.parse_args()
     
-    processor = NewsProcessor()
+    processor = NewsProcessor(max_workers=args.max_workers, max_per_host=args.max_per_host)
     
     if args.web_only:
         # Spracovanie len webových zdrojov
@@ -1,20 +1,23 @@
-from utils.news_scraper import scrape_all
+from utils.news_scraper import scrape_all_async
+from utils import http_client
 from utils.logger import logger
 import asyncio
 
 async def main():
     try:
         logger.info("\n🟢 ZAČÍNAM SCRAPOVANIE...")
-        articles = scrape_all()
+        articles, feed_stats = await scrape_all_async()
         
         # Štatistiky
         sources = {art['source'] for art in articles}
         logger.info("\n" + "="*60)
         logger.info("📝 SÚHRN ZDROJOV".center(60))
         logger.info("="*60)
-        for source in sorted(sources):
+        for source in sorted(set(sources) | set(feed_stats)):
             count = sum(1 for art in articles if art['source'] == source)
-            logger.info(f"   • {source.upper():<15}: {count:>3} článkov")
+            stats = feed_stats.get(source)
+            timing = f" | {stats['latency']:.2f}s ({stats['status']})" if stats else ""
+            logger.info(f"   • {source.upper():<15}: {count:>3} článkov{timing}")
         
         logger.info("\n" + "="*60)
         logger.info(f"🟢 SCRAPOVANIE DOKONČENÉ | Celkom {len(articles)} článkov".center(60))
@@ -22,6 +25,8 @@ async def main():
 
     except Exception as e:
         logger.error(f"\n🔴 KRITICKÁ CHYBA: {str(e)}", exc_info=True)
+    finally:
+        await http_client.aclose()
 
 if __name__ == "__main__":
     asyncio.run(main())
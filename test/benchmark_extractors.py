@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Porovnanie backendov extrakcie článkov (rýchlosť a dĺžka textu) nad uloženým korpusom HTML stránok.
+
+Použitie:
+    # Uloženie korpusu (stránky sa stiahnu a uložia do priečinka s korpusom)
+    python test/benchmark_extractors.py --save URL [URL ...]
+
+    # Benchmark nad uloženým korpusom
+    python test/benchmark_extractors.py [--corpus test/html_corpus] [--repeat 3]
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import http_client
+from utils.concurrency import get_host
+from utils.disk_cache import make_key
+from utils.article_processor import ArticleProcessor
+
+DEFAULT_CORPUS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "html_corpus")
+INDEX_FILE = "index.json"
+
+
+def load_index(corpus_dir):
+    path = os.path.join(corpus_dir, INDEX_FILE)
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_corpus(corpus_dir, urls):
+    """Stiahne stránky a uloží ich do korpusu (index.json mapuje súbor -> URL adresa)."""
+    os.makedirs(corpus_dir, exist_ok=True)
+    index = load_index(corpus_dir)
+
+    for url in urls:
+        try:
+            response = http_client.get(url)
+            response.raise_for_status()
+        except Exception as e:
+            print(f"❌ {url}: {e}")
+            continue
+
+        filename = f"{get_host(url)}_{make_key(url)[:12]}.html"
+        with open(os.path.join(corpus_dir, filename), 'w', encoding='utf-8') as f:
+            f.write(response.text)
+        index[filename] = url
+        print(f"✅ {url} -> {filename} ({len(response.text)} znakov)")
+
+    with open(os.path.join(corpus_dir, INDEX_FILE), 'w', encoding='utf-8') as f:
+        json.dump(index, f, ensure_ascii=False, indent=2)
+
+
+def run_benchmark(corpus_dir, repeat):
+    index = load_index(corpus_dir)
+    if not index:
+        print(f"Korpus v {corpus_dir} je prázdny. Najprv ho uložte cez --save URL ...")
+        return
+
+    processor = ArticleProcessor()
+    pages = []
+    for filename, url in index.items():
+        with open(os.path.join(corpus_dir, filename), 'r', encoding='utf-8') as f:
+            pages.append((url, f.read()))
+
+    print(f"Korpus: {len(pages)} stránok, {repeat} opakovaní\n")
+    print(f"{'Backend':<14}{'úspech':>8}{'priem. ms':>12}{'medián ms':>12}{'priem. znakov':>15}")
+
+    # Jednotlivé backendy
+    for name, extractor in processor.extractors.items():
+        timings, lengths, successes = [], [], 0
+        for url, html in pages:
+            best_time = None
+            data = None
+            for _ in range(repeat):
+                started = time.perf_counter()
+                try:
+                    data = extractor.extract(url, html)
+                except Exception:
+                    data = None
+                elapsed = (time.perf_counter() - started) * 1000
+                best_time = elapsed if best_time is None else min(best_time, elapsed)
+            timings.append(best_time)
+            text = (data or {}).get('text') or ''
+            if text.strip():
+                successes += 1
+                lengths.append(len(text))
+
+        average_length = statistics.mean(lengths) if lengths else 0
+        print(f"{name:<14}{successes:>5}/{len(pages):<2}{statistics.mean(timings):>12.1f}"
+              f"{statistics.median(timings):>12.1f}{average_length:>15.0f}")
+
+    # Reťazec backendov podľa zdroja (tak, ako ho používa ArticleProcessor)
+    print("\nReťazec podľa zdroja:")
+    for url, html in pages:
+        started = time.perf_counter()
+        info = processor.extract_from_html(url, html)
+        elapsed = (time.perf_counter() - started) * 1000
+        if info:
+            print(f"   {elapsed:>8.1f} ms  {info['extractor']:<12} {len(info['text']):>6} znakov  {url}")
+        else:
+            print(f"   {elapsed:>8.1f} ms  {'-':<12} {0:>6} znakov  {url}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Benchmark backendov extrakcie článkov')
+    parser.add_argument('--corpus', default=DEFAULT_CORPUS_DIR, help='Priečinok s korpusom HTML stránok')
+    parser.add_argument('--save', nargs='+', metavar='URL', help='Stiahne a uloží stránky do korpusu')
+    parser.add_argument('--repeat', type=int, default=3, help='Počet opakovaní extrakcie jednej stránky')
+    args = parser.parse_args()
+
+    if args.save:
+        save_corpus(args.corpus, args.save)
+    else:
+        run_benchmark(args.corpus, max(1, args.repeat))
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Testy poolu API kľúčov (výber podľa kvóty, cooldown a vrátenie kľúča pri zrušení požiadavky).
+
+Použitie:
+    python -m pytest test/test_api_key_pool.py
+"""
+
+import asyncio
+import unittest
+from types import SimpleNamespace
+from utils.api_key_manager import ApiKeyPool, parse_reset_duration
+from utils.llm_providers import OpenAICompatibleProvider
+
+KEY_A = "sk-test-key-aaaa"
+KEY_B = "sk-test-key-bbbb"
+
+
+class ApiKeyPoolTest(unittest.TestCase):
+
+    def test_parse_reset_duration(self):
+        self.assertEqual(parse_reset_duration("6m0s"), 360.0)
+        self.assertEqual(parse_reset_duration("1s250ms"), 1.25)
+        self.assertIsNone(parse_reset_duration("soon"))
+
+    def test_prefers_key_with_more_headroom(self):
+        pool = ApiKeyPool([KEY_A, KEY_B, None, KEY_A])
+        self.assertEqual(len(pool), 2)
+        key = pool.acquire()
+        pool.release(key, {'x-ratelimit-limit-requests': '100', 'x-ratelimit-remaining-requests': '10'}, 200)
+        other = pool.acquire()
+        self.assertNotEqual(other, key)
+
+    def test_throttled_key_on_cooldown(self):
+        pool = ApiKeyPool([KEY_A, KEY_B])
+        key = pool.acquire()
+        pool.release(key, {'retry-after': '30'}, 429)
+        self.assertEqual(pool.available_count(), 1)
+        other = pool.acquire()
+        self.assertNotEqual(other, key)
+        pool.release(other, {}, 401)
+        self.assertIsNone(pool.acquire())
+        stats = pool.stats()
+        self.assertEqual(stats['available'], 0)
+        self.assertEqual(stats['per_key']['...' + key[-4:]]['throttled'], 1)
+        self.assertEqual(stats['per_key']['...' + other[-4:]]['errors'], 1)
+
+
+class KeyReleaseOnCancelTest(unittest.TestCase):
+
+    def test_cancelled_request_returns_key(self):
+        async def slow_create(**params):
+            await asyncio.sleep(10)
+
+        client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(
+            with_raw_response=SimpleNamespace(create=slow_create))))
+        pool = ApiKeyPool([KEY_A])
+        provider = OpenAICompatibleProvider("openai", None, "model", key_pool=pool)
+        provider.get_async_client = lambda api_key: client
+
+        async def cancel_request():
+            task = asyncio.ensure_future(provider.acomplete("s", "u", 0.1, 10))
+            await asyncio.sleep(0.02)
+            self.assertEqual(pool.stats()['per_key']['...aaaa']['in_flight'], 1)
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+
+        asyncio.run(cancel_request())
+        self.assertEqual(pool.stats()['per_key']['...aaaa']['in_flight'], 0)
+        self.assertEqual(pool.available_count(), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
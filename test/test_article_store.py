@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Testy úložiska stavu spracovania článkov (prechody stavov, pokusy a obnova denného súhrnu).
+
+Použitie:
+    python -m pytest test/test_article_store.py
+"""
+
+import os
+import sqlite3
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from utils.article_store import (ArticleStore, MAX_ATTEMPTS, STATE_FAILED, STATE_IRRELEVANT,
+                                 STATE_PENDING, STATE_SUMMARIZED)
+
+URL = "https://example.com/clanok"
+
+
+def _article(title: str) -> dict:
+    return {'title': title, 'text': f"Text článku {title}.", 'url': URL}
+
+
+class ArticleStoreStateTest(unittest.TestCase):
+
+    def setUp(self):
+        self.store = ArticleStore(':memory:')
+
+    def tearDown(self):
+        self.store.close()
+
+    def test_failed_attempts_limit_processing(self):
+        for attempt in range(1, MAX_ATTEMPTS + 1):
+            self.assertEqual(self.store.filter_unprocessed([URL]), [URL])
+            self.store.save(URL, STATE_FAILED)
+            self.assertEqual(self.store.get(URL)['attempts'], attempt)
+        self.assertEqual(self.store.filter_unprocessed([URL]), [])
+
+    def test_pending_keeps_attempts_and_done_state_resets(self):
+        self.store.save(URL, STATE_FAILED)
+        self.store.save(URL, STATE_PENDING, _article("A"))
+        self.assertEqual(self.store.get(URL)['attempts'], 1)
+        self.store.save(URL, STATE_FAILED)
+        self.assertEqual(self.store.get(URL)['attempts'], 2)
+        self.store.save(URL, STATE_SUMMARIZED, _article("A"))
+        record = self.store.get(URL)
+        self.assertEqual((record['state'], record['attempts']), (STATE_SUMMARIZED, 0))
+        self.assertIsNotNone(record['summarized_at'])
+
+    def test_done_states_skipped_and_unchanged(self):
+        self.store.save(URL, STATE_IRRELEVANT, _article("A"))
+        self.assertEqual(self.store.filter_unprocessed([URL, URL + "?utm_source=rss"]), [])
+        self.assertTrue(self.store.is_unchanged(URL, _article("A")))
+        self.assertFalse(self.store.is_unchanged(URL, _article("B")))
+
+    def test_new_content_clears_summarized_at(self):
+        self.store.save(URL, STATE_SUMMARIZED, _article("A"))
+        self.store.save(URL, STATE_PENDING, _article("B"))
+        self.assertIsNone(self.store.get(URL)['summarized_at'])
+
+
+class LoadArticlesSinceTest(unittest.TestCase):
+
+    def setUp(self):
+        self.store = ArticleStore(':memory:')
+        self.yesterday = (datetime.now() - timedelta(days=1)).isoformat(timespec='seconds')
+        self.since = datetime.now() - timedelta(hours=1)
+
+    def tearDown(self):
+        self.store.close()
+
+    def _backdate(self, url: str) -> None:
+        self.store._conn.execute("UPDATE articles SET first_seen = ?, updated_at = ?, summarized_at = "
+                                 "CASE WHEN summarized_at IS NULL THEN NULL ELSE ? END WHERE url = ?",
+                                 (self.yesterday, self.yesterday, self.yesterday, url))
+        self.store._conn.commit()
+
+    def test_filters_by_summarized_at(self):
+        old, fresh = URL + "/stary", URL + "/novy"
+        self.store.save(old, STATE_SUMMARIZED, _article("Starý"))
+        self._backdate(old)
+        # Opakovaná kontrola staršieho článku ho do súhrnu nevráti
+        self.store.touch(old)
+        self.store.save(fresh, STATE_SUMMARIZED, _article("Nový"))
+        self.assertEqual([a['title'] for a in self.store.load_articles_since(self.since)], ["Nový"])
+
+    def test_old_pending_article_summarized_today_included(self):
+        self.store.save(URL, STATE_PENDING, _article("A"))
+        self._backdate(URL)
+        self.assertEqual(self.store.load_articles_since(self.since), [])
+        self.store.save(URL, STATE_SUMMARIZED, _article("A"))
+        self.assertEqual([a['title'] for a in self.store.load_articles_since(self.since)], ["A"])
+
+    def test_irrelevant_and_failed_excluded(self):
+        self.store.save(URL + "/1", STATE_IRRELEVANT, _article("1"))
+        self.store.save(URL + "/2", STATE_FAILED, _article("2"))
+        self.assertEqual(self.store.load_articles_since(self.since), [])
+
+
+class MigrationTest(unittest.TestCase):
+
+    def test_adds_summarized_at_column(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "articles.sqlite3")
+            conn = sqlite3.connect(path)
+            conn.execute("CREATE TABLE articles (url TEXT PRIMARY KEY, original_url TEXT, state TEXT NOT NULL, "
+                         "content_hash TEXT, result TEXT, attempts INTEGER NOT NULL DEFAULT 0, "
+                         "first_seen TEXT NOT NULL, updated_at TEXT NOT NULL)")
+            conn.execute("INSERT INTO articles VALUES (?, ?, ?, NULL, '{}', 0, ?, ?)",
+                         (URL, URL, STATE_SUMMARIZED, "2026-01-01T08:00:00", "2026-01-02T08:00:00"))
+            conn.commit()
+            conn.close()
+
+            store = ArticleStore(path)
+            try:
+                self.assertEqual(store.get(URL)['summarized_at'], "2026-01-02T08:00:00")
+            finally:
+                store.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Testy perzistentnej cache DiskCache (TTL a štatistiky zásahov).
+
+Použitie:
+    python -m pytest test/test_disk_cache.py
+"""
+
+import os
+import time
+import tempfile
+import unittest
+from utils.disk_cache import DiskCache
+
+
+class DiskCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = DiskCache(os.path.join(self.tmp.name, "cache.sqlite3"), ttl=None)
+
+    def tearDown(self):
+        self.cache.close()
+        self.tmp.cleanup()
+
+    def test_set_get_and_expiry(self):
+        self.cache.set("a", {"x": 1})
+        self.cache.set("b", "old", ttl=0.01)
+        time.sleep(0.02)
+        self.assertEqual(self.cache.get("a"), {"x": 1})
+        self.assertIsNone(self.cache.get("b"))
+        stats = self.cache.stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['expired']), (1, 1, 1))
+
+    def test_get_first_counts_one_lookup(self):
+        self.cache.set("model-b", "summary")
+        self.assertEqual(self.cache.get_first(["model-a", "model-b"]), "summary")
+        self.assertIsNone(self.cache.get_first(["model-c", "model-d"]))
+        stats = self.cache.stats()
+        self.assertEqual((stats['hits'], stats['misses']), (1, 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Testy vyhľadávania kľúčových slov (porovnávanie bez diakritiky, kmene a kolízie kmeňov).
+
+Použitie:
+    python -m pytest test/test_keyword_matcher.py
+"""
+
+import unittest
+from utils.keyword_matcher import KeywordMatcher, fold
+from utils.source_relevance import KEYWORDS, KEYWORD_VARIANTS
+
+
+class FoldTest(unittest.TestCase):
+
+    def test_removes_diacritics_and_case(self):
+        self.assertEqual(fold("Léčba ŠTÚDIÍ"), "lecba studii")
+        self.assertEqual(fold("Straße"), "strasse")
+
+
+class KeywordMatcherTest(unittest.TestCase):
+
+    def test_exact_prefix_and_multiword_variants(self):
+        matcher = KeywordMatcher(["nemoc", "covid"], {"nemoc": ["nemoc*"], "covid": ["sars cov*"]})
+        self.assertEqual(matcher.matches("Nemocnice hlási nárast prípadov SARS-CoV-2"), {"nemoc", "covid"})
+        self.assertEqual(matcher.matches("Sars bol v roku 2003"), set())
+
+    def test_positions_in_order_of_first_occurrence(self):
+        matcher = KeywordMatcher(["srdce", "mozek"], {"srdce": ["srdc*"], "mozek": ["mozg*"]})
+        hits = matcher.find("Mozgová príhoda a srdce, srdcový sval")
+        self.assertEqual(hits, {"mozek": [0], "srdce": [18, 25]})
+        self.assertEqual(list(hits), ["mozek", "srdce"])
+
+    def test_short_stem_is_exact(self):
+        matcher = KeywordMatcher(["ab"], {"ab": ["ab*"]})
+        self.assertEqual(matcher.matches("abeceda"), set())
+        self.assertEqual(matcher.matches("ab test"), {"ab"})
+
+
+class DefaultVariantsTest(unittest.TestCase):
+
+    def setUp(self):
+        self.matcher = KeywordMatcher(KEYWORDS, KEYWORD_VARIANTS)
+
+    def test_inflected_forms_match(self):
+        self.assertIn("zdraví", self.matcher.matches("Ministerstvo zdravotníctva"))
+        self.assertIn("studie", self.matcher.matches("Podľa novej štúdie"))
+        self.assertIn("věda", self.matcher.matches("Slovenskí vedci"))
+
+    def test_stem_collisions_do_not_match(self):
+        for text in ("Zdravím všetkých čitateľov", "Rozhovor ve studiu", "Nový cardigan na jeseň",
+                     "zdravezpravy.cz", "Kto vede tím", "Vedou ho rodičia"):
+            with self.subTest(text=text):
+                self.assertEqual(self.matcher.matches(text) & {"zdraví", "studie", "srdce", "věda"}, set())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Testy circuit breakera a smerovača LLMRouter (so stub poskytovateľmi, bez siete).
+
+Použitie:
+    python -m pytest test/test_llm_router.py
+"""
+
+import time
+import asyncio
+import unittest
+from utils.llm_providers import CircuitBreaker, LLMProvider, LLMRouter, ProviderError
+
+
+class StubProvider(LLMProvider):
+    """Poskytovateľ, ktorý po oneskorení vráti svoj názov alebo vyhodí chybu."""
+
+    def __init__(self, name: str, delay: float = 0.0, fail: bool = False):
+        super().__init__(name, "key", f"{name}-model")
+        self.delay = delay
+        self.fail = fail
+        self.calls = 0
+
+    def complete(self, system_prompt, user_message, temperature, max_tokens):
+        self.calls += 1
+        time.sleep(self.delay)
+        if self.fail:
+            raise ProviderError(f"{self.name} zlyhal")
+        return self.name
+
+    async def acomplete(self, system_prompt, user_message, temperature, max_tokens):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise ProviderError(f"{self.name} zlyhal")
+        return self.name
+
+
+class CircuitBreakerTest(unittest.TestCase):
+
+    def test_opens_after_threshold(self):
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+        breaker.record_failure()
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+        breaker.record_failure()
+        self.assertEqual(breaker.state, CircuitBreaker.OPEN)
+        self.assertFalse(breaker.allow())
+        self.assertFalse(breaker.is_available())
+
+    def test_half_open_allows_single_trial(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+        breaker.record_failure()
+        self.assertTrue(breaker.is_available())
+        self.assertTrue(breaker.allow())
+        self.assertEqual(breaker.state, CircuitBreaker.HALF_OPEN)
+        self.assertFalse(breaker.allow())
+        self.assertFalse(breaker.is_available())
+
+    def test_trial_success_closes(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+        breaker.record_failure()
+        breaker.allow()
+        breaker.record_success()
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+        self.assertTrue(breaker.allow())
+
+    def test_trial_failure_reopens(self):
+        breaker = CircuitBreaker(failure_threshold=3, reset_timeout=60)
+        breaker.state = CircuitBreaker.HALF_OPEN
+        self.assertTrue(breaker.allow())
+        breaker.record_failure()
+        self.assertEqual(breaker.state, CircuitBreaker.OPEN)
+
+    def test_release_trial_keeps_half_open(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+        breaker.record_failure()
+        breaker.allow()
+        breaker.release_trial()
+        self.assertEqual(breaker.state, CircuitBreaker.HALF_OPEN)
+        self.assertTrue(breaker.is_available())
+        self.assertTrue(breaker.allow())
+
+
+class LLMRouterTest(unittest.TestCase):
+
+    def test_unmeasured_providers_ranked_by_priority(self):
+        router = LLMRouter([StubProvider("first"), StubProvider("second")])
+        self.assertEqual([state.provider.name for state in router._ranked()], ["first", "second"])
+
+    def test_routes_to_fastest_provider(self):
+        router = LLMRouter([StubProvider("slow", delay=0.05), StubProvider("fast")])
+        self.assertEqual(router.complete("s", "u")[1], "slow")
+        # Nemeraný poskytovateľ má predpokladanú latenciu PRIOR_LATENCY - ďalšia požiadavka ide na zmeraného
+        router._record_success(router._states[1], 0.01)
+        self.assertEqual(router.complete("s", "u")[1], "fast")
+        self.assertEqual([state.provider.name for state in router._ranked()], ["fast", "slow"])
+
+    def test_falls_back_on_failure(self):
+        broken = StubProvider("broken", fail=True)
+        router = LLMRouter([broken, StubProvider("backup")])
+        self.assertEqual(router.complete("s", "u"), ("backup", "backup"))
+        self.assertEqual(router.stats()["broken"]["failures"], 1)
+
+    def test_cancelled_hedge_releases_half_open_trial(self):
+        slow = StubProvider("slow", delay=0.5)
+        fast = StubProvider("fast")
+        router = LLMRouter([slow, fast], hedge_after=0.1)
+        breaker = router._states[0].breaker
+        breaker.state = CircuitBreaker.HALF_OPEN
+
+        text, provider = asyncio.run(router.acomplete("s", "u"))
+
+        self.assertEqual(provider, "fast")
+        # Pomalší poskytovateľ prehral hedging a jeho požiadavka bola zrušená - nie je to zlyhanie
+        self.assertEqual(breaker.state, CircuitBreaker.HALF_OPEN)
+        self.assertEqual(router.stats()["slow"]["failures"], 0)
+        self.assertTrue(breaker.is_available())
+        self.assertIn(router._states[0], router._ranked())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Testy limitera RPM/TPM (poradie FIFO, rozpočet, vypršanie a zrušenie čakania).
+
+Použitie:
+    python -m pytest test/test_rate_limiter.py
+"""
+
+import time
+import asyncio
+import threading
+import unittest
+from utils import rate_limiter
+from utils.rate_limiter import RateLimiter, RateLimitTimeout
+from utils.llm_providers import OpenAICompatibleProvider, ProviderError
+
+
+class RateLimiterTest(unittest.TestCase):
+
+    def setUp(self):
+        # Krátke okno, aby testy nečakali celú minútu
+        self.window = rate_limiter.WINDOW
+        rate_limiter.WINDOW = 0.2
+
+    def tearDown(self):
+        rate_limiter.WINDOW = self.window
+
+    def test_rpm_budget(self):
+        limiter = RateLimiter(rpm=2)
+        started = time.monotonic()
+        limiter.acquire(1)
+        limiter.acquire(1)
+        self.assertLess(time.monotonic() - started, 0.1)
+        limiter.acquire(1)
+        self.assertGreaterEqual(time.monotonic() - started, 0.15)
+
+    def test_tpm_budget_uses_actual_usage(self):
+        limiter = RateLimiter(tpm=100)
+        reservation = limiter.acquire(80)
+        limiter.record_usage(reservation, 30)
+        started = time.monotonic()
+        limiter.acquire(60)
+        self.assertLess(time.monotonic() - started, 0.1)
+        self.assertEqual(limiter.stats()['tokens_last_minute'], 90)
+
+    def test_fifo_order(self):
+        limiter = RateLimiter(tpm=100)
+        limiter.acquire(60)
+        order = []
+
+        def request(name, tokens):
+            limiter.acquire(tokens)
+            order.append(name)
+
+        big = threading.Thread(target=request, args=("big", 80))
+        big.start()
+        time.sleep(0.02)
+        # Malá požiadavka by sa do rozpočtu zmestila, ale čaká za skoršou veľkou
+        small = threading.Thread(target=request, args=("small", 10))
+        small.start()
+        big.join()
+        small.join()
+        self.assertEqual(order, ["big", "small"])
+
+    def test_timeout_counted(self):
+        limiter = RateLimiter(rpm=1)
+        limiter.acquire(1)
+        with self.assertRaises(RateLimitTimeout):
+            limiter.acquire(1, max_wait=0.05)
+        stats = limiter.stats()
+        self.assertEqual((stats['timeouts'], stats['cancelled'], stats['queued']), (1, 0, 0))
+
+    def test_cancellation_counted_separately(self):
+        limiter = RateLimiter(rpm=1)
+        limiter.acquire(1)
+
+        async def cancel_waiting():
+            task = asyncio.ensure_future(limiter.acquire_async(1))
+            await asyncio.sleep(0.02)
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+
+        asyncio.run(cancel_waiting())
+        stats = limiter.stats()
+        self.assertEqual((stats['timeouts'], stats['cancelled'], stats['queued']), (0, 1, 0))
+        # Zrušené miesto neblokuje frontu
+        limiter.acquire(1, max_wait=0.5)
+        self.assertEqual(limiter.stats()['requests'], 2)
+
+
+class ProviderReservationTest(unittest.TestCase):
+
+    def test_no_reservation_when_all_keys_limited(self):
+        limiter = RateLimiter(rpm=1)
+        provider = OpenAICompatibleProvider("openai", "sk-test-key-0001", "model", rate_limiter=limiter)
+        provider.key_pool._states[0].cooldown_until = time.monotonic() + 60
+        with self.assertRaises(ProviderError):
+            provider.complete("s", "u", 0.1, 10)
+        stats = limiter.stats()
+        self.assertEqual((stats['requests_last_minute'], stats['queued']), (0, 0))
+
+
+if __name__ == "__main__":
+    unittest.main()
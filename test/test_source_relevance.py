@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Testy lokálneho hodnotenia relevancie v SourceRelevanceTester (kľúčové slová bez AI kontroly).
+
+Použitie:
+    python -m pytest test/test_source_relevance.py
+"""
+
+import os
+import tempfile
+import unittest
+from utils import source_relevance
+from utils.llm_providers import LLMProvider
+from utils.source_relevance import SourceRelevanceTester
+
+
+class NoAIProvider(LLMProvider):
+    """Poskytovateľ, ktorý test zlyhá, ak sa AI kontrola zavolá."""
+
+    def __init__(self):
+        super().__init__("stub", "key", "stub-model")
+
+    def complete(self, system_prompt, user_message, temperature, max_tokens):
+        raise AssertionError("AI kontrola sa nemala volať")
+
+    async def acomplete(self, system_prompt, user_message, temperature, max_tokens):
+        raise AssertionError("AI kontrola sa nemala volať")
+
+
+class SourceRelevanceKeywordsTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.paths = (source_relevance.AI_RELEVANCE_CACHE_PATH, source_relevance.SOURCE_VERDICT_CACHE_PATH)
+        source_relevance.AI_RELEVANCE_CACHE_PATH = os.path.join(self.tmp.name, "ai.sqlite3")
+        source_relevance.SOURCE_VERDICT_CACHE_PATH = os.path.join(self.tmp.name, "sources.sqlite3")
+        self.tester = SourceRelevanceTester(ai_provider=NoAIProvider())
+
+    def tearDown(self):
+        self.tester.ai_cache.close()
+        self.tester.source_cache.close()
+        source_relevance.AI_RELEVANCE_CACHE_PATH, source_relevance.SOURCE_VERDICT_CACHE_PATH = self.paths
+        self.tmp.cleanup()
+
+    def test_find_keywords_in_html(self):
+        html = "<html><body>\n<h1>Nová štúdia</h1>\n<p>Liečba rakoviny a <b>prevencia</b> ochorení.</p>\n</body></html>"
+        self.assertEqual(self.tester.find_keywords(html), {"studie", "léčba", "nádor", "prevence", "nemoc"})
+        self.assertEqual(self.tester.find_keywords(""), set())
+
+    def test_score_article_weights_and_reasons(self):
+        article = {'title': "Nová štúdia o srdci", 'text': "Kardiológovia skúmali srdcové choroby.",
+                   'url': "https://example.sk/zdravie/clanok"}
+        score, reasons = self.tester.score_article(article)
+        # Názov: studie, srdce (2 x 2); text: srdce, nemoc (2 x 1); URL: zdraví (1)
+        self.assertEqual(score, 7)
+        self.assertEqual(reasons[0], "Názov obsahuje kľúčové slová: studie, srdce")
+
+    def test_clear_cases_decided_without_ai(self):
+        relevant = {'title': "Nová štúdia o liečbe rakoviny", 'text': "Výskum onkológov.", 'url': ""}
+        irrelevant = {'title': "Futbalový zápas", 'text': "Domáci vyhrali 2:1.", 'url': ""}
+        self.assertTrue(self.tester.check_article_relevance(relevant)[0])
+        self.assertFalse(self.tester.check_article_relevance(irrelevant)[0])
+        stats = self.tester.relevance_stats()
+        self.assertEqual((stats['accepted_locally'], stats['rejected_locally'], stats['ai_checks']), (1, 1, 0))
+
+
+if __name__ == "__main__":
+    unittest.main()
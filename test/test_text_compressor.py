@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Testy odstraňovania balastu z textu článku pred sumarizáciou.
+
+Použitie:
+    python -m pytest test/test_text_compressor.py
+"""
+
+import unittest
+from utils.text_compressor import strip_boilerplate
+
+
+class StripBoilerplateTest(unittest.TestCase):
+
+    def test_removes_subscription_prompts(self):
+        text = "Prihláste sa na odber noviniek.\nNewsletter Zdravie\nSubscribe to our newsletter\nObsah článku."
+        self.assertEqual(strip_boilerplate(text), "Obsah článku.")
+
+    def test_keeps_article_paragraphs_mentioning_newsletter(self):
+        text = ("Ministerstvo zdravotníctva bude o očkovaní informovať aj cez newsletter.\n"
+                "Lekári odporúčajú, aby ho pacienti odoberali.")
+        self.assertEqual(strip_boilerplate(text), text.replace("\n", "\n\n"))
+
+    def test_author_bio_only_at_paragraph_start(self):
+        text = "Je redaktorkou denníka.\nMUDr. Novák je redaktorom odborného časopisu."
+        self.assertEqual(strip_boilerplate(text), "MUDr. Novák je redaktorom odborného časopisu.")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,4 +1,34 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Modul pre správu API kľúčov.
+Implementuje pool kľúčov, ktorý rozkladá požiadavky medzi všetky nakonfigurované kľúče
+podľa zostávajúcej kvóty z hlavičiek x-ratelimit-* a dočasne vyraďuje obmedzené kľúče.
+"""
+
 import os
+import re
+import time
+import logging
+import threading
+from typing import Dict, Iterable, Mapping, Optional
+from utils.politeness import parse_retry_after
+
+logger = logging.getLogger("api_key_manager")
+
+# Predvolený cooldown kľúča po 429 bez informácie o resete kvóty (sekundy)
+DEFAULT_COOLDOWN = 20.0
+# Cooldown kľúča, ktorý server odmietol (401/403)
+INVALID_KEY_COOLDOWN = 3600.0
+MAX_COOLDOWN = 600.0
+
+_DURATION_PATTERN = re.compile(r'(\d+(?:\.\d+)?)(ms|s|m|h)')
+_DURATION_UNITS = {'ms': 0.001, 's': 1.0, 'm': 60.0, 'h': 3600.0}
+
+_openai_pool = None
+_pool_lock = threading.Lock()
+
 
 def get_openai_api_key():
     keys = [
@@ -6,3 +36,200 @@ def get_openai_api_key():
         os.getenv("OPENAI_API_KEY_IGHI")
     ]
     return next((k for k in keys if k), None)
+
+
+def parse_reset_duration(value: Optional[str]) -> Optional[float]:
+    """
+    Spracuje čas do resetu kvóty z hlavičky x-ratelimit-reset-* (napr. '1s', '6m0s', '20ms').
+
+    Args:
+        value: Hodnota hlavičky.
+
+    Returns:
+        Počet sekúnd alebo None, ak hlavička chýba alebo je neplatná.
+    """
+    if not value:
+        return None
+    parts = _DURATION_PATTERN.findall(value.strip())
+    if not parts:
+        return None
+    return sum(float(number) * _DURATION_UNITS[unit] for number, unit in parts)
+
+
+def _parse_int(value: Optional[str]) -> Optional[int]:
+    try:
+        return int(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+def _mask(key: str) -> str:
+    return f"...{key[-4:]}" if len(key) > 4 else "..."
+
+
+class _KeyState:
+    """Stav jedného kľúča v poole."""
+
+    def __init__(self, key: str):
+        self.key = key
+        self.limit_requests: Optional[int] = None
+        self.remaining_requests: Optional[int] = None
+        self.limit_tokens: Optional[int] = None
+        self.remaining_tokens: Optional[int] = None
+        self.cooldown_until = 0.0
+        self.in_flight = 0
+        self.last_used = 0.0
+        self.requests = 0
+        self.throttled = 0
+        self.errors = 0
+
+    def headroom(self) -> float:
+        """Podiel zostávajúcej kvóty (požiadavky aj tokeny, rozhoduje menší); neznáma kvóta = 1.0."""
+        fractions = [1.0]
+        if self.remaining_requests is not None and self.limit_requests:
+            fractions.append(self.remaining_requests / self.limit_requests)
+        if self.remaining_tokens is not None and self.limit_tokens:
+            fractions.append(self.remaining_tokens / self.limit_tokens)
+        return min(fractions)
+
+
+class ApiKeyPool:
+    """
+    Pool API kľúčov jedného poskytovateľa.
+
+    Každá požiadavka si kľúč vypožičia (acquire) a po odpovedi ho vráti spolu s hlavičkami
+    odpovede (release). Vyberá sa kľúč s najväčšou zostávajúcou kvótou a najmenej súbežnými
+    požiadavkami; kľúč s vyčerpanou kvótou alebo po 429 je do resetu kvóty vyradený.
+    """
+
+    def __init__(self, keys: Iterable[Optional[str]], name: str = "API"):
+        """
+        Inicializácia.
+
+        Args:
+            keys: API kľúče (prázdne hodnoty a duplicity sa vynechajú).
+            name: Názov poskytovateľa (pre logovanie).
+        """
+        self.name = name
+        self._states = [_KeyState(key) for key in dict.fromkeys(key for key in keys if key)]
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._states)
+
+    def available_count(self) -> int:
+        """Vráti počet kľúčov mimo cooldownu."""
+        now = time.monotonic()
+        with self._lock:
+            return sum(1 for state in self._states if state.cooldown_until <= now)
+
+    def acquire(self) -> Optional[str]:
+        """
+        Vypožičia kľúč pre požiadavku (neblokujúce volanie).
+
+        Returns:
+            Kľúč alebo None, ak sú všetky kľúče v cooldowne.
+        """
+        now = time.monotonic()
+        with self._lock:
+            candidates = [state for state in self._states if state.cooldown_until <= now]
+            if not candidates:
+                return None
+            state = max(candidates, key=lambda s: (s.headroom(), -s.in_flight, -s.last_used))
+            state.in_flight += 1
+            state.requests += 1
+            state.last_used = now
+            # Lokálny odhad do prvej odpovede s aktuálnymi hlavičkami
+            if state.remaining_requests is not None:
+                state.remaining_requests = max(0, state.remaining_requests - 1)
+            return state.key
+
+    def release(self, key: str, headers: Optional[Mapping[str, str]] = None,
+                status_code: Optional[int] = None) -> None:
+        """
+        Vráti kľúč do poolu a aktualizuje jeho kvótu podľa hlavičiek odpovede.
+
+        Args:
+            key: Kľúč získaný cez acquire.
+            headers: Hlavičky odpovede (x-ratelimit-*, retry-after), None pri sieťovej chybe.
+            status_code: HTTP stav odpovede.
+        """
+        headers = headers or {}
+        now = time.monotonic()
+        with self._lock:
+            state = next((s for s in self._states if s.key == key), None)
+            if state is None:
+                return
+            state.in_flight = max(0, state.in_flight - 1)
+
+            for attribute, header in (('limit_requests', 'x-ratelimit-limit-requests'),
+                                      ('remaining_requests', 'x-ratelimit-remaining-requests'),
+                                      ('limit_tokens', 'x-ratelimit-limit-tokens'),
+                                      ('remaining_tokens', 'x-ratelimit-remaining-tokens')):
+                value = _parse_int(headers.get(header))
+                if value is not None:
+                    setattr(state, attribute, value)
+
+            cooldown = None
+            if status_code == 429:
+                state.throttled += 1
+                cooldown = min(parse_retry_after(headers.get('retry-after'))
+                               or self._reset_time(state, headers) or DEFAULT_COOLDOWN, MAX_COOLDOWN)
+            elif status_code in (401, 403):
+                state.errors += 1
+                cooldown = INVALID_KEY_COOLDOWN
+            elif state.remaining_requests == 0 or state.remaining_tokens == 0:
+                # Kvóta je vyčerpaná ešte pred 429 - kľúč sa nepoužije do resetu
+                reset = self._reset_time(state, headers)
+                cooldown = min(reset, MAX_COOLDOWN) if reset else None
+
+            if cooldown:
+                state.cooldown_until = max(state.cooldown_until, now + cooldown)
+                logger.warning(f"{self.name} kľúč {_mask(key)}: cooldown {cooldown:.1f}s"
+                               f"{f' (HTTP {status_code})' if status_code else ''}")
+
+    @staticmethod
+    def _reset_time(state: _KeyState, headers: Mapping[str, str]) -> Optional[float]:
+        """Čas do resetu vyčerpanej kvóty podľa hlavičiek x-ratelimit-reset-*."""
+        resets = []
+        if state.remaining_requests == 0:
+            resets.append(parse_reset_duration(headers.get('x-ratelimit-reset-requests')))
+        if state.remaining_tokens == 0:
+            resets.append(parse_reset_duration(headers.get('x-ratelimit-reset-tokens')))
+        resets = [reset for reset in resets if reset]
+        return max(resets) if resets else None
+
+    def stats(self) -> Dict:
+        """
+        Vráti stav poolu.
+
+        Returns:
+            Dictionary {'keys': počet, 'available': počet kľúčov mimo cooldownu,
+            'per_key': {maskovaný kľúč: {'requests', 'throttled', 'errors', 'in_flight',
+            'remaining_requests', 'remaining_tokens', 'cooldown_for'}}}.
+        """
+        now = time.monotonic()
+        with self._lock:
+            per_key = {_mask(state.key): {'requests': state.requests, 'throttled': state.throttled,
+                                          'errors': state.errors, 'in_flight': state.in_flight,
+                                          'remaining_requests': state.remaining_requests,
+                                          'remaining_tokens': state.remaining_tokens,
+                                          'cooldown_for': max(0.0, state.cooldown_until - now)}
+                       for state in self._states}
+            available = sum(1 for state in self._states if state.cooldown_until <= now)
+        return {'keys': len(self._states), 'available': available, 'per_key': per_key}
+
+
+def get_openai_key_pool() -> ApiKeyPool:
+    """
+    Vráti zdieľaný pool OpenAI kľúčov (OPENAI_API_KEY_TASR, OPENAI_API_KEY_IGHI).
+
+    Returns:
+        Inštancia ApiKeyPool.
+    """
+    global _openai_pool
+    with _pool_lock:
+        if _openai_pool is None:
+            _openai_pool = ApiKeyPool([os.getenv("OPENAI_API_KEY_TASR"), os.getenv("OPENAI_API_KEY_IGHI")],
+                                      name="OpenAI")
+        return _openai_pool
@@ -6,18 +6,30 @@ Modul pre sťahovanie a spracovanie článkov zo zdravotníckych a vedeckých zd
 Implementuje sťahovanie, extrakciu, preklad do slovenčiny a štylizáciu textov.
 """
 
-import requests
 import logging
 import re
+from abc import ABC, abstractmethod
 from typing import Dict, List, Optional, Tuple
 from bs4 import BeautifulSoup
-from newspaper import Article
-import openai
+from newspaper import Article, Config
+import httpx
+try:
+    import trafilatura
+except ImportError:  # Voliteľná závislosť - bez nej sa použije len newspaper3k
+    trafilatura = None
 import os
 # Načítanie premenných z .env súboru
 from dotenv import load_dotenv
 load_dotenv()  # toto načíta premenné z .env súboru do prostredia
 from datetime import datetime
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+from utils.disk_cache import DiskCache, make_key, CACHE_DIR
+from utils.translator import Translator
+from utils.text_compressor import compress_text, count_tokens, load_tokenizer
+from utils.llm_providers import LLMRouter, AllProvidersFailedError, default_summary_providers
+from utils.concurrency import get_host
+from utils import http_client
 
 # Konfigurácia loggeru
 logging.basicConfig(
@@ -30,22 +42,6 @@ logging.basicConfig(
 )
 logger = logging.getLogger("article_processor")
 
-# Načítanie API kľúčov z prostredia
-OPENAI_API_KEY = os.getenv("OPENAI_API_KEY_IGHI")  # Upravené podľa vášho .env
-if not OPENAI_API_KEY:
-    # Skús alternatívny kľúč
-    OPENAI_API_KEY = os.getenv("OPENAI_API_KEY_TASR")
-    if not OPENAI_API_KEY:
-        logger.warning("Žiadny OPENAI_API_KEY nie je nastavený v prostredí!")
-
-# Konfigurácia OpenAI
-openai.api_key = OPENAI_API_KEY
-
-# Načítanie ďalších API kľúčov, ktoré môžu byť potrebné
-GOOGLE_TRANSLATE_API_KEY = os.getenv("GOOGLE_TRANSLATE_API_KEY")
-DEEPL_API_KEY = os.getenv("DEEPL_API_KEY")  # Alternatívny prekladač
-DEEPSEEK_API_KEY = os.getenv("DEEPSEEK_API_KEY")  # Alternatívny AI model
-
 # Načítanie AI promptu pre sumarizáciu
 AI_PROMPT_PATH = "ai_sumar_prompt.txt"
 try:
@@ -69,56 +65,337 @@ except Exception as e:
     Výstup má byť vhodný do podcastu, rádia alebo virálneho statusu na webe.
     """
 
-class ArticleProcessor:
-    """Trieda pre spracovanie článkov."""
+# Štíhla extrakcia článkov: explicitné timeouty, limit veľkosti stránky, bez sťahovania obrázkov
+ARTICLE_TIMEOUT = httpx.Timeout(20.0, connect=5.0)
+ARTICLE_MAX_BYTES = 3 * 1024 * 1024  # 3 MB
+# Surové HTML sa ponechá vo výsledku len pri ladení (KEEP_ARTICLE_HTML=1)
+KEEP_ARTICLE_HTML = os.getenv("KEEP_ARTICLE_HTML", "") == "1"
+
+# Poradie backendov extrakcie podľa hostu (použije sa prvý výsledok s dostatočne dlhým textom)
+MIN_EXTRACTED_TEXT_LENGTH = 200
+DEFAULT_EXTRACTORS = ['trafilatura', 'newspaper']
+SOURCE_EXTRACTORS = {
+    'sme.sk': ['sme', 'trafilatura', 'newspaper'],
+    'webnoviny.sk': ['webnoviny', 'trafilatura', 'newspaper'],
+}
+
+# Minimálna dĺžka čistého textu z feedu (content:encoded / description), pri ktorej sa
+# článok zostaví priamo z položky feedu bez sťahovania a parsovania stránky
+FEED_CONTENT_MIN_LENGTH = int(os.getenv("FEED_CONTENT_MIN_LENGTH", "1500"))
+
+# Rozpočet tokenov textu článku pre súhrn (dlhší text sa zhustí výberom viet)
+SUMMARY_INPUT_TOKENS = int(os.getenv("SUMMARY_INPUT_TOKENS", "3000"))
+
+# Konfigurácia cache štylizovaných súhrnov
+SUMMARY_CACHE_PATH = os.path.join(CACHE_DIR, "summaries.sqlite3")
+SUMMARY_CACHE_TTL = 30 * 24 * 3600  # 30 dní
+SUMMARY_CACHE_MAX_ENTRIES = 5000
+SUMMARY_CACHE_MAX_BYTES = 50 * 1024 * 1024  # 50 MB
+
+def _normalize_for_cache(text: str) -> str:
+    """Normalizuje text pre kľúč cache (medzery a veľkosť písmen)."""
+    return re.sub(r'\s+', ' ', text or '').strip().casefold()
+
+def summary_cache_key(title: str, text: str, model: str, prompt: Optional[str] = None) -> str:
+    """
+    Vytvorí kľúč cache súhrnov z promptu, modelu a normalizovaného názvu a textu.
+    Zmena promptu (ai_sumar_prompt.txt) tak automaticky zneplatní staré záznamy.
+    
+    Args:
+        title: Názov článku (po preklade).
+        text: Text článku (po preklade).
+        model: Názov modelu, ktorý súhrn vygeneroval.
+        prompt: Text systémového promptu. Ak None, použije sa AI_SUMMARY_PROMPT.
+        
+    Returns:
+        Kľúč cache.
+    """
+    prompt = AI_SUMMARY_PROMPT if prompt is None else prompt
+    return make_key("summary", prompt, model, _normalize_for_cache(title), _normalize_for_cache(text))
+
+class Extractor(ABC):
+    """Rozhranie backendu na extrakciu článku z HTML."""
+    
+    name = 'base'
+    
+    @abstractmethod
+    def extract(self, url: str, html: str) -> Optional[Dict]:
+        """
+        Extrahuje článok z HTML.
+        
+        Args:
+            url: URL adresa článku.
+            html: HTML stránky.
+            
+        Returns:
+            Dictionary s kľúčmi 'title', 'text', 'publish_date', 'authors', 'top_image'
+            alebo None, ak backend článok nevie extrahovať.
+        """
+
+class NewspaperExtractor(Extractor):
+    """Extrakcia pomocou newspaper3k (bez sťahovania obrázkov)."""
+    
+    name = 'newspaper'
     
     def __init__(self):
-        """Inicializácia procesora článkov."""
-        self.headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+        self.config = Config()
+        self.config.fetch_images = False
+        self.config.memoize_articles = False
+        self.config.request_timeout = ARTICLE_TIMEOUT.read
+        self.config.browser_user_agent = http_client.USER_AGENT
+    
+    def extract(self, url: str, html: str) -> Optional[Dict]:
+        article = Article(url, config=self.config)
+        article.download(input_html=html)
+        article.parse()
+        return {
+            'title': article.title,
+            'text': article.text,
+            'publish_date': article.publish_date,
+            'authors': article.authors,
+            'top_image': article.top_image,
         }
+
+class TrafilaturaExtractor(Extractor):
+    """Extrakcia pomocou trafilatura (rýchlejšia, funguje aj pre texty mimo angličtiny)."""
+    
+    name = 'trafilatura'
     
-    def download_article(self, url: str) -> Optional[Article]:
+    def extract(self, url: str, html: str) -> Optional[Dict]:
+        if trafilatura is None:
+            return None
+        
+        document = trafilatura.bare_extraction(html, url=url, with_metadata=True,
+                                               include_comments=False, include_tables=False)
+        if document is None:
+            return None
+        data = document if isinstance(document, dict) else document.as_dict()
+        
+        try:
+            publish_date = datetime.fromisoformat(data['date']) if data.get('date') else None
+        except ValueError:
+            publish_date = None
+        
+        return {
+            'title': data.get('title') or '',
+            'text': data.get('text') or '',
+            'publish_date': publish_date,
+            'authors': [author.strip() for author in (data.get('author') or '').split(';') if author.strip()],
+            'top_image': data.get('image') or '',
+        }
+
+class SelectorExtractor(Extractor):
+    """Extrakcia podľa CSS selektorov pre konkrétny zdroj."""
+    
+    def __init__(self, name: str, body_selector: str, title_selector: str = 'h1',
+                 date_selector: Optional[str] = None):
+        """
+        Inicializácia.
+        
+        Args:
+            name: Názov backendu (používa sa v SOURCE_EXTRACTORS).
+            body_selector: CSS selektor prvkov s textom článku (odstavce alebo kontajner).
+            title_selector: CSS selektor nadpisu.
+            date_selector: CSS selektor prvku s dátumom (atribút 'datetime' alebo text v ISO formáte).
+        """
+        self.name = name
+        self.body_selector = body_selector
+        self.title_selector = title_selector
+        self.date_selector = date_selector
+    
+    def extract(self, url: str, html: str) -> Optional[Dict]:
+        soup = BeautifulSoup(html, 'html.parser')
+        elements = soup.select(self.body_selector)
+        if not elements:
+            return None
+        
+        for element in elements:
+            for tag in element(['script', 'style', 'figure', 'aside']):
+                tag.decompose()
+        text = '\n'.join(element.get_text('\n', strip=True) for element in elements)
+        
+        title_element = soup.select_one(self.title_selector)
+        
+        publish_date = None
+        date_element = soup.select_one(self.date_selector) if self.date_selector else None
+        if date_element is not None:
+            try:
+                publish_date = datetime.fromisoformat(date_element.get('datetime') or date_element.get_text(strip=True))
+            except ValueError:
+                pass
+        
+        return {
+            'title': title_element.get_text(' ', strip=True) if title_element else '',
+            'text': text,
+            'publish_date': publish_date,
+            'authors': [],
+            'top_image': '',
+        }
+
+# Backendy s CSS selektormi pre konkrétne zdroje
+SELECTOR_EXTRACTORS = [
+    SelectorExtractor('sme', body_selector='div.article-body p', title_selector='h1'),
+    SelectorExtractor('webnoviny', body_selector='div.article-content', title_selector='h1'),
+]
+
+class ArticleProcessor:
+    """Trieda pre spracovanie článkov."""
+    
+    def __init__(self, keep_html: bool = KEEP_ARTICLE_HTML):
+        """
+        Inicializácia procesora článkov.
+        
+        Args:
+            keep_html: Či sa má vo výsledku extrakcie ponechať surové HTML (na ladenie).
+        """
+        self.keep_html = keep_html
+        self.newspaper_extractor = NewspaperExtractor()
+        self.extractors = {extractor.name: extractor
+                           for extractor in [self.newspaper_extractor, TrafilaturaExtractor(), *SELECTOR_EXTRACTORS]}
+        self.translator = Translator()
+        self.llm_router = LLMRouter(default_summary_providers())
+        if not self.llm_router.stats():
+            logger.warning("Žiadny poskytovateľ AI súhrnov nie je nakonfigurovaný (chýbajú API kľúče)!")
+        self.summary_cache = DiskCache(SUMMARY_CACHE_PATH, ttl=SUMMARY_CACHE_TTL,
+                                       max_entries=SUMMARY_CACHE_MAX_ENTRIES,
+                                       max_bytes=SUMMARY_CACHE_MAX_BYTES)
+        load_tokenizer()
+    
+    def fetch_html(self, url: str) -> Optional[str]:
         """
-        Stiahne a spracuje článok pomocou knižnice newspaper3k.
+        Stiahne HTML článku cez zdieľaný HTTP klient s cache odpovedí.
         
         Args:
             url: URL adresa článku.
             
         Returns:
-            Objekt Article alebo None v prípade chyby.
+            HTML stránky alebo None v prípade chyby.
         """
         try:
-            article = Article(url)
-            article.download()
-            article.parse()
-            return article
+            return http_client.get_cached_text(url, timeout=ARTICLE_TIMEOUT, max_bytes=ARTICLE_MAX_BYTES)
         except Exception as e:
             logger.error(f"Chyba pri sťahovaní článku z {url}: {str(e)}")
             return None
     
-    def extract_article_info(self, article: Article) -> Dict:
+    def extractor_chain(self, url: str) -> List[str]:
+        """
+        Vráti poradie backendov extrakcie pre host URL adresy.
+        
+        Args:
+            url: URL adresa článku.
+            
+        Returns:
+            Zoznam názvov backendov.
+        """
+        host = get_host(url)
+        for domain, chain in SOURCE_EXTRACTORS.items():
+            if host == domain or host.endswith('.' + domain):
+                return chain
+        return DEFAULT_EXTRACTORS
+    
+    def extract_from_html(self, url: str, html: str) -> Optional[Dict]:
         """
-        Extrahuje informácie z článku.
+        Extrahuje článok z HTML backendmi podľa zdroja. Ak backend vráti prázdny
+        alebo príliš krátky text, skúsi sa ďalší; inak sa použije najdlhší výsledok.
         
         Args:
-            article: Objekt Article.
+            url: URL adresa článku.
+            html: HTML stránky.
             
         Returns:
-            Dictionary s informáciami o článku.
+            Dictionary s informáciami o článku alebo None, ak žiadny backend nič nevrátil.
         """
+        best = None
+        for name in self.extractor_chain(url):
+            extractor = self.extractors.get(name)
+            if extractor is None:
+                continue
+            try:
+                data = extractor.extract(url, html)
+            except Exception as e:
+                logger.warning(f"Backend {name} zlyhal pri extrakcii {url}: {str(e)}")
+                continue
+            if not data or not (data.get('text') or '').strip():
+                continue
+            
+            data['extractor'] = name
+            if len(data['text']) >= MIN_EXTRACTED_TEXT_LENGTH:
+                best = data
+                break
+            if best is None or len(data['text']) > len(best['text']):
+                best = data
+        
+        if best is None:
+            logger.warning(f"Žiadny backend nevrátil text článku: {url}")
+            return None
+        
+        parsed = urlparse(url)
         return {
-            'title': article.title,
-            'text': article.text,
-            'publish_date': article.publish_date,
-            'authors': article.authors,
-            'top_image': article.top_image,
-            'url': article.url,
-            'source_url': article.source_url,
-            'keywords': article.keywords,
-            'summary': article.summary,
-            'html': article.html,
-            'language': self._detect_language(article.text)
+            'title': best['title'],
+            'text': best['text'],
+            'publish_date': best['publish_date'],
+            'authors': best['authors'],
+            'top_image': best['top_image'],
+            'url': url,
+            'source_url': f"{parsed.scheme}://{parsed.netloc}",
+            'keywords': [],
+            'summary': '',
+            'html': html if self.keep_html else '',
+            'language': self._detect_language(best['text']),
+            'extractor': best['extractor']
+        }
+    
+    def _clean_feed_content(self, content: str) -> str:
+        """
+        Prevedie HTML obsah položky feedu na čistý text s odstavcami.
+        
+        Args:
+            content: HTML alebo text z feedu.
+            
+        Returns:
+            Čistý text.
+        """
+        soup = BeautifulSoup(content, 'html.parser')
+        for tag in soup(['script', 'style', 'figure', 'figcaption', 'iframe']):
+            tag.decompose()
+        lines = (re.sub(r'[ \t\xa0]+', ' ', line).strip() for line in soup.get_text('\n').splitlines())
+        return '\n'.join(line for line in lines if line)
+    
+    def article_from_feed_entry(self, entry: Dict, min_length: int = FEED_CONTENT_MIN_LENGTH) -> Optional[Dict]:
+        """
+        Zostaví článok priamo z položky feedu, ak obsahuje dostatočne dlhý text.
+        
+        Args:
+            entry: Položka feedu s kľúčmi 'url', 'title', 'content', 'published'.
+            min_length: Minimálna dĺžka čistého textu.
+            
+        Returns:
+            Dictionary s informáciami o článku (rovnaké kľúče ako extract_from_html)
+            alebo None, ak položka nemá dostatok textu.
+        """
+        title = (entry.get('title') or '').strip()
+        text = self._clean_feed_content(entry.get('content') or '')
+        if not title or len(text) < min_length:
+            return None
+        
+        try:
+            publish_date = parsedate_to_datetime(entry['published']) if entry.get('published') else None
+        except (TypeError, ValueError):
+            publish_date = None
+        
+        return {
+            'title': title,
+            'text': text,
+            'publish_date': publish_date,
+            'authors': [],
+            'top_image': '',
+            'url': entry['url'],
+            'source_url': '',
+            'keywords': [],
+            'summary': '',
+            'html': '',
+            'language': self._detect_language(text),
+            'from_feed': True
         }
     
     def _detect_language(self, text: str) -> str:
@@ -166,6 +443,7 @@ class ArticleProcessor:
     def translate_to_slovak(self, text: str, source_lang: str) -> str:
         """
         Preloží text do slovenčiny. Primárne používa DeepL, ak zlyhá, použije Google Translate.
+        Už preložené segmenty sa berú z cache.
         
         Args:
             text: Text na preklad.
@@ -177,69 +455,37 @@ class ArticleProcessor:
         if source_lang == 'sk':
             return text  # Už je v slovenčine
         
-        # Skrátenie textu ak je príliš dlhý (pre prípad API limitov)
-        if len(text) > 10000:
-            text = text[:10000] + "..."
+        return self.translator.translate_batch([text], source_lang)[0]
+    
+    def translate_articles(self, articles: List[Dict]) -> None:
+        """
+        Preloží názvy a texty viacerých článkov naraz (v čo najmenšom počte požiadaviek).
+        Výsledok uloží do kľúčov 'translated_title' a 'translated_text' každého článku.
+        
+        Args:
+            articles: Zoznam článkov na preklad.
+        """
+        to_translate = [article for article in articles
+                        if 'translated_text' not in article and article.get('language', 'sk') != 'sk']
+        if not to_translate:
+            return
         
-        # 1. Pokus: DeepL (primárna metóda)
-        if DEEPL_API_KEY:
-            try:
-                import requests
-                headers = {
-                    'Authorization': f'DeepL-Auth-Key {DEEPL_API_KEY}',
-                    'Content-Type': 'application/json',
-                }
-                data = {
-                    'text': [text],
-                    'target_lang': 'SK',
-                    'source_lang': source_lang.upper() if source_lang != 'en' else 'EN'
-                }
-                response = requests.post('https://api.deepl.com/v2/translate', 
-                                         headers=headers, 
-                                         json=data,
-                                         timeout=30)
-                
-                if response.status_code == 200:
-                    result = response.json()
-                    if 'translations' in result and len(result['translations']) > 0:
-                        logger.info("Text preložený pomocou DeepL API")
-                        return result['translations'][0]['text']
-                logger.warning(f"DeepL API vrátilo chybový kód: {response.status_code}")
-            except Exception as e:
-                logger.warning(f"Chyba pri preklade pomocou DeepL: {str(e)}")
-        else:
-            logger.warning("DEEPL_API_KEY nie je nastavený, skúšam Google Translate")
+        segments = []
+        for article in to_translate:
+            segments.append((article.get('title', ''), article['language']))
+            segments.append((article.get('text', ''), article['language']))
         
-        # 2. Pokus: Google Translate (fallback)
-        if GOOGLE_TRANSLATE_API_KEY:
-            try:
-                import requests
-                url = f"https://translation.googleapis.com/language/translate/v2?key={GOOGLE_TRANSLATE_API_KEY}"
-                payload = {
-                    'q': text,
-                    'target': 'sk',
-                    'source': source_lang
-                }
-                response = requests.post(url, json=payload, timeout=30)
-                
-                if response.status_code == 200:
-                    result = response.json()
-                    if 'data' in result and 'translations' in result['data'] and len(result['data']['translations']) > 0:
-                        logger.info("Text preložený pomocou Google Translate API")
-                        return result['data']['translations'][0]['translatedText']
-                logger.warning(f"Google Translate API vrátilo chybový kód: {response.status_code}")
-            except Exception as e:
-                logger.warning(f"Chyba pri preklade pomocou Google Translate: {str(e)}")
-        else:
-            logger.warning("GOOGLE_TRANSLATE_API_KEY nie je nastavený, preklad nebude vykonaný")
+        translations = self.translator.translate_segments(segments)
+        for index, article in enumerate(to_translate):
+            article['translated_title'] = translations[2 * index]
+            article['translated_text'] = translations[2 * index + 1]
         
-        logger.error("Všetky metódy prekladu zlyhali. Vraciam originálny text.")
-        return text  # Vraciam originálny text, keď zlyhajú všetky možnosti
+        logger.info(f"Preložených {len(to_translate)} článkov v jednej dávke")
     
     def generate_stylized_summary(self, article_info: Dict) -> Dict:
         """
         Generuje štylizovaný súhrn článku podľa zadaného promptu.
-        Postupne skúša: OpenAI, DeepSeek, Anthropic, Gemini.
+        Poskytovateľa (OpenAI, DeepSeek, Anthropic, Gemini) vyberá LLMRouter podľa latencie a dostupnosti.
         
         Args:
             article_info: Informácie o článku.
@@ -247,10 +493,12 @@ class ArticleProcessor:
         Returns:
             Dictionary s pôvodnými informáciami a pridaným štylizovaným súhrnom.
         """
-        # Zaistíme, že máme slovenský text
+        # Zaistíme, že máme slovenský text (preklad mohol prebehnúť dávkovo v translate_articles)
         if article_info['language'] != 'sk':
-            text_to_process = self.translate_to_slovak(article_info['text'], article_info['language'])
-            title_to_process = self.translate_to_slovak(article_info['title'], article_info['language'])
+            if 'translated_text' not in article_info:
+                self.translate_articles([article_info])
+            text_to_process = article_info['translated_text']
+            title_to_process = article_info['translated_title']
         else:
             text_to_process = article_info['text']
             title_to_process = article_info['title']
@@ -263,177 +511,37 @@ class ArticleProcessor:
         result['processed_date'] = datetime.now()
         result['translated_title'] = title_to_process
         
-        # 1. Pokus: OpenAI s primárnym API kľúčom
-        stylized_summary = None
-        
-        if OPENAI_API_KEY:  # Používame primárny kľúč (OPENAI_API_KEY_IGHI)
-            try:
-                # Nastavíme aktuálny kľúč
-                openai.api_key = OPENAI_API_KEY
-                
-                # Použitie OpenAI API na generovanie štylizovaného súhrnu
-                response = openai.chat.completions.create(
-                    model="gpt-4o",
-                    messages=[
-                        {"role": "system", "content": AI_SUMMARY_PROMPT},
-                        {"role": "user", "content": f"Článok:\n\nNázov: {title_to_process}\n\nObsah:\n{text_to_process}"}
-                    ],
-                    temperature=0.7,
-                    max_tokens=1000
-                )
-                
-                stylized_summary = response.choices[0].message.content
-                logger.info("Štylizovaný súhrn vygenerovaný pomocou OpenAI primárneho API")
-            
-            except Exception as e:
-                logger.warning(f"Chyba pri generovaní štylizovaného súhrnu pomocou primárneho OpenAI API: {str(e)}")
+        # Kontrola cache súhrnov (rovnaký text z viacerých portálov či newsletterov); kľúč obsahuje model,
+        # ktorý súhrn vygeneroval, preto sa skúšajú modely poskytovateľov v poradí priority
+        # (jeden dotaz do cache na článok, aby štatistika zásahov nezapočítala minutie za každý model)
+        models = dict.fromkeys(provider.model for provider in self.llm_router.providers())
+        stylized_summary = self.summary_cache.get_first(
+            [summary_cache_key(title_to_process, text_to_process, model) for model in models])
+        if stylized_summary:
+            logger.info("Štylizovaný súhrn načítaný z cache")
         
-        # 2. Pokus: OpenAI s alternatívnym API kľúčom
-        if not stylized_summary and os.getenv("OPENAI_API_KEY_TASR"):
+        # Generovanie cez najrýchlejšieho dostupného poskytovateľa (s circuit breakermi a záložnými poskytovateľmi)
+        if not stylized_summary:
+            # Zhustenie textu do rozpočtu tokenov (bez balastu, úvod a vety s kľúčovými slovami z názvu)
+            compressed_text = compress_text(text_to_process, SUMMARY_INPUT_TOKENS, title=title_to_process)
+            logger.info(f"Text pre súhrn: {count_tokens(compressed_text)} tokenov "
+                        f"({len(compressed_text)} z {len(text_to_process)} znakov)")
             try:
-                # Nastavíme alternatívny kľúč
-                alt_api_key = os.getenv("OPENAI_API_KEY_TASR")
-                openai.api_key = alt_api_key
-                
-                # Použitie OpenAI API na generovanie štylizovaného súhrnu
-                response = openai.chat.completions.create(
-                    model="gpt-4o",
-                    messages=[
-                        {"role": "system", "content": AI_SUMMARY_PROMPT},
-                        {"role": "user", "content": f"Článok:\n\nNázov: {title_to_process}\n\nObsah:\n{text_to_process}"}
-                    ],
+                stylized_summary, provider_name = self.llm_router.complete(
+                    AI_SUMMARY_PROMPT,
+                    f"Článok:\n\nNázov: {title_to_process}\n\nObsah:\n{compressed_text}",
                     temperature=0.7,
                     max_tokens=1000
                 )
-                
-                stylized_summary = response.choices[0].message.content
-                logger.info("Štylizovaný súhrn vygenerovaný pomocou OpenAI alternatívneho API")
-            
-            except Exception as e:
-                logger.warning(f"Chyba pri generovaní štylizovaného súhrnu pomocou alternatívneho OpenAI API: {str(e)}")
-        
-        # 3. Pokus: DeepSeek API
-        if not stylized_summary and os.getenv("DEEPSEEK_API_KEY"):
-            try:
-                import requests
-                
-                headers = {
-                    "Content-Type": "application/json",
-                    "Authorization": f"Bearer {os.getenv('DEEPSEEK_API_KEY')}"
-                }
-                
-                data = {
-                    "model": "deepseek-chat",
-                    "messages": [
-                        {"role": "system", "content": AI_SUMMARY_PROMPT},
-                        {"role": "user", "content": f"Článok:\n\nNázov: {title_to_process}\n\nObsah:\n{text_to_process}"}
-                    ],
-                    "temperature": 0.7,
-                    "max_tokens": 1000
-                }
-                
-                response = requests.post(
-                    "https://api.deepseek.com/v1/chat/completions",
-                    headers=headers,
-                    json=data,
-                    timeout=60
-                )
-                
-                if response.status_code == 200:
-                    response_data = response.json()
-                    if "choices" in response_data and len(response_data["choices"]) > 0:
-                        stylized_summary = response_data["choices"][0]["message"]["content"]
-                        logger.info("Štylizovaný súhrn vygenerovaný pomocou DeepSeek API")
-                else:
-                    logger.warning(f"DeepSeek API vrátilo chybový kód: {response.status_code}")
-            
-            except Exception as e:
-                logger.warning(f"Chyba pri generovaní štylizovaného súhrnu pomocou DeepSeek API: {str(e)}")
-        
-        # 4. Pokus: Anthropic API
-        if not stylized_summary and os.getenv("ANTHROPIC_API_KEY"):
-            try:
-                import requests
-                
-                headers = {
-                    "Content-Type": "application/json",
-                    "x-api-key": os.getenv("ANTHROPIC_API_KEY"),
-                    "anthropic-version": "2023-06-01"
-                }
-                
-                data = {
-                    "model": "claude-3-haiku-20240307",
-                    "max_tokens": 1000,
-                    "temperature": 0.7,
-                    "system": AI_SUMMARY_PROMPT,
-                    "messages": [
-                        {"role": "user", "content": f"Článok:\n\nNázov: {title_to_process}\n\nObsah:\n{text_to_process}"}
-                    ]
-                }
-                
-                response = requests.post(
-                    "https://api.anthropic.com/v1/messages",
-                    headers=headers,
-                    json=data,
-                    timeout=60
-                )
-                
-                if response.status_code == 200:
-                    response_data = response.json()
-                    if "content" in response_data and len(response_data["content"]) > 0:
-                        stylized_summary = response_data["content"][0]["text"]
-                        logger.info("Štylizovaný súhrn vygenerovaný pomocou Anthropic API")
-                else:
-                    logger.warning(f"Anthropic API vrátilo chybový kód: {response.status_code}")
-            
-            except Exception as e:
-                logger.warning(f"Chyba pri generovaní štylizovaného súhrnu pomocou Anthropic API: {str(e)}")
-        
-        # 5. Pokus: Google Gemini API
-        if not stylized_summary and os.getenv("GOOGLE_API_KEY"):
-            try:
-                import requests
-                
-                headers = {
-                    "Content-Type": "application/json"
-                }
-                
-                data = {
-                    "contents": [
-                        {
-                            "parts": [
-                                {"text": AI_SUMMARY_PROMPT},
-                                {"text": f"Článok:\n\nNázov: {title_to_process}\n\nObsah:\n{text_to_process}"}
-                            ]
-                        }
-                    ],
-                    "generationConfig": {
-                        "temperature": 0.7,
-                        "maxOutputTokens": 1000
-                    }
-                }
-                
-                response = requests.post(
-                    f"https://generativelanguage.googleapis.com/v1beta/models/gemini-pro:generateContent?key={os.getenv('GOOGLE_API_KEY')}",
-                    headers=headers,
-                    json=data,
-                    timeout=60
-                )
-                
-                if response.status_code == 200:
-                    response_data = response.json()
-                    if "candidates" in response_data and len(response_data["candidates"]) > 0:
-                        if "content" in response_data["candidates"][0] and "parts" in response_data["candidates"][0]["content"]:
-                            stylized_summary = response_data["candidates"][0]["content"]["parts"][0]["text"]
-                            logger.info("Štylizovaný súhrn vygenerovaný pomocou Google Gemini API")
-                else:
-                    logger.warning(f"Google Gemini API vrátilo chybový kód: {response.status_code}")
-            
-            except Exception as e:
-                logger.warning(f"Chyba pri generovaní štylizovaného súhrnu pomocou Google Gemini API: {str(e)}")
+                logger.info(f"Štylizovaný súhrn vygenerovaný pomocou {provider_name}")
+                model = self.llm_router.provider(provider_name).model
+                self.summary_cache.set(summary_cache_key(title_to_process, text_to_process, model), stylized_summary)
+            except AllProvidersFailedError as e:
+                logger.warning(f"Chyba pri generovaní štylizovaného súhrnu: {str(e)}")
         
         # Spracovanie výsledku
         if stylized_summary:
+            
             # Rozdelenie na sumár a dovetok
             summary_parts = self._split_summary_and_appendix(stylized_summary)
             
@@ -442,7 +550,8 @@ class ArticleProcessor:
             result['appendix_text'] = summary_parts[1]
         else:
             logger.error("Všetky pokusy o generovanie štylizovaného súhrnu zlyhali.")
-            # V prípade zlyhania všetkých API vytvoríme aspoň základný súhrn
+            # V prípade zlyhania všetkých API vytvoríme aspoň základný súhrn (označený ako zlyhaný, nepublikuje sa)
+            result['summary_failed'] = True
             result['stylized_summary'] = "Generovanie súhrnu zlyhalo. Prosím, prečítajte si originálny článok."
             result['summary_text'] = "Generovanie súhrnu zlyhalo. Prosím, prečítajte si originálny článok."
             result['appendix_text'] = "Generovanie dovetku zlyhalo."
@@ -485,31 +594,66 @@ class ArticleProcessor:
         # Ak nie je možné rozdeliť, vrátime celý text ako sumár a prázdny dovetok
         return text.strip(), ""
     
-    def process_article(self, url: str) -> Optional[Dict]:
+    def extract_article(self, url: str, feed_entry: Optional[Dict] = None) -> Optional[Dict]:
         """
-        Kompletne spracuje článok - stiahne, extrahuje informácie, preloží a štylizuje.
+        Stiahne článok a extrahuje z neho informácie (bez prekladu a sumarizácie).
+        Ak položka feedu obsahuje dostatočne dlhý text, článok sa nesťahuje.
         
         Args:
             url: URL adresa článku.
+            feed_entry: Voliteľná položka feedu, z ktorej URL adresa pochádza.
             
         Returns:
-            Dictionary so všetkými informáciami o spracovanom článku alebo None v prípade chyby.
+            Dictionary s extrahovanými informáciami o článku alebo None v prípade chyby.
         """
-        logger.info(f"Spracovávam článok: {url}")
+        if feed_entry:
+            article_info = self.article_from_feed_entry(feed_entry)
+            if article_info:
+                logger.info(f"Článok zostavený z obsahu feedu (bez sťahovania): {url}")
+                return article_info
+        
+        logger.info(f"Extrahujem článok: {url}")
         
         # Stiahnutie článku
-        article = self.download_article(url)
-        if not article:
+        html = self.fetch_html(url)
+        if html is None:
             return None
         
-        # Extrakcia informácií
-        article_info = self.extract_article_info(article)
+        # Extrakcia informácií (backend podľa zdroja, záložné backendy pri prázdnom výsledku)
+        return self.extract_from_html(url, html)
+    
+    def summarize_article(self, article_info: Dict) -> Dict:
+        """
+        Preloží a štylizuje už extrahovaný článok.
         
-        # Generovanie štylizovaného súhrnu
+        Args:
+            article_info: Informácie o článku z extract_article.
+            
+        Returns:
+            Dictionary s pôvodnými informáciami a pridaným štylizovaným súhrnom.
+        """
         result = self.generate_stylized_summary(article_info)
-        
         logger.info(f"Článok úspešne spracovaný: {article_info['title']}")
         return result
+    
+    def process_article(self, url: str) -> Optional[Dict]:
+        """
+        Kompletne spracuje článok - stiahne, extrahuje informácie, preloží a štylizuje.
+        
+        Args:
+            url: URL adresa článku.
+            
+        Returns:
+            Dictionary so všetkými informáciami o spracovanom článku alebo None v prípade chyby.
+        """
+        logger.info(f"Spracovávam článok: {url}")
+        
+        article_info = self.extract_article(url)
+        if not article_info:
+            return None
+        
+        # Generovanie štylizovaného súhrnu
+        return self.summarize_article(article_info)
 
 # Príklad použitia
 if __name__ == "__main__":
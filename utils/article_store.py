@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Modul pre trvalé ukladanie stavu spracovaných článkov.
+Implementuje SQLite úložisko (WAL režim) s kľúčom podľa kanonickej URL adresy,
+aby sa rovnaké články nespracovávali opakovane v každom hodinovom behu.
+"""
+
+import os
+import json
+import sqlite3
+import hashlib
+import logging
+import re
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+from utils.urls import canonicalize_url
+
+logger = logging.getLogger("article_store")
+
+# Cesta k databáze so stavom článkov
+ARTICLE_STORE_PATH = os.getenv("ARTICLE_STORE_PATH", os.path.join("data", "articles.sqlite3"))
+
+# Počet hodín, po ktorých sa už spracovaný článok znovu stiahne a skontroluje zmena obsahu
+RECHECK_AFTER_HOURS = 12
+
+# Maximálny počet pokusov o spracovanie článku, ktorého sťahovanie alebo sumarizácia zlyháva
+MAX_ATTEMPTS = 3
+
+# Stavy spracovania článku
+STATE_FAILED = 'failed'  # Sťahovanie, extrakcia alebo generovanie súhrnu zlyhalo
+STATE_IRRELEVANT = 'irrelevant'  # Článok bol ohodnotený ako nerelevantný
+STATE_PENDING = 'pending'  # Relevantný článok, zatiaľ bez súhrnu
+STATE_SUMMARIZED = 'summarized'  # Relevantný článok so štylizovaným súhrnom
+
+# Stavy, pri ktorých sa článok v ďalších behoch preskakuje
+DONE_STATES = (STATE_IRRELEVANT, STATE_PENDING, STATE_SUMMARIZED)
+
+# Kľúče článku, ktoré sa neukladajú do databázy
+EXCLUDED_RESULT_KEYS = {'html'}
+
+
+def compute_content_hash(title: str, text: str) -> str:
+    """
+    Vypočíta hash obsahu článku (názov a text s normalizovanými medzerami).
+
+    Args:
+        title: Názov článku.
+        text: Text článku.
+
+    Returns:
+        SHA-256 hash ako hexadecimálny string.
+    """
+    normalized = re.sub(r'\s+', ' ', f"{title or ''}\n{text or ''}").strip().lower()
+    return hashlib.sha256(normalized.encode('utf-8')).hexdigest()
+
+
+class ArticleStore:
+    """Trieda pre trvalé ukladanie stavu spracovania článkov."""
+
+    def __init__(self, db_path: str = ARTICLE_STORE_PATH, recheck_after_hours: Optional[float] = RECHECK_AFTER_HOURS):
+        """
+        Inicializácia úložiska článkov.
+
+        Args:
+            db_path: Cesta k SQLite databáze.
+            recheck_after_hours: Po koľkých hodinách sa spracovaný článok skontroluje znovu.
+                Ak None, spracované články sa už nikdy znovu nesťahujú.
+        """
+        self.db_path = db_path
+        self.recheck_after_hours = recheck_after_hours
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, timeout=30)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS articles (
+                    url TEXT PRIMARY KEY,
+                    original_url TEXT,
+                    state TEXT NOT NULL,
+                    content_hash TEXT,
+                    result TEXT,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    first_seen TEXT NOT NULL,
+                    updated_at TEXT NOT NULL,
+                    summarized_at TEXT
+                )
+            """)
+            columns = {row['name'] for row in self._conn.execute("PRAGMA table_info(articles)")}
+            if 'summarized_at' not in columns:
+                # Databáza zo staršej verzie - čas sumarizácie sa doplní z času poslednej zmeny
+                self._conn.execute("ALTER TABLE articles ADD COLUMN summarized_at TEXT")
+                self._conn.execute("UPDATE articles SET summarized_at = updated_at WHERE state = ?", (STATE_SUMMARIZED,))
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_articles_updated ON articles (updated_at)")
+            self._conn.commit()
+
+    def get(self, url: str) -> Optional[Dict]:
+        """
+        Vráti uložený záznam o článku.
+
+        Args:
+            url: URL adresa článku (nemusí byť kanonická).
+
+        Returns:
+            Dictionary so záznamom (state, content_hash, result, ...) alebo None.
+        """
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM articles WHERE url = ?", (canonicalize_url(url),)).fetchone()
+
+        if row is None:
+            return None
+
+        record = dict(row)
+        record['result'] = json.loads(record['result']) if record['result'] else None
+        return record
+
+    def _needs_processing(self, record: Optional[Dict], now: datetime) -> bool:
+        """Rozhodne, či sa má článok s daným záznamom spracovať."""
+        if record is None:
+            return True
+
+        if record['state'] == STATE_FAILED:
+            return record['attempts'] < MAX_ATTEMPTS
+
+        if record['state'] in DONE_STATES:
+            if self.recheck_after_hours is None:
+                return False
+            updated_at = datetime.fromisoformat(record['updated_at'])
+            return now - updated_at >= timedelta(hours=self.recheck_after_hours)
+
+        return True
+
+    def filter_unprocessed(self, urls: List[str]) -> List[str]:
+        """
+        Odfiltruje URL adresy, ktoré už boli spracované (a nie je čas ich znovu skontrolovať).
+        Zároveň odstráni duplicity podľa kanonickej URL adresy.
+
+        Args:
+            urls: Zoznam URL adries.
+
+        Returns:
+            Zoznam URL adries na spracovanie v pôvodnom poradí.
+        """
+        now = datetime.now()
+        result = []
+        seen = set()
+
+        for url in urls:
+            canonical = canonicalize_url(url)
+            if canonical in seen:
+                continue
+            seen.add(canonical)
+
+            if self._needs_processing(self.get(url), now):
+                result.append(url)
+
+        skipped = len(urls) - len(result)
+        if skipped:
+            logger.info(f"Preskočených {skipped} už spracovaných alebo duplicitných URL adries")
+        return result
+
+    def save(self, url: str, state: str, article: Optional[Dict] = None) -> None:
+        """
+        Uloží (alebo aktualizuje) stav spracovania článku.
+
+        Args:
+            url: URL adresa článku.
+            state: Stav spracovania (STATE_*).
+            article: Dictionary s údajmi o článku. Ak je uvedený, uloží sa aj jeho hash a výsledok.
+        """
+        canonical = canonicalize_url(url)
+        now = datetime.now().isoformat(timespec='seconds')
+
+        content_hash = None
+        result = None
+        if article is not None:
+            content_hash = compute_content_hash(article.get('title', ''), article.get('text', ''))
+            stored = {key: value for key, value in article.items() if key not in EXCLUDED_RESULT_KEYS}
+            result = json.dumps(stored, ensure_ascii=False, default=str)
+
+        # Zlyhanie zvýši počet pokusov; pending ho zachová (opakovaná extrakcia po zlyhanom súhrne
+        # nesmie pokusy vynulovať), úspešne dokončený článok ho vynuluje
+        attempts_increment = 1 if state == STATE_FAILED else 0
+
+        with self._lock:
+            self._conn.execute("""
+                INSERT INTO articles (url, original_url, state, content_hash, result, attempts, first_seen, updated_at,
+                                      summarized_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(url) DO UPDATE SET
+                    state = excluded.state,
+                    content_hash = COALESCE(excluded.content_hash, articles.content_hash),
+                    result = COALESCE(excluded.result, articles.result),
+                    attempts = CASE WHEN excluded.state = ? THEN articles.attempts + 1
+                                    WHEN excluded.state = ? THEN articles.attempts ELSE 0 END,
+                    updated_at = excluded.updated_at,
+                    summarized_at = CASE WHEN excluded.state = ? THEN excluded.summarized_at
+                                         WHEN excluded.result IS NOT NULL THEN NULL
+                                         ELSE articles.summarized_at END
+            """, (canonical, url, state, content_hash, result, attempts_increment, now, now,
+                  now if state == STATE_SUMMARIZED else None, STATE_FAILED, STATE_PENDING, STATE_SUMMARIZED))
+            self._conn.commit()
+
+    def is_unchanged(self, url: str, article: Dict) -> bool:
+        """
+        Zistí, či sa obsah článku od posledného spracovania nezmenil.
+
+        Args:
+            url: URL adresa článku.
+            article: Novo extrahovaný článok.
+
+        Returns:
+            True ak je článok už spracovaný a má rovnaký hash obsahu.
+        """
+        record = self.get(url)
+        if record is None or record['state'] not in DONE_STATES:
+            return False
+        return record['content_hash'] == compute_content_hash(article.get('title', ''), article.get('text', ''))
+
+    def touch(self, url: str) -> None:
+        """
+        Aktualizuje čas poslednej kontroly článku bez zmeny stavu.
+
+        Args:
+            url: URL adresa článku.
+        """
+        with self._lock:
+            self._conn.execute("UPDATE articles SET updated_at = ? WHERE url = ?",
+                               (datetime.now().isoformat(timespec='seconds'), canonicalize_url(url)))
+            self._conn.commit()
+
+    def load_articles_since(self, since: datetime) -> List[Dict]:
+        """
+        Načíta relevantné články sumarizované od daného času a odložené články prvýkrát zaznamenané
+        od daného času. Rozhoduje čas sumarizácie, nie čas poslednej kontroly (touch), takže
+        opakovane kontrolované staršie články sa do denného súhrnu nevrátia.
+        Používa sa na obnovenie denného súhrnu po reštarte plánovača.
+
+        Args:
+            since: Začiatok časového intervalu.
+
+        Returns:
+            Zoznam článkov v poradí, v akom boli prvýkrát zaznamenané.
+        """
+        with self._lock:
+            rows = self._conn.execute("""
+                SELECT result FROM articles
+                WHERE state IN (?, ?) AND COALESCE(summarized_at, first_seen) >= ? AND result IS NOT NULL
+                ORDER BY first_seen, url
+            """, (STATE_PENDING, STATE_SUMMARIZED, since.isoformat(timespec='seconds'))).fetchall()
+
+        return [json.loads(row['result']) for row in rows]
+
+    def close(self) -> None:
+        """Zatvorí spojenie s databázou."""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Modul pre súbežné spracovanie úloh (sťahovanie a spracovanie článkov).
+Implementuje ohraničený pool vlákien s globálnym limitom a limitom na jeden host.
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, List, Optional, TypeVar
+from urllib.parse import urlparse
+
+logger = logging.getLogger("concurrency")
+
+# Predvolené limity súbežnosti
+DEFAULT_MAX_WORKERS = 8  # Globálny limit súbežne spracovávaných úloh
+DEFAULT_MAX_PER_HOST = 2  # Maximálny počet súbežných úloh na jeden host
+
+T = TypeVar("T")
+I = TypeVar("I")
+
+
+def get_host(url: str) -> str:
+    """
+    Vráti host z URL adresy (bez 'www.').
+
+    Args:
+        url: URL adresa.
+
+    Returns:
+        Názov hostu v malých písmenách alebo prázdny string.
+    """
+    try:
+        host = urlparse(url).netloc.lower()
+    except Exception:
+        return ""
+    return host[4:] if host.startswith("www.") else host
+
+
+class ConcurrentProcessor:
+    """Trieda pre súbežné spracovanie URL adries s limitom na host."""
+
+    def __init__(self, max_workers: int = DEFAULT_MAX_WORKERS, max_per_host: int = DEFAULT_MAX_PER_HOST):
+        """
+        Inicializácia súbežného procesora.
+
+        Args:
+            max_workers: Globálny limit súbežne bežiacich úloh.
+            max_per_host: Limit súbežných úloh pre jeden host.
+        """
+        self.max_workers = max(1, max_workers)
+        self.max_per_host = max(1, max_per_host)
+        self._host_semaphores: Dict[str, threading.BoundedSemaphore] = {}
+        self._lock = threading.Lock()
+
+    def _get_host_semaphore(self, host: str) -> threading.BoundedSemaphore:
+        """Vráti (prípadne vytvorí) semafor pre daný host."""
+        with self._lock:
+            if host not in self._host_semaphores:
+                self._host_semaphores[host] = threading.BoundedSemaphore(self.max_per_host)
+            return self._host_semaphores[host]
+
+    def _interleave_by_host(self, hosts: List[str]) -> List[int]:
+        """
+        Zoradí indexy úloh striedavo podľa hostov (round-robin),
+        aby pomalý host neblokoval všetky vlákna poolu.
+
+        Args:
+            hosts: Zoznam hostov jednotlivých úloh.
+
+        Returns:
+            Zoznam indexov v poradí, v akom sa majú úlohy zaradiť.
+        """
+        groups: "OrderedDict[str, List[int]]" = OrderedDict()
+        for index, host in enumerate(hosts):
+            groups.setdefault(host, []).append(index)
+
+        order = []
+        queues = [list(indexes) for indexes in groups.values()]
+        while queues:
+            next_round = []
+            for queue in queues:
+                order.append(queue.pop(0))
+                if queue:
+                    next_round.append(queue)
+            queues = next_round
+        return order
+
+    def _run_with_host_limit(self, func: Callable[[I], T], item: I, host: str) -> T:
+        """Spustí úlohu v rámci limitu pre daný host."""
+        semaphore = self._get_host_semaphore(host)
+        with semaphore:
+            return func(item)
+
+    def map_items(self, func: Callable[[I], T], items: List[I], key: Callable[[I], str]) -> List[Optional[T]]:
+        """
+        Spracuje ľubovoľné položky súbežne a vráti výsledky v pôvodnom poradí.
+
+        Args:
+            func: Funkcia, ktorá spracuje jednu položku.
+            items: Zoznam položiek na spracovanie.
+            key: Funkcia, ktorá z položky vráti jej URL adresu (pre limit na host).
+
+        Returns:
+            Zoznam výsledkov v rovnakom poradí ako vstupné položky.
+            Pri chybe je na danej pozícii None.
+        """
+        results: List[Optional[T]] = [None] * len(items)
+        if not items:
+            return results
+
+        hosts = [get_host(key(item)) for item in items]
+        workers = min(self.max_workers, len(items))
+        logger.info(f"Súbežné spracovanie {len(items)} úloh ({workers} vlákien, max {self.max_per_host} na host)")
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {}
+            for index in self._interleave_by_host(hosts):
+                future = executor.submit(self._run_with_host_limit, func, items[index], hosts[index])
+                futures[future] = index
+
+            for future in as_completed(futures):
+                index = futures[future]
+                try:
+                    results[index] = future.result()
+                except Exception as e:
+                    logger.error(f"Chyba pri súbežnom spracovaní {key(items[index])}: {str(e)}")
+
+        return results
+
+    def map(self, func: Callable[[str], T], urls: List[str]) -> List[Optional[T]]:
+        """
+        Spracuje URL adresy súbežne a vráti výsledky v pôvodnom poradí.
+
+        Args:
+            func: Funkcia, ktorá spracuje jednu URL adresu.
+            urls: Zoznam URL adries na spracovanie.
+
+        Returns:
+            Zoznam výsledkov v rovnakom poradí ako vstupné URL adresy.
+            Pri chybe je na danej pozícii None.
+        """
+        return self.map_items(func, urls, key=lambda url: url)
+
+
+def process_concurrently(func: Callable[[str], T], urls: List[str],
+                         max_workers: int = DEFAULT_MAX_WORKERS,
+                         max_per_host: int = DEFAULT_MAX_PER_HOST) -> List[Optional[T]]:
+    """
+    Skratka pre jednorazové súbežné spracovanie zoznamu URL adries.
+
+    Args:
+        func: Funkcia, ktorá spracuje jednu URL adresu.
+        urls: Zoznam URL adries.
+        max_workers: Globálny limit súbežných úloh.
+        max_per_host: Limit súbežných úloh na jeden host.
+
+    Returns:
+        Zoznam výsledkov v poradí vstupných URL adries.
+    """
+    return ConcurrentProcessor(max_workers, max_per_host).map(func, urls)
@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Modul pre perzistentnú cache na disku.
+Implementuje SQLite cache s TTL, obmedzením veľkosti (LRU vyraďovanie),
+komprimovaným ukladaním hodnôt a počítadlami zásahov.
+"""
+
+import os
+import json
+import zlib
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+from typing import Any, Dict, Iterable, Optional
+
+logger = logging.getLogger("disk_cache")
+
+# Základný priečinok pre cache súbory
+CACHE_DIR = os.getenv("CACHE_DIR", "cache")
+
+# Predvolené limity cache
+DEFAULT_TTL = 7 * 24 * 3600  # 7 dní v sekundách
+DEFAULT_MAX_ENTRIES = 10000
+DEFAULT_MAX_BYTES = 100 * 1024 * 1024  # 100 MB
+
+
+def make_key(*parts: Any) -> str:
+    """
+    Vytvorí kľúč cache ako SHA-256 hash zo zadaných častí.
+
+    Args:
+        parts: Časti kľúča (prevedú sa na string).
+
+    Returns:
+        Hexadecimálny hash.
+    """
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(str(part).encode('utf-8'))
+        digest.update(b'\x1f')  # Oddeľovač, aby ('ab', 'c') != ('a', 'bc')
+    return digest.hexdigest()
+
+
+class DiskCache:
+    """Perzistentná cache na disku s TTL a LRU vyraďovaním."""
+
+    def __init__(self, path: str, ttl: Optional[float] = DEFAULT_TTL,
+                 max_entries: Optional[int] = DEFAULT_MAX_ENTRIES,
+                 max_bytes: Optional[int] = DEFAULT_MAX_BYTES,
+                 compress: bool = True):
+        """
+        Inicializácia cache.
+
+        Args:
+            path: Cesta k SQLite súboru cache.
+            ttl: Predvolená doba platnosti záznamu v sekundách (None = bez expirácie).
+            max_entries: Maximálny počet záznamov (None = bez obmedzenia).
+            max_bytes: Maximálna celková veľkosť uložených hodnôt v bajtoch (None = bez obmedzenia).
+            compress: Či sa majú hodnoty ukladať komprimované (zlib).
+        """
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.compress = compress
+        self._lock = threading.Lock()
+        self._counters = {'hits': 0, 'misses': 0, 'sets': 0, 'evictions': 0, 'expired': 0}
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS entries (
+                    key TEXT PRIMARY KEY,
+                    value BLOB NOT NULL,
+                    size INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    expires_at REAL,
+                    last_access REAL NOT NULL
+                )
+            """)
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_entries_access ON entries (last_access)")
+            self._conn.commit()
+
+    def _encode(self, value: Any) -> bytes:
+        """Serializuje (a prípadne skomprimuje) hodnotu."""
+        data = json.dumps(value, ensure_ascii=False, default=str).encode('utf-8')
+        return zlib.compress(data) if self.compress else data
+
+    def _decode(self, data: bytes) -> Any:
+        """Deserializuje uloženú hodnotu."""
+        if self.compress:
+            data = zlib.decompress(data)
+        return json.loads(data.decode('utf-8'))
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """
+        Vráti hodnotu z cache.
+
+        Args:
+            key: Kľúč záznamu.
+            default: Hodnota, ktorá sa vráti, ak záznam neexistuje alebo expiroval.
+
+        Returns:
+            Uložená hodnota alebo default.
+        """
+        return self.get_first([key], default)
+
+    def get_first(self, keys: Iterable[str], default: Any = None) -> Any:
+        """
+        Vráti hodnotu prvého platného z viacerých kľúčov (napr. ten istý záznam pod rôznymi modelmi).
+        Do štatistík sa započíta ako jeden dotaz - jeden zásah alebo jedno minutie.
+
+        Args:
+            keys: Kľúče v poradí, v akom sa majú skúšať.
+            default: Hodnota, ktorá sa vráti, ak žiadny záznam neexistuje alebo všetky expirovali.
+
+        Returns:
+            Uložená hodnota alebo default.
+        """
+        now = time.time()
+        found = None
+        with self._lock:
+            for key in keys:
+                row = self._conn.execute("SELECT value, expires_at FROM entries WHERE key = ?", (key,)).fetchone()
+                if row is None:
+                    continue
+
+                value, expires_at = row
+                if expires_at is not None and expires_at <= now:
+                    self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                    self._conn.commit()
+                    self._counters['expired'] += 1
+                    continue
+
+                self._conn.execute("UPDATE entries SET last_access = ? WHERE key = ?", (now, key))
+                self._conn.commit()
+                found = (key, value)
+                break
+
+            if found is None:
+                self._counters['misses'] += 1
+                return default
+            self._counters['hits'] += 1
+
+        key, value = found
+        try:
+            return self._decode(value)
+        except Exception as e:
+            logger.warning(f"Poškodený záznam v cache {self.path}: {str(e)}")
+            self.delete(key)
+            return default
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """
+        Uloží hodnotu do cache.
+
+        Args:
+            key: Kľúč záznamu.
+            value: Hodnota (musí byť serializovateľná do JSON).
+            ttl: Doba platnosti v sekundách. Ak None, použije sa predvolená TTL cache.
+        """
+        now = time.time()
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = now + ttl if ttl is not None else None
+        data = self._encode(value)
+
+        with self._lock:
+            self._conn.execute("""
+                INSERT OR REPLACE INTO entries (key, value, size, created_at, expires_at, last_access)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """, (key, sqlite3.Binary(data), len(data), now, expires_at, now))
+            self._counters['sets'] += 1
+            self._evict(now)
+            self._conn.commit()
+
+    def delete(self, key: str) -> None:
+        """
+        Odstráni záznam z cache.
+
+        Args:
+            key: Kľúč záznamu.
+        """
+        with self._lock:
+            self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            self._conn.commit()
+
+    def _evict(self, now: float) -> None:
+        """Odstráni expirované záznamy a najdlhšie nepoužité záznamy nad limitom (volá sa so zámkom)."""
+        cursor = self._conn.execute("DELETE FROM entries WHERE expires_at IS NOT NULL AND expires_at <= ?", (now,))
+        self._counters['expired'] += max(cursor.rowcount, 0)
+
+        count, total_size = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries").fetchone()
+
+        if self.max_entries is not None and count > self.max_entries:
+            excess = count - self.max_entries
+            self._conn.execute("""
+                DELETE FROM entries WHERE key IN (
+                    SELECT key FROM entries ORDER BY last_access ASC LIMIT ?
+                )
+            """, (excess,))
+            self._counters['evictions'] += excess
+            count, total_size = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries").fetchone()
+
+        if self.max_bytes is not None and total_size > self.max_bytes:
+            rows = self._conn.execute("SELECT key, size FROM entries ORDER BY last_access ASC").fetchall()
+            for key, size in rows:
+                if total_size <= self.max_bytes:
+                    break
+                self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                total_size -= size
+                self._counters['evictions'] += 1
+
+    def clear(self) -> None:
+        """Vymaže všetky záznamy z cache."""
+        with self._lock:
+            self._conn.execute("DELETE FROM entries")
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Vráti štatistiky cache.
+
+        Returns:
+            Dictionary s počítadlami (hits, misses, sets, evictions, expired),
+            počtom záznamov, veľkosťou a úspešnosťou zásahov.
+        """
+        with self._lock:
+            count, total_size = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries").fetchone()
+            stats = dict(self._counters)
+
+        lookups = stats['hits'] + stats['misses']
+        stats['entries'] = count
+        stats['size_bytes'] = total_size
+        stats['hit_rate'] = stats['hits'] / lookups if lookups else 0.0
+        return stats
+
+    def close(self) -> None:
+        """Zatvorí spojenie s databázou cache."""
+        with self._lock:
+            self._conn.close()
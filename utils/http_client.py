@@ -0,0 +1,484 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Modul so zdieľaným HTTP klientom pre všetky sieťové požiadavky projektu.
+Implementuje pool spojení s keep-alive, HTTP/2 (ak je dostupné), komprimovaný prenos,
+jednotné timeouty a spoločný User-Agent, ohľaduplné plánovanie GET požiadaviek na hosty, podmienené požiadavky a cache odpovedí na disku
+so zlučovaním súbežných sťahovaní tej istej URL adresy.
+"""
+
+import os
+import logging
+import threading
+import importlib.util
+from typing import Any, Callable, Dict, Optional, Tuple
+import httpx
+from utils.disk_cache import DiskCache, make_key, CACHE_DIR
+from utils.urls import canonicalize_url
+from utils.politeness import PolitenessScheduler, ROBOTS_TIMEOUT
+
+logger = logging.getLogger("http_client")
+
+# Spoločný User-Agent pre všetky požiadavky
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+
+# Jednotné timeouty (spojenie, čítanie, zápis, čakanie na spojenie z poolu)
+DEFAULT_TIMEOUT = httpx.Timeout(30.0, connect=10.0)
+
+# Limity poolu spojení
+POOL_LIMITS = httpx.Limits(max_connections=64, max_keepalive_connections=32, keepalive_expiry=60.0)
+
+# HTTP/2 len ak je nainštalovaný balík h2 (httpx[http2])
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+# Brotli len ak ho httpx vie dekódovať
+_BROTLI_AVAILABLE = (importlib.util.find_spec("brotli") is not None
+                     or importlib.util.find_spec("brotlicffi") is not None)
+ACCEPT_ENCODING = "gzip, deflate, br" if _BROTLI_AVAILABLE else "gzip, deflate"
+
+DEFAULT_HEADERS = {
+    'User-Agent': USER_AGENT,
+    'Accept-Encoding': ACCEPT_ENCODING,
+    'Accept-Language': 'sk,cs;q=0.9,en;q=0.8',
+}
+
+# Uložené validátory (ETag / Last-Modified) pre podmienené požiadavky
+VALIDATOR_CACHE_PATH = os.path.join(CACHE_DIR, "http_validators.sqlite3")
+VALIDATOR_CACHE_TTL = 30 * 24 * 3600  # 30 dní
+
+# Cache odpovedí pre sťahovanie článkov (komprimované, s TTL a LRU limitom veľkosti)
+RESPONSE_CACHE_DIR = os.getenv("HTTP_CACHE_DIR", os.path.join(CACHE_DIR, "http"))
+RESPONSE_CACHE_TTL = 6 * 3600  # 6 hodín
+RESPONSE_CACHE_MAX_BYTES = 200 * 1024 * 1024  # 200 MB
+RESPONSE_CACHE_MAX_ENTRIES = 20000
+
+# Opakovanie GET požiadavky po 429/503, ak server žiada kratší odstup ako MAX_RETRY_WAIT
+MAX_RETRIES = 2
+MAX_RETRY_WAIT = 30.0
+
+_client: Optional[httpx.Client] = None
+_async_client: Optional[httpx.AsyncClient] = None
+_validator_cache: Optional[DiskCache] = None
+_response_cache: Optional[DiskCache] = None
+_scheduler: Optional[PolitenessScheduler] = None
+_lock = threading.Lock()
+
+
+class _Call:
+    """Prebiehajúce volanie v rámci SingleFlight."""
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    Zlučovanie súbežných volaní s rovnakým kľúčom: prvé vlákno vykoná prácu,
+    ostatné počkajú a dostanú rovnaký výsledok (alebo výnimku).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[str, _Call] = {}
+
+    def do(self, key: str, func: Callable[[], Any]) -> Any:
+        """
+        Vykoná func pre daný kľúč najviac raz naraz.
+
+        Args:
+            key: Kľúč volania (napr. kanonická URL adresa).
+            func: Funkcia bez parametrov, ktorá vykoná prácu.
+
+        Returns:
+            Výsledok funkcie.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = func()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.event.set()
+
+
+_single_flight = SingleFlight()
+
+
+def get_client() -> httpx.Client:
+    """
+    Vráti zdieľaného synchrónneho HTTP klienta (vytvorí ho pri prvom použití).
+    Klient je bezpečný pre použitie z viacerých vlákien.
+
+    Returns:
+        Inštancia httpx.Client.
+    """
+    global _client
+    if _client is None:
+        with _lock:
+            if _client is None:
+                _client = httpx.Client(
+                    headers=DEFAULT_HEADERS,
+                    timeout=DEFAULT_TIMEOUT,
+                    limits=POOL_LIMITS,
+                    http2=HTTP2_AVAILABLE,
+                    follow_redirects=True,
+                )
+                logger.info(f"Vytvorený zdieľaný HTTP klient (HTTP/2: {'áno' if HTTP2_AVAILABLE else 'nie'})")
+    return _client
+
+
+def get_async_client() -> httpx.AsyncClient:
+    """
+    Vráti zdieľaného asynchrónneho HTTP klienta (vytvorí ho pri prvom použití).
+    Klient sa má používať v rámci jednej slučky udalostí.
+
+    Returns:
+        Inštancia httpx.AsyncClient.
+    """
+    global _async_client
+    if _async_client is None:
+        with _lock:
+            if _async_client is None:
+                _async_client = httpx.AsyncClient(
+                    headers=DEFAULT_HEADERS,
+                    timeout=DEFAULT_TIMEOUT,
+                    limits=POOL_LIMITS,
+                    http2=HTTP2_AVAILABLE,
+                    follow_redirects=True,
+                )
+    return _async_client
+
+
+def _fetch_robots(robots_url: str) -> Optional[str]:
+    """Stiahne robots.txt (mimo plánovača, aby sa nezacyklil)."""
+    response = get_client().get(robots_url, timeout=ROBOTS_TIMEOUT)
+    return response.text if response.status_code == 200 else None
+
+
+def get_scheduler() -> PolitenessScheduler:
+    """
+    Vráti zdieľaný plánovač požiadaviek na hosty (vytvorí ho pri prvom použití).
+
+    Returns:
+        Inštancia PolitenessScheduler.
+    """
+    global _scheduler
+    if _scheduler is None:
+        with _lock:
+            if _scheduler is None:
+                _scheduler = PolitenessScheduler(user_agent=USER_AGENT, robots_fetcher=_fetch_robots)
+    return _scheduler
+
+
+def _should_retry(backoff: Optional[float], attempt: int) -> bool:
+    """Rozhodne, či sa má požiadavka po odstupe zopakovať."""
+    return backoff is not None and attempt < MAX_RETRIES and backoff <= MAX_RETRY_WAIT
+
+
+def _polite_request(url: str, send: Callable[[], httpx.Response]) -> httpx.Response:
+    """Vykoná požiadavku cez plánovač (limity hostu, Crawl-delay, odstup pri 429/503)."""
+    scheduler = get_scheduler()
+    attempt = 0
+    while True:
+        scheduler.acquire(url)
+        try:
+            response = send()
+        except BaseException:
+            # Aj pri zrušení (asyncio.CancelledError, napr. timeout wait_for) sa slot musí uvoľniť
+            scheduler.release(url)
+            raise
+        backoff = scheduler.release(url, response.status_code, response.headers.get('Retry-After'))
+        if not _should_retry(backoff, attempt):
+            return response
+        attempt += 1
+
+
+def _polite_get(url: str, **kwargs) -> httpx.Response:
+    """GET požiadavka cez plánovač."""
+    return _polite_request(url, lambda: get_client().get(url, **kwargs))
+
+
+def _read_limited(response: httpx.Response, max_bytes: int) -> bytes:
+    """Načíta telo streamovanej odpovede najviac do max_bytes (zvyšok sa zahodí)."""
+    chunks = []
+    total = 0
+    for chunk in response.iter_bytes():
+        chunks.append(chunk)
+        total += len(chunk)
+        if total >= max_bytes:
+            logger.warning(f"Odpoveď z {response.url} prekročila limit {max_bytes} bajtov, zvyšok sa ignoruje")
+            break
+    return b''.join(chunks)[:max_bytes]
+
+
+def _polite_get_limited(url: str, max_bytes: int, **kwargs) -> Tuple[httpx.Response, bytes]:
+    """
+    GET požiadavka cez plánovač so streamovaním a limitom veľkosti tela odpovede.
+
+    Returns:
+        Dvojica (odpoveď bez načítaného tela, prvých najviac max_bytes bajtov tela).
+    """
+    body = {}
+
+    def send() -> httpx.Response:
+        with get_client().stream('GET', url, **kwargs) as response:
+            body['content'] = _read_limited(response, max_bytes) if response.status_code == 200 else b''
+            return response
+
+    response = _polite_request(url, send)
+    return response, body.get('content', b'')
+
+
+async def _polite_get_async(url: str, **kwargs) -> httpx.Response:
+    """Asynchrónna verzia _polite_get."""
+    scheduler = get_scheduler()
+    attempt = 0
+    while True:
+        await scheduler.acquire_async(url)
+        try:
+            response = await get_async_client().get(url, **kwargs)
+        except BaseException:
+            # Aj pri zrušení (asyncio.CancelledError, napr. timeout wait_for) sa slot musí uvoľniť
+            scheduler.release(url)
+            raise
+        backoff = scheduler.release(url, response.status_code, response.headers.get('Retry-After'))
+        if not _should_retry(backoff, attempt):
+            return response
+        attempt += 1
+
+
+def get(url: str, **kwargs) -> httpx.Response:
+    """
+    Vykoná GET požiadavku cez zdieľaného klienta a plánovač požiadaviek na hosty.
+
+    Args:
+        url: URL adresa.
+        kwargs: Ďalšie parametre pre httpx (headers, params, timeout, ...).
+
+    Returns:
+        Odpoveď servera.
+    """
+    return _polite_get(url, **kwargs)
+
+
+async def aget(url: str, **kwargs) -> httpx.Response:
+    """
+    Asynchrónne vykoná GET požiadavku cez zdieľaného asynchrónneho klienta a plánovač požiadaviek na hosty.
+
+    Args:
+        url: URL adresa.
+        kwargs: Ďalšie parametre pre httpx (headers, params, timeout, ...).
+
+    Returns:
+        Odpoveď servera.
+    """
+    return await _polite_get_async(url, **kwargs)
+
+
+def post(url: str, **kwargs) -> httpx.Response:
+    """
+    Vykoná POST požiadavku cez zdieľaného klienta.
+
+    Args:
+        url: URL adresa.
+        kwargs: Ďalšie parametre pre httpx (json, data, headers, timeout, ...).
+
+    Returns:
+        Odpoveď servera.
+    """
+    return get_client().post(url, **kwargs)
+
+
+async def apost(url: str, **kwargs) -> httpx.Response:
+    """
+    Asynchrónne vykoná POST požiadavku cez zdieľaného asynchrónneho klienta.
+
+    Args:
+        url: URL adresa.
+        kwargs: Ďalšie parametre pre httpx (json, data, headers, timeout, ...).
+
+    Returns:
+        Odpoveď servera.
+    """
+    return await get_async_client().post(url, **kwargs)
+
+
+def _get_validator_cache() -> DiskCache:
+    """Vráti (prípadne vytvorí) cache validátorov podmienených požiadaviek."""
+    global _validator_cache
+    if _validator_cache is None:
+        with _lock:
+            if _validator_cache is None:
+                _validator_cache = DiskCache(VALIDATOR_CACHE_PATH, ttl=VALIDATOR_CACHE_TTL,
+                                             max_entries=5000, max_bytes=None, compress=False)
+    return _validator_cache
+
+
+def _conditional_headers(url: str, namespace: str, headers: Optional[dict]) -> tuple:
+    """Vráti kľúč validátorov a hlavičky doplnené o If-None-Match / If-Modified-Since."""
+    key = make_key("validators", namespace, url)
+    request_headers = dict(headers or {})
+    validators = _get_validator_cache().get(key)
+    if validators:
+        if validators.get('etag'):
+            request_headers['If-None-Match'] = validators['etag']
+        if validators.get('last_modified'):
+            request_headers['If-Modified-Since'] = validators['last_modified']
+    return key, request_headers
+
+
+def _store_validators(key: str, response: httpx.Response) -> None:
+    """Uloží validátory z úspešnej odpovede."""
+    etag = response.headers.get('ETag')
+    last_modified = response.headers.get('Last-Modified')
+    if etag or last_modified:
+        _get_validator_cache().set(key, {'etag': etag, 'last_modified': last_modified})
+
+
+def conditional_get(url: str, namespace: str = "default", **kwargs) -> Optional[httpx.Response]:
+    """
+    Vykoná podmienenú GET požiadavku s uloženými validátormi (ETag / Last-Modified).
+
+    Validátory sa ukladajú zvlášť pre každý menný priestor, aby si rôzni spotrebitelia
+    tej istej URL adresy (napr. test relevancie a získavanie odkazov) navzájom neskrývali zmeny.
+
+    Args:
+        url: URL adresa.
+        namespace: Menný priestor validátorov (napr. 'feed', 'links').
+        kwargs: Ďalšie parametre pre httpx (headers, timeout, ...).
+
+    Returns:
+        Odpoveď servera, alebo None ak sa obsah od posledného stiahnutia nezmenil (HTTP 304).
+    """
+    key, headers = _conditional_headers(url, namespace, kwargs.pop('headers', None))
+    response = _polite_get(url, headers=headers, **kwargs)
+
+    if response.status_code == 304:
+        logger.info(f"Obsah sa nezmenil (304): {url}")
+        return None
+
+    if response.status_code == 200:
+        _store_validators(key, response)
+    return response
+
+
+async def async_conditional_get(url: str, namespace: str = "default", **kwargs) -> Optional[httpx.Response]:
+    """
+    Asynchrónna verzia conditional_get.
+
+    Args:
+        url: URL adresa.
+        namespace: Menný priestor validátorov.
+        kwargs: Ďalšie parametre pre httpx.
+
+    Returns:
+        Odpoveď servera, alebo None pri HTTP 304.
+    """
+    key, headers = _conditional_headers(url, namespace, kwargs.pop('headers', None))
+    response = await _polite_get_async(url, headers=headers, **kwargs)
+
+    if response.status_code == 304:
+        logger.info(f"Obsah sa nezmenil (304): {url}")
+        return None
+
+    if response.status_code == 200:
+        _store_validators(key, response)
+    return response
+
+
+def _get_response_cache() -> DiskCache:
+    """Vráti (prípadne vytvorí) cache odpovedí."""
+    global _response_cache
+    if _response_cache is None:
+        with _lock:
+            if _response_cache is None:
+                _response_cache = DiskCache(os.path.join(RESPONSE_CACHE_DIR, "responses.sqlite3"),
+                                            ttl=RESPONSE_CACHE_TTL, max_entries=RESPONSE_CACHE_MAX_ENTRIES,
+                                            max_bytes=RESPONSE_CACHE_MAX_BYTES, compress=True)
+    return _response_cache
+
+
+def get_cached_text(url: str, ttl: Optional[float] = None, timeout: Optional[httpx.Timeout] = None,
+                    max_bytes: Optional[int] = None) -> str:
+    """
+    Stiahne text stránky s použitím cache odpovedí na disku.
+    Súbežné požiadavky na tú istú URL adresu zdieľajú jedno stiahnutie (single-flight).
+
+    Args:
+        url: URL adresa.
+        ttl: Doba platnosti záznamu v sekundách. Ak None, použije sa RESPONSE_CACHE_TTL.
+        timeout: Timeout požiadavky. Ak None, použije sa DEFAULT_TIMEOUT.
+        max_bytes: Maximálna veľkosť tela odpovede v bajtoch (dlhšie odpovede sa orežú).
+            Ak None, veľkosť nie je obmedzená.
+
+    Returns:
+        Text odpovede.
+
+    Raises:
+        httpx.HTTPError: Pri chybe siete alebo chybovom HTTP stave.
+    """
+    key = make_key("response", canonicalize_url(url))
+    cache = _get_response_cache()
+
+    cached = cache.get(key)
+    if cached is not None:
+        return cached['text']
+
+    request_kwargs = {'timeout': timeout} if timeout is not None else {}
+
+    def download() -> str:
+        # Iné vlákno mohlo medzičasom dokončiť sťahovanie
+        cached = cache.get(key)
+        if cached is not None:
+            return cached['text']
+
+        if max_bytes is None:
+            response = _polite_get(url, **request_kwargs)
+            response.raise_for_status()
+            text = response.text
+        else:
+            response, content = _polite_get_limited(url, max_bytes, **request_kwargs)
+            response.raise_for_status()
+            text = content.decode(response.encoding or 'utf-8', errors='replace')
+
+        cache.set(key, {'url': str(response.url), 'text': text}, ttl=ttl)
+        return text
+
+    return _single_flight.do(key, download)
+
+
+def close() -> None:
+    """Zatvorí zdieľaného synchrónneho klienta (napr. pri ukončení programu)."""
+    global _client
+    with _lock:
+        if _client is not None:
+            _client.close()
+            _client = None
+
+
+async def aclose() -> None:
+    """Zatvorí zdieľaného asynchrónneho klienta."""
+    global _async_client
+    client = _async_client
+    _async_client = None
+    if client is not None:
+        await client.aclose()
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Modul pre rýchle vyhľadávanie kľúčových slov v texte.
+Implementuje index kľúčových slov zostavený raz pri vytvorení: texty aj varianty sa porovnávajú
+bez diakritiky a bez ohľadu na veľkosť písmen, varianty môžu byť kmene (prefixy) pre skloňované
+tvary a jedno kľúčové slovo môže mať varianty vo viacerých jazykoch (sk/cs/en).
+Text sa spracuje jedným prechodom tokenizácie.
+"""
+
+import re
+import unicodedata
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+# Znak na konci variantu, ktorý označuje kmeň (zhoda s každým slovom, ktoré ním začína)
+PREFIX_MARKER = '*'
+
+# Minimálna dĺžka kmeňa (kratšie kmene by zachytávali nesúvisiace slová)
+MIN_STEM_LENGTH = 3
+
+_TOKEN_PATTERN = re.compile(r'\w+')
+
+
+def fold(text: str) -> str:
+    """
+    Normalizuje text pre porovnávanie: odstráni diakritiku a prevedie na malé písmená.
+
+    Args:
+        text: Vstupný text.
+
+    Returns:
+        Normalizovaný text.
+    """
+    decomposed = unicodedata.normalize('NFKD', text)
+    return ''.join(char for char in decomposed if not unicodedata.combining(char)).casefold()
+
+
+# Jeden token vzoru: (normalizovaný tvar, či ide o kmeň)
+_TokenPattern = Tuple[str, bool]
+
+
+class KeywordMatcher:
+    """Index kľúčových slov s podporou variantov, kmeňov a porovnávania bez diakritiky."""
+
+    def __init__(self, keywords: Iterable[str], variants: Optional[Dict[str, Iterable[str]]] = None):
+        """
+        Inicializácia a zostavenie indexu.
+
+        Args:
+            keywords: Kľúčové slová (výsledky find/matches sa vracajú v tomto tvare).
+            variants: Voliteľné varianty kľúčových slov {kľúčové slovo: [varianty]}.
+                Variant ukončený znakom '*' je kmeň (napr. 'nemoc*' zodpovedá 'nemoci', 'nemocnice').
+                Variant môže obsahovať viac slov oddelených medzerou. Samotné kľúčové slovo
+                sa vždy pridá ako presný variant.
+        """
+        self.keywords = list(dict.fromkeys(keywords))
+        variants = variants or {}
+
+        # Index podľa prvého tokenu vzoru: presné tvary a kmene zvlášť
+        self._exact: Dict[str, List[Tuple[Tuple[_TokenPattern, ...], str]]] = {}
+        self._prefixes: Dict[str, List[Tuple[Tuple[_TokenPattern, ...], str]]] = {}
+        for keyword in self.keywords:
+            for variant in [keyword, *variants.get(keyword, [])]:
+                pattern = self._compile_variant(variant)
+                if not pattern:
+                    continue
+                first, is_prefix = pattern[0]
+                target = self._prefixes if is_prefix else self._exact
+                target.setdefault(first, []).append((pattern, keyword))
+
+        # Dĺžky kmeňov, pre ktoré sa pri každom tokene hľadá prefix v indexe
+        self._prefix_lengths = sorted({len(stem) for stem in self._prefixes})
+
+    @staticmethod
+    def _compile_variant(variant: str) -> Tuple[_TokenPattern, ...]:
+        """Rozloží variant na normalizované tokeny a označí kmene."""
+        pattern = []
+        for word in variant.split():
+            is_prefix = word.endswith(PREFIX_MARKER)
+            tokens = _TOKEN_PATTERN.findall(fold(word.rstrip(PREFIX_MARKER)))
+            for index, token in enumerate(tokens):
+                # Kmeňom môže byť len posledná časť slova a musí mať minimálnu dĺžku
+                stem = is_prefix and index == len(tokens) - 1 and len(token) >= MIN_STEM_LENGTH
+                pattern.append((token, stem))
+        return tuple(pattern)
+
+    @staticmethod
+    def _token_matches(token: str, pattern: _TokenPattern) -> bool:
+        value, is_prefix = pattern
+        return token.startswith(value) if is_prefix else token == value
+
+    def _candidates(self, token: str) -> List[Tuple[Tuple[_TokenPattern, ...], str]]:
+        """Vráti vzory, ktorých prvý token zodpovedá danému tokenu textu."""
+        candidates = list(self._exact.get(token, ()))
+        for length in self._prefix_lengths:
+            if length > len(token):
+                break
+            candidates.extend(self._prefixes.get(token[:length], ()))
+        return candidates
+
+    def find(self, text: str) -> Dict[str, List[int]]:
+        """
+        Nájde všetky výskyty kľúčových slov jedným prechodom tokenizácie.
+
+        Args:
+            text: Prehľadávaný text.
+
+        Returns:
+            Dictionary {kľúčové slovo: zoznam pozícií začiatkov výskytov} v poradí prvého výskytu.
+            Pozície sú indexy v normalizovanom texte (pre bežné texty zhodné s pôvodným textom).
+        """
+        hits: Dict[str, List[int]] = {}
+        if not text or not (self._exact or self._prefixes):
+            return hits
+
+        tokens = [(match.group(0), match.start()) for match in _TOKEN_PATTERN.finditer(fold(text))]
+        for index, (token, position) in enumerate(tokens):
+            for pattern, keyword in self._candidates(token):
+                if len(pattern) > 1:
+                    following = tokens[index + 1:index + len(pattern)]
+                    if len(following) < len(pattern) - 1 or not all(
+                            self._token_matches(next_token, part)
+                            for (next_token, _), part in zip(following, pattern[1:])):
+                        continue
+                positions = hits.setdefault(keyword, [])
+                if not positions or positions[-1] != position:
+                    positions.append(position)
+        return hits
+
+    def matches(self, text: str) -> Set[str]:
+        """
+        Vráti množinu kľúčových slov nájdených v texte.
+
+        Args:
+            text: Prehľadávaný text.
+
+        Returns:
+            Set nájdených kľúčových slov.
+        """
+        return set(self.find(text))
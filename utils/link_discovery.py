@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Modul pre rýchle získavanie odkazov na články zo zdrojov.
+Implementuje stratégie: deklarovaný RSS/Atom feed, automatické nájdenie feedu
+cez <link rel="alternate"> a extrakciu odkazov z jednej stránky rubriky.
+"""
+
+import os
+import re
+import logging
+import feedparser
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urljoin, urlparse, urldefrag
+from bs4 import BeautifulSoup
+from utils.disk_cache import DiskCache, make_key, CACHE_DIR
+from utils.concurrency import get_host
+from utils import http_client
+
+logger = logging.getLogger("link_discovery")
+
+# Stratégie získavania odkazov
+STRATEGY_AUTO = 'auto'  # Feed, ak je deklarovaný, inak autodiscovery a nakoniec odkazy zo stránky
+STRATEGY_FEED = 'feed'  # Deklarovaný RSS/Atom feed (kľúč 'feed_url')
+STRATEGY_AUTODISCOVER = 'autodiscover'  # Feed nájdený cez <link rel="alternate"> na stránke rubriky
+STRATEGY_ANCHORS = 'anchors'  # Odkazy z jednej stránky rubriky filtrované podľa vzoru URL
+
+# Maximálny počet odkazov z jedného zdroja
+MAX_LINKS_PER_SOURCE = 50
+
+# Typy feedov pre autodiscovery
+FEED_TYPES = ('application/rss+xml', 'application/atom+xml', 'application/feed+json')
+
+# Časti URL adries, ktoré nevedú na články
+EXCLUDED_URL_PATTERN = re.compile(
+    r'(/(tag|tagy|stitek|rubrika|sekce|kategorie|category|autor|author|hledani|search|login|registrace)(/|$))'
+    r'|\.(jpe?g|png|gif|svg|webp|pdf|mp3|mp4|zip)$',
+    re.IGNORECASE
+)
+
+# Cache nájdených feedov (aby sa autodiscovery nerobila pri každom behu)
+FEED_DISCOVERY_CACHE_PATH = os.path.join(CACHE_DIR, "discovered_feeds.sqlite3")
+FEED_DISCOVERY_CACHE_TTL = 7 * 24 * 3600  # 7 dní
+# Posledné položky zdroja pre prípad, že sa zdroj nezmenil (HTTP 304); platia tak dlho ako validátory
+ENTRIES_CACHE_TTL = http_client.VALIDATOR_CACHE_TTL
+
+
+def _looks_like_article(url: str) -> bool:
+    """
+    Heuristika pre zdroje bez deklarovaného vzoru URL: článok má aspoň dva segmenty cesty
+    a posledný segment je dlhší slug so spojovníkmi alebo obsahuje číselné ID.
+
+    Args:
+        url: Absolútna URL adresa.
+
+    Returns:
+        True ak URL pravdepodobne vedie na článok.
+    """
+    segments = [segment for segment in urlparse(url).path.split('/') if segment]
+    if len(segments) < 2:
+        return False
+    last = segments[-1]
+    return last.count('-') >= 3 or bool(re.search(r'\d{4,}', last))
+
+
+class LinkDiscoverer:
+    """Trieda pre získavanie odkazov na články zo zdrojov bez newspaper.build."""
+
+    def __init__(self):
+        """Inicializácia."""
+        self.feed_cache = DiskCache(FEED_DISCOVERY_CACHE_PATH, ttl=FEED_DISCOVERY_CACHE_TTL,
+                                    max_entries=1000, max_bytes=None)
+
+    def _fetch(self, url: str, conditional: bool = True) -> Tuple[Optional[bytes], bool]:
+        """
+        Stiahne obsah URL adresy, predvolene podmienene (ETag / Last-Modified).
+
+        Returns:
+            Dvojica (obsah alebo None, či sa obsah zmenil). Pri HTTP 304 je (None, False).
+        """
+        try:
+            if conditional:
+                response = http_client.conditional_get(url, namespace="links")
+            else:
+                response = http_client.get(url)
+            if response is None:
+                return None, False
+            response.raise_for_status()
+            return response.content, True
+        except Exception as e:
+            logger.error(f"Chyba pri sťahovaní {url}: {str(e)}")
+            return None, True
+
+    def entries_from_feed(self, feed_content: bytes) -> List[Dict]:
+        """
+        Spracuje RSS/Atom feed na zoznam položiek.
+
+        Args:
+            feed_content: Obsah feedu.
+
+        Returns:
+            Zoznam položiek s kľúčmi 'url', 'title', 'content', 'published'.
+        """
+        feed = feedparser.parse(feed_content)
+        entries = []
+        for entry in feed.entries:
+            link = entry.get('link', '').strip()
+            if not link:
+                continue
+
+            # Plný obsah (content:encoded) má prednosť pred popisom
+            content = ''
+            if entry.get('content'):
+                content = entry['content'][0].get('value', '')
+            if not content:
+                content = entry.get('summary', entry.get('description', ''))
+
+            entries.append({
+                'url': link,
+                'title': entry.get('title', '').strip(),
+                'content': content,
+                'published': entry.get('published', entry.get('updated', '')),
+            })
+        return entries
+
+    def find_feed_url(self, page_url: str, html: bytes) -> Optional[str]:
+        """
+        Nájde URL adresu feedu v <link rel="alternate"> na stránke.
+
+        Args:
+            page_url: URL adresa stránky (pre relatívne odkazy).
+            html: HTML obsah stránky.
+
+        Returns:
+            Absolútna URL adresa feedu alebo None.
+        """
+        soup = BeautifulSoup(html, 'html.parser')
+        for link in soup.find_all('link', href=True):
+            rel = [value.lower() for value in (link.get('rel') or [])]
+            if 'alternate' in rel and (link.get('type') or '').lower() in FEED_TYPES:
+                return urljoin(page_url, link['href'])
+        return None
+
+    def entries_from_anchors(self, page_url: str, html: bytes, link_pattern: Optional[str] = None) -> List[Dict]:
+        """
+        Extrahuje odkazy na články z jednej stránky rubriky.
+
+        Args:
+            page_url: URL adresa stránky.
+            html: HTML obsah stránky.
+            link_pattern: Regulárny výraz, ktorému musí zodpovedať URL článku.
+                Ak None, použije sa heuristika _looks_like_article.
+
+        Returns:
+            Zoznam položiek s kľúčmi 'url' a 'title' (bez duplicít, v poradí na stránke).
+        """
+        pattern = re.compile(link_pattern) if link_pattern else None
+        page_host = get_host(page_url)
+
+        soup = BeautifulSoup(html, 'html.parser')
+        entries = []
+        seen = set()
+
+        for anchor in soup.find_all('a', href=True):
+            href = anchor['href'].strip()
+            if not href or href.startswith(('mailto:', 'javascript:', 'tel:')):
+                continue
+
+            url = urldefrag(urljoin(page_url, href))[0]
+            parsed = urlparse(url)
+            if parsed.scheme not in ('http', 'https'):
+                continue
+            # Len odkazy na rovnaký host alebo jeho subdomény (nie napr. 'notidnes.cz' pre 'idnes.cz')
+            host = get_host(url)
+            if host != page_host and not host.endswith('.' + page_host):
+                continue
+            if url in seen or url.rstrip('/') == page_url.rstrip('/'):
+                continue
+            if EXCLUDED_URL_PATTERN.search(parsed.path):
+                continue
+            if pattern is not None and not pattern.search(url):
+                continue
+            if pattern is None and not _looks_like_article(url):
+                continue
+
+            seen.add(url)
+            entries.append({'url': url, 'title': anchor.get_text(" ", strip=True), 'content': '', 'published': ''})
+
+        return entries
+
+    def _discover_feed(self, source: Dict, html: bytes) -> Optional[str]:
+        """Nájde URL adresu feedu na stránke zdroja a uloží ju do cache (aj prázdny výsledok)."""
+        feed_url = self.find_feed_url(source['url'], html)
+        self.feed_cache.set(make_key("feed_url", source['url']), feed_url or '')
+        if feed_url:
+            logger.info(f"Nájdený feed pre zdroj {source['name']}: {feed_url}")
+        return feed_url
+
+    def discover(self, source: Dict) -> List[Dict]:
+        """
+        Získa položky (odkazy na články) zo zdroja podľa jeho stratégie. Ak sa zdroj od posledného
+        stiahnutia nezmenil (HTTP 304), vráti položky z posledného stiahnutia.
+
+        Zdroj môže deklarovať kľúče:
+            'strategy': STRATEGY_AUTO, STRATEGY_FEED, STRATEGY_AUTODISCOVER alebo STRATEGY_ANCHORS,
+            'feed_url': URL adresa RSS/Atom feedu,
+            'link_pattern': regulárny výraz pre URL adresy článkov (pre STRATEGY_ANCHORS).
+
+        Args:
+            source: Dictionary s informáciami o zdroji (minimálne 'name' a 'url').
+
+        Returns:
+            Zoznam položiek s kľúčmi 'url', 'title', 'content', 'published'.
+        """
+        entries_key = make_key("entries", source['url'])
+        entries = self._discover(source, conditional=True)
+        if entries is None:
+            # Zdroj sa nezmenil (HTTP 304) - vrátia sa posledné položky, už spracované odkazy
+            # odfiltruje ArticleStore a neúspešne spracované dostanú ďalší pokus
+            cached = self.feed_cache.get(entries_key)
+            if cached:
+                logger.info(f"Zdroj {source['name']} sa nezmenil, používam posledné odkazy")
+                return cached
+            # Posledné položky nie sú v cache - zdroj sa stiahne celý
+            entries = self._discover(source, conditional=False)
+        if entries:
+            self.feed_cache.set(entries_key, entries, ttl=ENTRIES_CACHE_TTL)
+        return entries
+
+    def _discover(self, source: Dict, conditional: bool) -> Optional[List[Dict]]:
+        """
+        Získa položky zo zdroja podľa jeho stratégie.
+
+        Args:
+            source: Dictionary s informáciami o zdroji.
+            conditional: Či sa majú použiť podmienené požiadavky.
+
+        Returns:
+            Zoznam položiek, alebo None ak sa zdroj od posledného stiahnutia nezmenil (HTTP 304).
+        """
+        strategy = source.get('strategy', STRATEGY_AUTO)
+        feed_url = source.get('feed_url')
+        entries: List[Dict] = []
+        html = None
+
+        if strategy == STRATEGY_AUTO:
+            strategy = STRATEGY_FEED if feed_url else STRATEGY_AUTODISCOVER
+
+        # 1. Deklarovaný feed
+        if strategy == STRATEGY_FEED and feed_url:
+            content, modified = self._fetch(feed_url, conditional)
+            if not modified:
+                return None  # Feed sa nezmenil
+            if content:
+                entries = self.entries_from_feed(content)
+
+        # 2. Automaticky nájdený feed (URL feedu je v cache, stránku rubriky netreba sťahovať)
+        elif strategy == STRATEGY_AUTODISCOVER:
+            discovered_url = self.feed_cache.get(make_key("feed_url", source['url']))
+            if discovered_url is None:
+                html, modified = self._fetch(source['url'], conditional)
+                if not modified:
+                    return None
+                if html:
+                    discovered_url = self._discover_feed(source, html)
+            if discovered_url:
+                content, modified = self._fetch(discovered_url, conditional)
+                if not modified:
+                    return None
+                if content:
+                    entries = self.entries_from_feed(content)
+
+        # 3. Odkazy zo stránky rubriky (aj ako záloha, ak feed nič nevrátil)
+        if not entries:
+            if html is None:
+                html, modified = self._fetch(source['url'], conditional)
+                if not modified:
+                    return None  # Stránka rubriky sa nezmenila
+            if html:
+                entries = self.entries_from_anchors(source['url'], html, source.get('link_pattern'))
+
+        return entries[:MAX_LINKS_PER_SOURCE]
@@ -0,0 +1,808 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Modul pre smerovanie požiadaviek na jazykové modely (generovanie súhrnov, kontrola relevancie).
+Implementuje adaptér pre každého poskytovateľa s vlastnými klientmi, circuit breaker, sledovanie latencie (EWMA),
+výber najrýchlejšieho dostupného poskytovateľa (pri zhode podľa priority) a voliteľné hedged požiadavky.
+"""
+
+import os
+import time
+import random
+import asyncio
+import logging
+import threading
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Dict, List, Optional, Tuple
+import httpx
+import openai
+# Načítanie premenných z .env súboru
+from dotenv import load_dotenv
+load_dotenv()  # toto načíta premenné z .env súboru do prostredia
+from utils import http_client
+from utils.api_key_manager import ApiKeyPool, get_openai_key_pool
+from utils.politeness import parse_retry_after
+from utils.rate_limiter import RateLimiter, RateLimitTimeout, Reservation, estimate_request_tokens
+
+logger = logging.getLogger("llm_providers")
+
+# Predvolený timeout jednej požiadavky na poskytovateľa (sekundy)
+PROVIDER_TIMEOUT = 60.0
+
+# Opakovanie požiadavky u toho istého poskytovateľa (ďalšie zlyhania rieši router prechodom na iného)
+PROVIDER_MAX_RETRIES = 1
+RETRY_STATUS_CODES = (408, 429, 500, 502, 503, 504)
+RETRY_BACKOFF = 1.0  # Prvé čakanie v sekundách, pri ďalších pokusoch sa zdvojnásobuje (s náhodným rozptylom)
+MAX_RETRY_WAIT = 30.0  # Maximálne čakanie pred opakovaním (aj pri dlhšom Retry-After)
+
+# Rozpočet požiadaviek (RPM) a tokenov (TPM) za minútu; pri OpenAI na jeden kľúč poolu
+OPENAI_RPM = int(os.getenv("OPENAI_RPM", "500"))
+OPENAI_TPM = int(os.getenv("OPENAI_TPM", "30000"))
+ANTHROPIC_RPM = int(os.getenv("ANTHROPIC_RPM", "50"))
+ANTHROPIC_TPM = int(os.getenv("ANTHROPIC_TPM", "40000"))
+
+# Circuit breaker: po FAILURE_THRESHOLD zlyhaniach za sebou sa poskytovateľ na RESET_TIMEOUT sekúnd vyradí
+BREAKER_FAILURE_THRESHOLD = 3
+BREAKER_RESET_TIMEOUT = 300.0
+
+# Exponenciálne vážený priemer latencie (váha novej hodnoty) a predpoklad pre ešte nemeraných poskytovateľov
+# (nemeraní majú rovnakú očakávanú latenciu, takže medzi nimi rozhoduje priorita)
+EWMA_ALPHA = 0.3
+PRIOR_LATENCY = 10.0
+
+# Hedged požiadavka: ak prvý poskytovateľ neodpovie do HEDGE_AFTER sekúnd, súbežne sa osloví druhý
+# (None = vypnuté, nastaviteľné cez LLM_HEDGE_AFTER)
+HEDGE_AFTER = float(os.getenv("LLM_HEDGE_AFTER")) if os.getenv("LLM_HEDGE_AFTER") else None
+
+OPENAI_URL = "https://api.openai.com/v1"
+DEEPSEEK_URL = "https://api.deepseek.com/v1"
+ANTHROPIC_URL = "https://api.anthropic.com/v1/messages"
+GEMINI_URL = "https://generativelanguage.googleapis.com/v1beta/models/{model}:generateContent"
+
+
+class ProviderError(Exception):
+    """Chyba pri volaní poskytovateľa (chybový HTTP stav, neplatná odpoveď)."""
+
+
+class AllProvidersFailedError(Exception):
+    """Žiadny poskytovateľ nevrátil odpoveď."""
+
+
+_openai_limiter: Optional[RateLimiter] = None
+_limiter_lock = threading.Lock()
+
+
+def get_openai_rate_limiter() -> RateLimiter:
+    """
+    Vráti zdieľaný limiter OpenAI (spoločný pre súhrny aj kontrolu relevancie).
+    Rozpočet sa násobí počtom kľúčov v poole.
+
+    Returns:
+        Inštancia RateLimiter.
+    """
+    global _openai_limiter
+    with _limiter_lock:
+        if _openai_limiter is None:
+            keys = max(1, len(get_openai_key_pool()))
+            _openai_limiter = RateLimiter(rpm=OPENAI_RPM * keys, tpm=OPENAI_TPM * keys, name="OpenAI")
+        return _openai_limiter
+
+
+class CircuitBreaker:
+    """Circuit breaker so stavmi zatvorený / otvorený / polootvorený."""
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_threshold: int = BREAKER_FAILURE_THRESHOLD,
+                 reset_timeout: float = BREAKER_RESET_TIMEOUT):
+        """
+        Inicializácia.
+
+        Args:
+            failure_threshold: Počet zlyhaní za sebou, po ktorom sa breaker otvorí.
+            reset_timeout: Po koľkých sekundách sa otvorený breaker skúsi znovu (jedna skúšobná požiadavka).
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = 0.0
+        self.state = self.CLOSED
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """
+        Zistí, či sa má na poskytovateľa poslať požiadavka.
+
+        Returns:
+            True ak je breaker zatvorený, alebo ak polootvorený breaker púšťa skúšobnú požiadavku.
+        """
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+                self._trial_in_flight = False
+            if self.state == self.HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def is_available(self) -> bool:
+        """Zistí bez rezervácie skúšobnej požiadavky, či by breaker požiadavku pustil."""
+        with self._lock:
+            if self.state == self.OPEN:
+                return time.monotonic() - self.opened_at >= self.reset_timeout
+            return not (self.state == self.HALF_OPEN and self._trial_in_flight)
+
+    def record_success(self) -> None:
+        """Zaznamená úspešnú požiadavku (breaker sa zatvorí)."""
+        with self._lock:
+            self.failures = 0
+            self.state = self.CLOSED
+            self._trial_in_flight = False
+
+    def release_trial(self) -> None:
+        """Uvoľní skúšobnú požiadavku bez výsledku (napr. zrušenú pomalšiu hedged požiadavku)."""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        """Zaznamená zlyhanie (po prekročení prahu alebo v skúšobnom stave sa breaker otvorí)."""
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+            self._trial_in_flight = False
+
+
+class LLMProvider(ABC):
+    """
+    Adaptér jedného poskytovateľa jazykového modelu.
+
+    Každý poskytovateľ má vlastný kľúč, timeout a politiku opakovania, takže inštancie
+    je možné bezpečne volať súbežne z viacerých vlákien (complete) aj zo slučky udalostí (acomplete).
+    Voliteľný limiter drží požiadavky vo fronte, aby neprekročili rozpočet RPM/TPM poskytovateľa.
+    """
+
+    def __init__(self, name: str, api_key: Optional[str], model: str, timeout: float = PROVIDER_TIMEOUT,
+                 max_retries: int = PROVIDER_MAX_RETRIES, rate_limiter: Optional[RateLimiter] = None):
+        """
+        Inicializácia.
+
+        Args:
+            name: Názov poskytovateľa (pre logovanie a štatistiky).
+            api_key: API kľúč. Bez kľúča je poskytovateľ nedostupný.
+            model: Názov modelu.
+            timeout: Timeout požiadavky v sekundách.
+            max_retries: Počet opakovaní pri sieťovej chybe alebo dočasnom chybovom stave (429, 5xx).
+            rate_limiter: Limiter RPM/TPM (None = bez limitu na strane klienta).
+        """
+        self.name = name
+        self.api_key = api_key
+        self.model = model
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.rate_limiter = rate_limiter
+
+    def available(self) -> bool:
+        """Zistí, či je poskytovateľ nakonfigurovaný."""
+        return bool(self.api_key)
+
+    @abstractmethod
+    def complete(self, system_prompt: str, user_message: str, temperature: float, max_tokens: int) -> str:
+        """
+        Vygeneruje odpoveď modelu.
+
+        Args:
+            system_prompt: Systémový prompt.
+            user_message: Správa používateľa.
+            temperature: Teplota generovania.
+            max_tokens: Maximálny počet tokenov odpovede.
+
+        Returns:
+            Text odpovede.
+
+        Raises:
+            ProviderError: Pri chybovej alebo neplatnej odpovedi.
+        """
+
+    @abstractmethod
+    async def acomplete(self, system_prompt: str, user_message: str, temperature: float, max_tokens: int) -> str:
+        """Asynchrónna varianta complete."""
+
+    def _reserve(self, tokens: int) -> Optional[Reservation]:
+        """Počká vo fronte limitera na rozpočet pre požiadavku."""
+        if self.rate_limiter is None:
+            return None
+        try:
+            return self.rate_limiter.acquire(tokens)
+        except RateLimitTimeout as e:
+            raise ProviderError(str(e)) from e
+
+    async def _areserve(self, tokens: int) -> Optional[Reservation]:
+        """Asynchrónna varianta _reserve."""
+        if self.rate_limiter is None:
+            return None
+        try:
+            return await self.rate_limiter.acquire_async(tokens)
+        except RateLimitTimeout as e:
+            raise ProviderError(str(e)) from e
+
+    def _record_usage(self, reservation: Optional[Reservation], tokens: Optional[int]) -> None:
+        if reservation is not None:
+            self.rate_limiter.record_usage(reservation, tokens)
+
+    def _retry_wait(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """Čakanie pred opakovaním: Retry-After, inak exponenciálny odstup; oboje s náhodným rozptylom."""
+        if retry_after is not None:
+            return min(retry_after, MAX_RETRY_WAIT) + random.uniform(0, RETRY_BACKOFF)
+        backoff = min(RETRY_BACKOFF * (2 ** attempt), MAX_RETRY_WAIT)
+        return backoff / 2 + random.uniform(0, backoff / 2)
+
+    def _backoff(self, status_code: int, headers, attempt: int) -> float:
+        """
+        Určí čakanie po dočasnom chybovom stave. Pri 429 sa pozastaví celý limiter poskytovateľa
+        a čaká sa v jeho fronte (vráti 0), aby server nezahltili ani ostatné požiadavky.
+        """
+        delay = self._retry_wait(attempt, parse_retry_after(headers.get('retry-after')))
+        if status_code == 429 and self.rate_limiter is not None:
+            self.rate_limiter.pause(delay)
+            return 0.0
+        return delay
+
+
+class HttpProvider(LLMProvider):
+    """
+    Poskytovateľ volaný priamo cez REST API zdieľaného HTTP klienta (požiadavka aj odpoveď v JSON).
+    Podtriedy dodajú zostavenie požiadavky (_request) a spracovanie odpovede (_parse, _usage).
+    """
+
+    def complete(self, system_prompt: str, user_message: str, temperature: float, max_tokens: int) -> str:
+        url, headers, payload = self._request(system_prompt, user_message, temperature, max_tokens)
+        tokens = estimate_request_tokens([system_prompt, user_message], max_tokens)
+        return self._parse(self._post(url, headers, payload, tokens))
+
+    async def acomplete(self, system_prompt: str, user_message: str, temperature: float, max_tokens: int) -> str:
+        url, headers, payload = self._request(system_prompt, user_message, temperature, max_tokens)
+        tokens = estimate_request_tokens([system_prompt, user_message], max_tokens)
+        return self._parse(await self._apost(url, headers, payload, tokens))
+
+    @abstractmethod
+    def _request(self, system_prompt: str, user_message: str, temperature: float,
+                 max_tokens: int) -> Tuple[str, Dict, Dict]:
+        """Zostaví požiadavku (URL adresa, hlavičky, telo)."""
+
+    @abstractmethod
+    def _parse(self, data: Dict) -> str:
+        """Vyberie text z JSON odpovede."""
+
+    def _usage(self, data: Dict) -> Optional[int]:
+        """Vráti skutočný počet tokenov požiadavky z JSON odpovede (None, ak ho odpoveď neobsahuje)."""
+        return None
+
+    def _response_json(self, response: httpx.Response) -> Dict:
+        if response.status_code != 200:
+            raise ProviderError(f"{self.name} vrátil chybový kód: {response.status_code}")
+        return response.json()
+
+    def _post(self, url: str, headers: Dict, data: Dict, tokens: int) -> Dict:
+        """
+        Odošle požiadavku (s opakovaním) a vráti JSON odpoveď (pri chybovom stave vyhodí ProviderError).
+        Každý pokus si rezervuje odhadovaný počet tokenov v limiteri.
+        """
+        attempt = 0
+        while True:
+            reservation = self._reserve(tokens)
+            try:
+                response = http_client.post(url, headers=headers, json=data, timeout=self.timeout)
+            except httpx.TransportError:
+                if attempt >= self.max_retries:
+                    raise
+                delay = self._retry_wait(attempt)
+            else:
+                if response.status_code not in RETRY_STATUS_CODES or attempt >= self.max_retries:
+                    result = self._response_json(response)
+                    self._record_usage(reservation, self._usage(result))
+                    return result
+                delay = self._backoff(response.status_code, response.headers, attempt)
+            time.sleep(delay)
+            attempt += 1
+
+    async def _apost(self, url: str, headers: Dict, data: Dict, tokens: int) -> Dict:
+        """Asynchrónna varianta _post."""
+        attempt = 0
+        while True:
+            reservation = await self._areserve(tokens)
+            try:
+                response = await http_client.apost(url, headers=headers, json=data, timeout=self.timeout)
+            except httpx.TransportError:
+                if attempt >= self.max_retries:
+                    raise
+                delay = self._retry_wait(attempt)
+            else:
+                if response.status_code not in RETRY_STATUS_CODES or attempt >= self.max_retries:
+                    result = self._response_json(response)
+                    self._record_usage(reservation, self._usage(result))
+                    return result
+                delay = self._backoff(response.status_code, response.headers, attempt)
+            await asyncio.sleep(delay)
+            attempt += 1
+
+
+class OpenAICompatibleProvider(LLMProvider):
+    """
+    Poskytovateľ s rozhraním OpenAI Chat Completions (OpenAI, DeepSeek).
+
+    Používa vlastné inštancie klientov OpenAI SDK (synchrónneho aj asynchrónneho) pre každý
+    kľúč z poolu kľúčov; požiadavky idú cez zdieľaný pool spojení. Kľúč sa pre každú požiadavku
+    vyberá z poolu podľa zostávajúcej kvóty a po 429 sa opakovanie skúsi s iným kľúčom.
+    """
+
+    def __init__(self, name: str, api_key: Optional[str], model: str, base_url: str = OPENAI_URL,
+                 timeout: float = PROVIDER_TIMEOUT, max_retries: int = PROVIDER_MAX_RETRIES,
+                 key_pool: Optional[ApiKeyPool] = None, rate_limiter: Optional[RateLimiter] = None):
+        """
+        Inicializácia.
+
+        Args:
+            key_pool: Pool API kľúčov. Ak None, použije sa pool s jediným kľúčom api_key.
+            Ostatné parametre ako pri LLMProvider.
+        """
+        super().__init__(name, api_key, model, timeout, max_retries, rate_limiter)
+        self.base_url = base_url
+        self.key_pool = key_pool if key_pool is not None else ApiKeyPool([api_key], name=name)
+        self._clients: Dict[str, openai.OpenAI] = {}
+        self._async_clients: Dict[str, openai.AsyncOpenAI] = {}
+        self._lock = threading.Lock()
+
+    def available(self) -> bool:
+        return len(self.key_pool) > 0
+
+    def get_client(self, api_key: str) -> openai.OpenAI:
+        """Vráti synchrónneho klienta pre daný kľúč (vytvorí ho pri prvom použití)."""
+        with self._lock:
+            client = self._clients.get(api_key)
+            if client is None:
+                # Opakovanie rieši complete (ďalší pokus môže ísť s iným kľúčom)
+                client = openai.OpenAI(api_key=api_key, base_url=self.base_url, timeout=self.timeout,
+                                       max_retries=0, http_client=http_client.get_client())
+                self._clients[api_key] = client
+            return client
+
+    def get_async_client(self, api_key: str) -> openai.AsyncOpenAI:
+        """Vráti asynchrónneho klienta pre daný kľúč (nový, ak sa zdieľaný HTTP klient medzitým zatvoril)."""
+        shared = http_client.get_async_client()
+        with self._lock:
+            client = self._async_clients.get(api_key)
+            if client is None or client._client is not shared:
+                client = openai.AsyncOpenAI(api_key=api_key, base_url=self.base_url, timeout=self.timeout,
+                                            max_retries=0, http_client=shared)
+                self._async_clients[api_key] = client
+            return client
+
+    def _params(self, system_prompt: str, user_message: str, temperature: float, max_tokens: int) -> Dict:
+        return {
+            "model": self.model,
+            "messages": [
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_message}
+            ],
+            "temperature": temperature,
+            "max_tokens": max_tokens
+        }
+
+    def _content(self, response) -> str:
+        try:
+            return response.choices[0].message.content
+        except (AttributeError, IndexError, TypeError):
+            raise ProviderError(f"{self.name} vrátil neplatnú odpoveď")
+
+    def _acquire_key(self) -> str:
+        api_key = self.key_pool.acquire()
+        if api_key is None:
+            raise ProviderError(f"{self.name}: všetky API kľúče sú dočasne obmedzené")
+        return api_key
+
+    def _release_error(self, api_key: str, error: Exception) -> None:
+        """Vráti kľúč do poolu po chybe (pri chybovom HTTP stave aj s hlavičkami odpovede)."""
+        if isinstance(error, openai.APIStatusError):
+            self.key_pool.release(api_key, error.response.headers, error.status_code)
+        else:
+            self.key_pool.release(api_key)
+
+    def _retry_delay(self, error: Exception, attempt: int) -> Optional[float]:
+        """Vráti čakanie pred ďalším pokusom alebo None, ak sa požiadavka nemá opakovať."""
+        if attempt >= self.max_retries or not isinstance(error, openai.APIError):
+            return None
+        if isinstance(error, openai.APIStatusError):
+            if error.status_code == 429 and self.key_pool.available_count():
+                return 0.0  # Obmedzený kľúč je v cooldowne, ďalší pokus ide s iným kľúčom
+            if error.status_code not in RETRY_STATUS_CODES:
+                return None
+            return self._backoff(error.status_code, error.response.headers, attempt)
+        return self._retry_wait(attempt)
+
+    def _response_usage(self, response) -> Optional[int]:
+        usage = getattr(response, 'usage', None)
+        return getattr(usage, 'total_tokens', None)
+
+    def complete(self, system_prompt: str, user_message: str, temperature: float, max_tokens: int) -> str:
+        params = self._params(system_prompt, user_message, temperature, max_tokens)
+        tokens = estimate_request_tokens([system_prompt, user_message], max_tokens)
+        attempt = 0
+        while True:
+            # Kľúč sa berie pred rezerváciou, aby pri všetkých obmedzených kľúčoch nezostal rozpočet zablokovaný
+            api_key = self._acquire_key()
+            try:
+                reservation = self._reserve(tokens)
+            except BaseException:
+                self.key_pool.release(api_key)
+                raise
+            try:
+                raw = self.get_client(api_key).chat.completions.with_raw_response.create(**params)
+            except Exception as e:
+                self._release_error(api_key, e)
+                delay = self._retry_delay(e, attempt)
+                if delay is None:
+                    raise ProviderError(f"{self.name}: {str(e)}") from e
+            except BaseException:
+                # Aj zrušená požiadavka (napr. pomalšia hedged požiadavka) musí kľúč vrátiť do poolu
+                self.key_pool.release(api_key)
+                raise
+            else:
+                self.key_pool.release(api_key, raw.headers, raw.status_code)
+                response = raw.parse()
+                self._record_usage(reservation, self._response_usage(response))
+                return self._content(response)
+            time.sleep(delay)
+            attempt += 1
+
+    async def acomplete(self, system_prompt: str, user_message: str, temperature: float, max_tokens: int) -> str:
+        params = self._params(system_prompt, user_message, temperature, max_tokens)
+        tokens = estimate_request_tokens([system_prompt, user_message], max_tokens)
+        attempt = 0
+        while True:
+            # Kľúč sa berie pred rezerváciou, aby pri všetkých obmedzených kľúčoch nezostal rozpočet zablokovaný
+            api_key = self._acquire_key()
+            try:
+                reservation = await self._areserve(tokens)
+            except BaseException:
+                self.key_pool.release(api_key)
+                raise
+            try:
+                raw = await self.get_async_client(api_key).chat.completions.with_raw_response.create(**params)
+            except Exception as e:
+                self._release_error(api_key, e)
+                delay = self._retry_delay(e, attempt)
+                if delay is None:
+                    raise ProviderError(f"{self.name}: {str(e)}") from e
+            except BaseException:
+                # Aj zrušená požiadavka (napr. pomalšia hedged požiadavka) musí kľúč vrátiť do poolu
+                self.key_pool.release(api_key)
+                raise
+            else:
+                self.key_pool.release(api_key, raw.headers, raw.status_code)
+                response = raw.parse()
+                self._record_usage(reservation, self._response_usage(response))
+                return self._content(response)
+            await asyncio.sleep(delay)
+            attempt += 1
+
+
+class AnthropicProvider(HttpProvider):
+    """Poskytovateľ Anthropic (Messages API)."""
+
+    def _request(self, system_prompt: str, user_message: str, temperature: float,
+                 max_tokens: int) -> Tuple[str, Dict, Dict]:
+        headers = {
+            "Content-Type": "application/json",
+            "x-api-key": self.api_key,
+            "anthropic-version": "2023-06-01"
+        }
+        payload = {
+            "model": self.model,
+            "max_tokens": max_tokens,
+            "temperature": temperature,
+            "system": system_prompt,
+            "messages": [{"role": "user", "content": user_message}]
+        }
+        return ANTHROPIC_URL, headers, payload
+
+    def _parse(self, data: Dict) -> str:
+        try:
+            return data["content"][0]["text"]
+        except (KeyError, IndexError, TypeError):
+            raise ProviderError(f"{self.name} vrátil neplatnú odpoveď")
+
+    def _usage(self, data: Dict) -> Optional[int]:
+        usage = data.get("usage") or {}
+        if "input_tokens" not in usage:
+            return None
+        return usage["input_tokens"] + usage.get("output_tokens", 0)
+
+
+class GeminiProvider(HttpProvider):
+    """Poskytovateľ Google Gemini."""
+
+    def _request(self, system_prompt: str, user_message: str, temperature: float,
+                 max_tokens: int) -> Tuple[str, Dict, Dict]:
+        payload = {
+            "contents": [{"parts": [{"text": system_prompt}, {"text": user_message}]}],
+            "generationConfig": {"temperature": temperature, "maxOutputTokens": max_tokens}
+        }
+        return (f"{GEMINI_URL.format(model=self.model)}?key={self.api_key}",
+                {"Content-Type": "application/json"}, payload)
+
+    def _parse(self, data: Dict) -> str:
+        try:
+            return data["candidates"][0]["content"]["parts"][0]["text"]
+        except (KeyError, IndexError, TypeError):
+            raise ProviderError(f"{self.name} vrátil neplatnú odpoveď")
+
+    def _usage(self, data: Dict) -> Optional[int]:
+        return (data.get("usageMetadata") or {}).get("totalTokenCount")
+
+
+class _ProviderState:
+    """Zdravie a latencia jedného poskytovateľa."""
+
+    def __init__(self, provider: LLMProvider, priority: int):
+        self.provider = provider
+        self.priority = priority
+        self.breaker = CircuitBreaker()
+        self.ewma_latency: Optional[float] = None
+        self.successes = 0
+        self.failures = 0
+
+    def expected_latency(self) -> float:
+        return self.ewma_latency if self.ewma_latency is not None else PRIOR_LATENCY
+
+
+class LLMRouter:
+    """Smerovač požiadaviek na najrýchlejšieho dostupného poskytovateľa."""
+
+    def __init__(self, providers: List[LLMProvider], hedge_after: Optional[float] = HEDGE_AFTER):
+        """
+        Inicializácia.
+
+        Args:
+            providers: Poskytovatelia v poradí priority (pri rovnakej očakávanej latencii vyhráva skorší).
+                Nenakonfigurovaní poskytovatelia (bez API kľúča) sa vynechajú.
+            hedge_after: Po koľkých sekundách bez odpovede sa súbežne osloví ďalší poskytovateľ (None = vypnuté).
+        """
+        self.hedge_after = hedge_after
+        self._states = [_ProviderState(provider, priority)
+                        for priority, provider in enumerate(providers) if provider.available()]
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max(2, 2 * len(self._states)),
+                                            thread_name_prefix="llm")
+
+    def providers(self) -> List[LLMProvider]:
+        """Vráti nakonfigurovaných poskytovateľov v poradí priority."""
+        return [state.provider for state in self._states]
+
+    def provider(self, name: str) -> Optional[LLMProvider]:
+        """Vráti poskytovateľa podľa názvu (napr. z výsledku complete)."""
+        return next((state.provider for state in self._states if state.provider.name == name), None)
+
+    def _ranked(self) -> List[_ProviderState]:
+        """Vráti dostupných poskytovateľov zoradených podľa očakávanej latencie (EWMA), pri zhode podľa priority."""
+        with self._lock:
+            states = [state for state in self._states if state.breaker.is_available()]
+            return sorted(states, key=lambda state: (state.expected_latency(), state.priority))
+
+    def _record_success(self, state: _ProviderState, latency: float) -> None:
+        state.breaker.record_success()
+        with self._lock:
+            state.successes += 1
+            self._record_latency(state, latency)
+
+    def _record_failure(self, state: _ProviderState) -> None:
+        state.breaker.record_failure()
+        with self._lock:
+            state.failures += 1
+            # Zlyhanie sa započíta ako celý timeout, aby rýchlo zlyhávajúci poskytovateľ nevyzeral ako rýchly
+            self._record_latency(state, state.provider.timeout)
+
+    @staticmethod
+    def _record_latency(state: _ProviderState, latency: float) -> None:
+        """Aktualizuje EWMA latencie poskytovateľa (volá sa so zámkom)."""
+        state.ewma_latency = latency if state.ewma_latency is None else (
+            EWMA_ALPHA * latency + (1 - EWMA_ALPHA) * state.ewma_latency)
+
+    def _call(self, state: _ProviderState, system_prompt: str, user_message: str,
+              temperature: float, max_tokens: int) -> str:
+        """Zavolá poskytovateľa a zaznamená latenciu a výsledok."""
+        started = time.monotonic()
+        try:
+            text = state.provider.complete(system_prompt, user_message, temperature, max_tokens)
+            if not text:
+                raise ProviderError(f"{state.provider.name} vrátil prázdnu odpoveď")
+        except Exception:
+            self._record_failure(state)
+            raise
+        self._record_success(state, time.monotonic() - started)
+        return text
+
+    async def _acall(self, state: _ProviderState, system_prompt: str, user_message: str,
+                     temperature: float, max_tokens: int) -> str:
+        """Asynchrónna varianta _call (zrušená požiadavka sa nezapočíta ako zlyhanie)."""
+        started = time.monotonic()
+        try:
+            text = await state.provider.acomplete(system_prompt, user_message, temperature, max_tokens)
+            if not text:
+                raise ProviderError(f"{state.provider.name} vrátil prázdnu odpoveď")
+        except Exception:
+            self._record_failure(state)
+            raise
+        except BaseException:
+            # Zrušená požiadavka nie je zlyhanie, ale polootvorený breaker musí skúšobné miesto uvoľniť
+            state.breaker.release_trial()
+            raise
+        self._record_success(state, time.monotonic() - started)
+        return text
+
+    def complete(self, system_prompt: str, user_message: str, temperature: float = 0.7,
+                 max_tokens: int = 1000) -> Tuple[str, str]:
+        """
+        Vygeneruje odpoveď pomocou najrýchlejšieho dostupného poskytovateľa. Pri zlyhaní
+        pokračuje ďalším; pri zapnutom hedgingu po hedge_after sekundách osloví súbežne aj ďalšieho.
+
+        Args:
+            system_prompt: Systémový prompt.
+            user_message: Správa používateľa.
+            temperature: Teplota generovania.
+            max_tokens: Maximálny počet tokenov odpovede.
+
+        Returns:
+            Dvojica (text odpovede, názov poskytovateľa).
+
+        Raises:
+            AllProvidersFailedError: Ak žiadny poskytovateľ nevrátil odpoveď.
+        """
+        candidates = self._ranked()
+        errors = []
+        pending = {}
+
+        def submit(state: _ProviderState) -> None:
+            future = self._executor.submit(self._call, state, system_prompt, user_message, temperature, max_tokens)
+            pending[future] = state
+
+        while candidates or pending:
+            # Spustenie ďalšieho poskytovateľa, ak nič nebeží
+            while not pending and candidates:
+                state = candidates.pop(0)
+                if state.breaker.allow():
+                    submit(state)
+
+            if not pending:
+                break
+
+            timeout = self.hedge_after if (self.hedge_after is not None and candidates and len(pending) == 1) else None
+            done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+
+            if not done:
+                # Prvý poskytovateľ je pomalý - hedged požiadavka na ďalšieho
+                while candidates:
+                    state = candidates.pop(0)
+                    if state.breaker.allow():
+                        logger.info(f"{pending[next(iter(pending))].provider.name} neodpovedal do "
+                                    f"{self.hedge_after:.1f}s, súbežne skúšam {state.provider.name}")
+                        submit(state)
+                        break
+                continue
+
+            for future in done:
+                state = pending.pop(future)
+                try:
+                    text = future.result()
+                except Exception as e:
+                    logger.warning(f"Poskytovateľ {state.provider.name} zlyhal: {str(e)}")
+                    errors.append(f"{state.provider.name}: {str(e)}")
+                    continue
+                # Výsledok pomalšej súbežnej požiadavky sa zahodí (latencia sa zaznamená v _call)
+                return text, state.provider.name
+
+        raise AllProvidersFailedError("; ".join(errors) or "Žiadny dostupný poskytovateľ")
+
+    async def acomplete(self, system_prompt: str, user_message: str, temperature: float = 0.7,
+                        max_tokens: int = 1000) -> Tuple[str, str]:
+        """
+        Asynchrónna varianta complete (rovnaké poradie, prechod na ďalšieho poskytovateľa aj hedging).
+        Po získaní odpovede sa súbežná pomalšia požiadavka zruší.
+
+        Returns:
+            Dvojica (text odpovede, názov poskytovateľa).
+
+        Raises:
+            AllProvidersFailedError: Ak žiadny poskytovateľ nevrátil odpoveď.
+        """
+        candidates = self._ranked()
+        errors = []
+        pending = {}
+
+        def submit(state: _ProviderState) -> None:
+            task = asyncio.ensure_future(self._acall(state, system_prompt, user_message, temperature, max_tokens))
+            pending[task] = state
+
+        try:
+            while candidates or pending:
+                while not pending and candidates:
+                    state = candidates.pop(0)
+                    if state.breaker.allow():
+                        submit(state)
+
+                if not pending:
+                    break
+
+                timeout = self.hedge_after if (self.hedge_after is not None and candidates and len(pending) == 1) else None
+                done, _ = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+
+                if not done:
+                    while candidates:
+                        state = candidates.pop(0)
+                        if state.breaker.allow():
+                            logger.info(f"{pending[next(iter(pending))].provider.name} neodpovedal do "
+                                        f"{self.hedge_after:.1f}s, súbežne skúšam {state.provider.name}")
+                            submit(state)
+                            break
+                    continue
+
+                for task in done:
+                    state = pending.pop(task)
+                    try:
+                        text = task.result()
+                    except Exception as e:
+                        logger.warning(f"Poskytovateľ {state.provider.name} zlyhal: {str(e)}")
+                        errors.append(f"{state.provider.name}: {str(e)}")
+                        continue
+                    return text, state.provider.name
+        finally:
+            for task in pending:
+                task.cancel()
+
+        raise AllProvidersFailedError("; ".join(errors) or "Žiadny dostupný poskytovateľ")
+
+    def stats(self) -> Dict[str, Dict]:
+        """
+        Vráti stav poskytovateľov.
+
+        Returns:
+            Dictionary názov -> {'state', 'ewma_latency', 'successes', 'failures', 'queue_wait_avg',
+            'queue_wait_max'} (čakanie vo fronte limitera, None pre poskytovateľa bez limitera
+            alebo bez požiadaviek).
+        """
+        with self._lock:
+            stats = {state.provider.name: {'state': state.breaker.state, 'ewma_latency': state.ewma_latency,
+                                           'successes': state.successes, 'failures': state.failures}
+                     for state in self._states}
+        for state in self._states:
+            limiter = state.provider.rate_limiter
+            limiter_stats = limiter.stats() if limiter is not None else {}
+            stats[state.provider.name]['queue_wait_avg'] = limiter_stats.get('queue_wait_avg')
+            stats[state.provider.name]['queue_wait_max'] = limiter_stats.get('queue_wait_max')
+        return stats
+
+
+def default_summary_providers() -> List[LLMProvider]:
+    """
+    Vytvorí poskytovateľov pre generovanie súhrnov v pôvodnom poradí preferencie
+    (OpenAI so zdieľaným poolom kľúčov, DeepSeek, Anthropic, Gemini).
+
+    Returns:
+        Zoznam poskytovateľov (aj nenakonfigurovaných, router ich vynechá).
+    """
+    return [
+        OpenAICompatibleProvider("OpenAI", None, "gpt-4o", key_pool=get_openai_key_pool(),
+                                 rate_limiter=get_openai_rate_limiter()),
+        OpenAICompatibleProvider("DeepSeek", os.getenv("DEEPSEEK_API_KEY"), "deepseek-chat", base_url=DEEPSEEK_URL),
+        AnthropicProvider("Anthropic", os.getenv("ANTHROPIC_API_KEY"), "claude-3-haiku-20240307",
+                          rate_limiter=RateLimiter(rpm=ANTHROPIC_RPM, tpm=ANTHROPIC_TPM, name="Anthropic")),
+        GeminiProvider("Google Gemini", os.getenv("GOOGLE_API_KEY"), "gemini-pro"),
+    ]
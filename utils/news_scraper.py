@@ -1,7 +1,12 @@
+import os
+import time
+import asyncio
 import feedparser
-import requests
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from utils.logger import logger
+from utils import http_client
+from utils.disk_cache import DiskCache, make_key, CACHE_DIR
 
 SOURCES = {
     "TASR Zdravie": "https://www.teraz.sk/rss/zdravie.rss", 
@@ -9,46 +14,154 @@ SOURCES = {
     "iDNES Zdraví": "https://www.idnes.cz/rss/zdravi"
 }
 
+# Maximálny čas na stiahnutie a spracovanie jedného feedu v asynchrónnom režime (sekundy)
+FEED_DEADLINE = 15
+# Počet vlákien na parsovanie feedov
+PARSE_WORKERS = 4
+
+# Posledné články feedu pre prípad, že sa feed nezmenil (HTTP 304); platia tak dlho ako validátory
+FEED_ARTICLES_CACHE_PATH = os.path.join(CACHE_DIR, "feed_articles.sqlite3")
+FEED_ARTICLES_CACHE_TTL = http_client.VALIDATOR_CACHE_TTL
+
+_feed_articles_cache = None
+
+def _get_feed_articles_cache():
+    """Vráti (prípadne vytvorí) cache posledných článkov feedov."""
+    global _feed_articles_cache
+    if _feed_articles_cache is None:
+        _feed_articles_cache = DiskCache(FEED_ARTICLES_CACHE_PATH, ttl=FEED_ARTICLES_CACHE_TTL,
+                                         max_entries=1000, max_bytes=None)
+    return _feed_articles_cache
+
+def _cached_articles(url, source_name):
+    """Vráti články z posledného stiahnutia feedu (pri HTTP 304), None ak nie sú v cache."""
+    articles = _get_feed_articles_cache().get(make_key("feed_articles", url))
+    if articles:
+        logger.info(f"⏸️ {source_name}: Bez zmeny od posledného načítania, {len(articles)} článkov z cache")
+        return articles
+    return None
+
+def _store_articles(url, articles):
+    if articles:
+        _get_feed_articles_cache().set(make_key("feed_articles", url), articles)
+
+def parse_feed(content, url, source_name):
+    """Spracuje obsah feedu na zoznam normalizovaných článkov."""
+    feed = feedparser.parse(content)
+    
+    if not feed.entries:
+        logger.warning(f"⚠️ Žiadne články v {source_name}")
+        return []
+
+    logger.info(f"📡 Zdroj: {url}")
+    logger.info(f"📊 Počet článkov: {len(feed.entries)}")
+    
+    articles = []
+    for idx, entry in enumerate(feed.entries, 1):
+        article = {
+            'title': entry.get('title', 'Bez názvu').strip(),
+            'url': entry.get('link', '').strip(),
+            'content': entry.get('description', '').strip(),
+            'source': source_name,
+            'published': entry.get('published', 'neuvedený')
+        }
+        articles.append(article)
+        
+        # Detailný výpis každého článku
+        logger.info(f"\n📌 Článok {idx}:")
+        logger.info(f"   🏷️ Titulok: {article['title']}")
+        logger.info(f"   🔗 URL: {article['url']}")
+        logger.info(f"   📅 Dátum: {article['published']}")
+        logger.info(f"   📝 Obsah: {article['content'][:150]}...")
+        logger.info(f"   📏 Dĺžka: {len(article['content'])} znakov")
+
+    logger.info(f"\n✅ {source_name}: Načítané {len(articles)} článkov")
+    return articles
+
 def fetch_feed(url, source_name):
     try:
         logger.info(f"\n🔎 Načítavam: {source_name.upper()}")
-        headers = {'User-Agent': 'Mozilla/5.0'}
-        response = requests.get(url, headers=headers, timeout=10)
-        feed = feedparser.parse(response.content)
-        
-        if not feed.entries:
-            logger.warning(f"⚠️ Žiadne články v {source_name}")
-            return []
-
-        logger.info(f"📡 Zdroj: {url}")
-        logger.info(f"📊 Počet článkov: {len(feed.entries)}")
-        
-        articles = []
-        for idx, entry in enumerate(feed.entries, 1):
-            article = {
-                'title': entry.get('title', 'Bez názvu').strip(),
-                'url': entry.get('link', '').strip(),
-                'content': entry.get('description', '').strip(),
-                'source': source_name,
-                'published': entry.get('published', 'neuvedený')
-            }
-            articles.append(article)
-            
-            # Detailný výpis každého článku
-            logger.info(f"\n📌 Článok {idx}:")
-            logger.info(f"   🏷️ Titulok: {article['title']}")
-            logger.info(f"   🔗 URL: {article['url']}")
-            logger.info(f"   📅 Dátum: {article['published']}")
-            logger.info(f"   📝 Obsah: {article['content'][:150]}...")
-            logger.info(f"   📏 Dĺžka: {len(article['content'])} znakov")
-
-        logger.info(f"\n✅ {source_name}: Načítané {len(articles)} článkov")
+        response = http_client.conditional_get(url, namespace="feed", timeout=10)
+        if response is None:
+            # 304 Not Modified - feed sa nezmenil, vrátia sa články z posledného stiahnutia
+            articles = _cached_articles(url, source_name)
+            if articles is not None:
+                return articles
+            response = http_client.get(url, timeout=10)
+        articles = parse_feed(response.content, url, source_name)
+        _store_articles(url, articles)
         return articles
 
     except Exception as e:
         logger.error(f"❌ Chyba v {source_name}: {str(e)}", exc_info=True)
         return []
 
+async def _fetch_and_parse(url, source_name, executor):
+    """Stiahne feed asynchrónne a spracuje ho v pracovnom vlákne."""
+    logger.info(f"\n🔎 Načítavam: {source_name.upper()}")
+    response = await http_client.async_conditional_get(url, namespace="feed", timeout=10)
+    if response is None:
+        # 304 Not Modified - feed sa nezmenil, vrátia sa články z posledného stiahnutia
+        articles = _cached_articles(url, source_name)
+        if articles is not None:
+            return articles, 'nezmenený'
+        # Články z posledného stiahnutia nie sú v cache - feed sa stiahne celý
+        response = await http_client.aget(url, timeout=10)
+    response.raise_for_status()
+    loop = asyncio.get_running_loop()
+    articles = await loop.run_in_executor(executor, parse_feed, response.content, url, source_name)
+    _store_articles(url, articles)
+    return articles, 'ok'
+
+async def fetch_feed_async(url, source_name, executor, deadline=FEED_DEADLINE):
+    """
+    Stiahne a spracuje jeden feed s časovým limitom.
+
+    Returns:
+        Dvojica (zoznam článkov, štatistika {'latency', 'count', 'status'}).
+    """
+    started = time.monotonic()
+    try:
+        articles, status = await asyncio.wait_for(_fetch_and_parse(url, source_name, executor), timeout=deadline)
+    except asyncio.TimeoutError:
+        logger.error(f"❌ {source_name}: Prekročený časový limit {deadline}s")
+        articles, status = [], 'timeout'
+    except Exception as e:
+        logger.error(f"❌ Chyba v {source_name}: {str(e)}")
+        articles, status = [], 'chyba'
+    
+    latency = time.monotonic() - started
+    return articles, {'latency': latency, 'count': len(articles), 'status': status}
+
+async def scrape_all_async(sources=None, deadline=FEED_DEADLINE):
+    """
+    Stiahne všetky feedy súbežne, spracuje ich v pracovných vláknach a zlúči výsledky.
+    Pomalý zdroj nezdrží ostatné - každý feed má vlastný časový limit.
+
+    Returns:
+        Dvojica (zoznam článkov v poradí zdrojov, štatistiky {zdroj: {'latency', 'count', 'status'}}).
+    """
+    sources = sources or SOURCES
+    logger.info("\n" + "="*60)
+    logger.info("🌐 SPÚŠŤAM SCRAPOVANIE ZDROJOV".center(60))
+    logger.info("="*60)
+    
+    with ThreadPoolExecutor(max_workers=PARSE_WORKERS) as executor:
+        results = await asyncio.gather(*[
+            fetch_feed_async(url, name, executor, deadline) for name, url in sources.items()
+        ])
+    
+    all_articles = []
+    stats = {}
+    for name, (articles, feed_stats) in zip(sources, results):
+        all_articles.extend(articles)
+        stats[name] = feed_stats
+    
+    logger.info("\n" + "="*60)
+    logger.info(f"📊 CELKOM: {len(all_articles)} článkov z {len(sources)} zdrojov".center(60))
+    logger.info("="*60)
+    return all_articles, stats
+
 def scrape_all():
     logger.info("\n" + "="*60)
     logger.info("🌐 SPÚŠŤAM SCRAPOVANIE ZDROJOV".center(60))
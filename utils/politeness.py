@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Modul pre ohľaduplné sťahovanie zo serverov zdrojov.
+Implementuje plánovač požiadaviek s token bucketom a limitom súbežných požiadaviek
+pre každý host, podporou Crawl-delay z robots.txt a adaptívnym odstupom pri 429/503.
+"""
+
+import os
+import time
+import asyncio
+import logging
+import threading
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Callable, Dict, Optional
+from urllib.parse import urlparse
+from urllib.robotparser import RobotFileParser
+from utils.disk_cache import DiskCache, make_key, CACHE_DIR
+from utils.concurrency import get_host
+
+logger = logging.getLogger("politeness")
+
+# Predvolené limity pre jeden host
+HOST_RATE = 1.0  # Priemerný počet požiadaviek za sekundu
+HOST_BURST = 3  # Maximálny počet požiadaviek naraz po období nečinnosti
+HOST_MAX_IN_FLIGHT = 2  # Maximálny počet súbežne prebiehajúcich požiadaviek
+
+# Výnimky pre konkrétne hosty: host -> {'rate': ..., 'burst': ..., 'max_in_flight': ...}
+HOST_OVERRIDES: Dict[str, Dict] = {}
+
+# Adaptívny odstup pri preťažení servera (429 / 503)
+BACKOFF_STATUS_CODES = (429, 503)
+BACKOFF_BASE = 2.0  # Prvý odstup v sekundách, pri ďalších zlyhaniach sa zdvojnásobuje
+MAX_BACKOFF = 300.0  # Maximálny odstup v sekundách
+
+# Cache súborov robots.txt
+ROBOTS_CACHE_PATH = os.path.join(CACHE_DIR, "robots.sqlite3")
+ROBOTS_CACHE_TTL = 24 * 3600  # 1 deň
+ROBOTS_TIMEOUT = 10.0
+MAX_CRAWL_DELAY = 60.0  # Vyššie hodnoty Crawl-delay sa orežú
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Spracuje hlavičku Retry-After (počet sekúnd alebo HTTP dátum).
+
+    Args:
+        value: Hodnota hlavičky.
+
+    Returns:
+        Počet sekúnd čakania alebo None, ak hlavička chýba alebo je neplatná.
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        moment = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return max(0.0, (moment - datetime.now(timezone.utc)).total_seconds())
+
+
+class _HostState:
+    """Stav plánovača pre jeden host."""
+
+    def __init__(self, rate: float, burst: int, max_in_flight: int):
+        self.rate = rate
+        self.burst = burst
+        self.max_in_flight = max_in_flight
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.in_flight = 0
+        self.blocked_until = 0.0  # Odstup po 429/503
+        self.failures = 0
+        self.robots_loaded = False
+        self.robots_lock = threading.Lock()
+
+
+class PolitenessScheduler:
+    """
+    Plánovač požiadaviek s limitmi pre každý host.
+
+    Každý host má vlastný token bucket a limit súbežných požiadaviek, takže pomalý
+    alebo preťažený server nebrzdí sťahovanie z ostatných hostov.
+    Jadro plánovača je neblokujúce (try_acquire), nad ním sú blokujúca (acquire)
+    a asynchrónna (acquire_async) varianta.
+    """
+
+    def __init__(self, rate: float = HOST_RATE, burst: int = HOST_BURST,
+                 max_in_flight: int = HOST_MAX_IN_FLIGHT,
+                 user_agent: str = '*',
+                 robots_fetcher: Optional[Callable[[str], Optional[str]]] = None,
+                 robots_cache: Optional[DiskCache] = None):
+        """
+        Inicializácia plánovača.
+
+        Args:
+            rate: Predvolený počet požiadaviek za sekundu na host.
+            burst: Predvolená veľkosť token bucketu.
+            max_in_flight: Predvolený limit súbežných požiadaviek na host.
+            user_agent: User-Agent, pre ktorý sa hľadá Crawl-delay v robots.txt.
+            robots_fetcher: Funkcia, ktorá pre URL adresu robots.txt vráti jeho obsah
+                (alebo None). Ak None, Crawl-delay sa neberie do úvahy.
+            robots_cache: Cache obsahu robots.txt. Ak None, použije sa predvolená cache na disku.
+        """
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.max_in_flight = max(1, max_in_flight)
+        self.user_agent = user_agent
+        self.robots_fetcher = robots_fetcher
+        self._robots_cache = robots_cache
+        self._hosts: Dict[str, _HostState] = {}
+        self._lock = threading.Lock()
+        self._condition = threading.Condition(self._lock)
+
+    def _get_state(self, host: str) -> _HostState:
+        """Vráti (prípadne vytvorí) stav hostu (volá sa so zámkom)."""
+        state = self._hosts.get(host)
+        if state is None:
+            override = HOST_OVERRIDES.get(host, {})
+            state = _HostState(override.get('rate', self.rate),
+                               max(1, override.get('burst', self.burst)),
+                               max(1, override.get('max_in_flight', self.max_in_flight)))
+            self._hosts[host] = state
+        return state
+
+    def _get_robots_cache(self) -> DiskCache:
+        """Vráti (prípadne vytvorí) cache robots.txt."""
+        with self._lock:
+            if self._robots_cache is None:
+                self._robots_cache = DiskCache(ROBOTS_CACHE_PATH, ttl=ROBOTS_CACHE_TTL,
+                                               max_entries=2000, max_bytes=None)
+        return self._robots_cache
+
+    def _crawl_delay(self, url: str) -> Optional[float]:
+        """
+        Zistí Crawl-delay z robots.txt hostu (obsah robots.txt sa ukladá do cache).
+
+        Args:
+            url: Ľubovoľná URL adresa na hoste.
+
+        Returns:
+            Crawl-delay v sekundách alebo None.
+        """
+        parsed = urlparse(url)
+        robots_url = f"{parsed.scheme or 'https'}://{parsed.netloc}/robots.txt"
+        cache = self._get_robots_cache()
+        key = make_key("robots", robots_url)
+
+        content = cache.get(key)
+        if content is None:
+            try:
+                content = self.robots_fetcher(robots_url) or ''
+            except Exception as e:
+                logger.warning(f"Nepodarilo sa načítať {robots_url}: {str(e)}")
+                content = ''
+            cache.set(key, content)
+
+        if not content:
+            return None
+
+        parser = RobotFileParser()
+        parser.parse(content.splitlines())
+        delay = parser.crawl_delay(self.user_agent)
+        if delay is None:
+            delay = parser.crawl_delay('*')
+        return min(float(delay), MAX_CRAWL_DELAY) if delay else None
+
+    def _apply_robots(self, url: str, host: str) -> None:
+        """Pri prvej požiadavke na host načíta Crawl-delay a upraví limity hostu."""
+        with self._lock:
+            state = self._get_state(host)
+        if state.robots_loaded:
+            return
+
+        # Ostatné požiadavky na rovnaký host počkajú, kým sa robots.txt načíta
+        with state.robots_lock:
+            if state.robots_loaded:
+                return
+            delay = self._crawl_delay(url) if self.robots_fetcher is not None else None
+            with self._lock:
+                if delay:
+                    state.rate = min(state.rate, 1.0 / delay)
+                    state.burst = 1
+                    state.tokens = min(state.tokens, 1.0)
+                state.robots_loaded = True
+            if delay:
+                logger.info(f"Host {host}: Crawl-delay {delay:.1f}s z robots.txt")
+
+    def try_acquire(self, url: str) -> float:
+        """
+        Pokúsi sa rezervovať slot pre požiadavku bez čakania.
+
+        Args:
+            url: URL adresa požiadavky.
+
+        Returns:
+            0.0 ak bol slot pridelený (treba ho uvoľniť cez release), inak odporúčaný
+            počet sekúnd čakania pred ďalším pokusom.
+        """
+        host = get_host(url)
+        now = time.monotonic()
+
+        with self._lock:
+            state = self._get_state(host)
+
+            if now < state.blocked_until:
+                return state.blocked_until - now
+
+            if state.in_flight >= state.max_in_flight:
+                return 0.05  # Čaká sa na uvoľnenie (acquire čaká na notifikáciu)
+
+            state.tokens = min(float(state.burst), state.tokens + (now - state.updated) * state.rate)
+            state.updated = now
+            if state.tokens < 1.0:
+                return (1.0 - state.tokens) / state.rate
+
+            state.tokens -= 1.0
+            state.in_flight += 1
+            return 0.0
+
+    def acquire(self, url: str) -> None:
+        """
+        Počká, kým je možné poslať požiadavku na host URL adresy (blokujúce volanie).
+
+        Args:
+            url: URL adresa požiadavky.
+        """
+        self._apply_robots(url, get_host(url))
+        while True:
+            wait = self.try_acquire(url)
+            if wait <= 0:
+                return
+            with self._condition:
+                self._condition.wait(timeout=wait)
+
+    async def acquire_async(self, url: str) -> None:
+        """
+        Asynchrónne počká, kým je možné poslať požiadavku na host URL adresy.
+
+        Args:
+            url: URL adresa požiadavky.
+        """
+        host = get_host(url)
+        with self._lock:
+            robots_loaded = self._get_state(host).robots_loaded
+        if not robots_loaded:
+            await asyncio.to_thread(self._apply_robots, url, host)
+        while True:
+            wait = self.try_acquire(url)
+            if wait <= 0:
+                return
+            await asyncio.sleep(wait)
+
+    def release(self, url: str, status_code: Optional[int] = None,
+                retry_after: Optional[str] = None) -> Optional[float]:
+        """
+        Uvoľní slot po dokončení požiadavky a prispôsobí odstup podľa odpovede.
+
+        Args:
+            url: URL adresa požiadavky.
+            status_code: HTTP stav odpovede (None pri sieťovej chybe).
+            retry_after: Hodnota hlavičky Retry-After.
+
+        Returns:
+            Nastavený odstup v sekundách pri 429/503, inak None.
+        """
+        host = get_host(url)
+        backoff = None
+
+        with self._condition:
+            state = self._get_state(host)
+            state.in_flight = max(0, state.in_flight - 1)
+
+            if status_code in BACKOFF_STATUS_CODES:
+                state.failures += 1
+                backoff = parse_retry_after(retry_after)
+                if backoff is None:
+                    backoff = BACKOFF_BASE * (2 ** (state.failures - 1))
+                backoff = min(backoff, MAX_BACKOFF)
+                state.blocked_until = max(state.blocked_until, time.monotonic() + backoff)
+                state.tokens = 0.0
+                logger.warning(f"Host {host} vrátil {status_code}, odstup {backoff:.1f}s")
+            elif status_code is not None and status_code < 500:
+                state.failures = 0
+
+            self._condition.notify_all()
+
+        return backoff
+
+    def stats(self) -> Dict[str, Dict]:
+        """
+        Vráti aktuálny stav hostov.
+
+        Returns:
+            Dictionary host -> {'rate', 'in_flight', 'failures', 'blocked_for'}.
+        """
+        now = time.monotonic()
+        with self._lock:
+            return {host: {'rate': state.rate, 'in_flight': state.in_flight, 'failures': state.failures,
+                           'blocked_for': max(0.0, state.blocked_until - now)}
+                    for host, state in self._hosts.items()}
@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Modul pre rozpočet požiadaviek na jazykové modely na strane klienta.
+Implementuje odhad počtu tokenov požiadavky a limiter s klzavým oknom jednej minúty,
+ktorý požiadavky radí do fronty tak, aby nebol prekročený limit požiadaviek (RPM)
+ani tokenov (TPM) za minútu, a meria čas čakania vo fronte.
+"""
+
+import math
+import time
+import asyncio
+import logging
+import threading
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger("rate_limiter")
+
+# Dĺžka okna limitov v sekundách
+WINDOW = 60.0
+
+# Priemerný počet znakov na token pre odhad (slovenský text má viac tokenov na znak ako anglický)
+CHARS_PER_TOKEN = 3.0
+# Réžia jednej správy v chate (rola, oddeľovače)
+MESSAGE_OVERHEAD_TOKENS = 4
+
+# Maximálne čakanie vo fronte, po ktorom sa požiadavka vzdá (sekundy)
+MAX_QUEUE_WAIT = 60.0
+
+
+class RateLimitTimeout(Exception):
+    """Požiadavka sa nedostala na rad do maximálneho času čakania."""
+
+
+def estimate_tokens(text: Optional[str]) -> int:
+    """
+    Odhadne počet tokenov textu.
+
+    Args:
+        text: Text.
+
+    Returns:
+        Odhadovaný počet tokenov.
+    """
+    if not text:
+        return 0
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def estimate_request_tokens(messages: List[str], max_tokens: int) -> int:
+    """
+    Odhadne počet tokenov, ktoré požiadavka započíta do limitu TPM (vstup aj maximálny výstup).
+
+    Args:
+        messages: Texty správ (systémový prompt, správa používateľa).
+        max_tokens: Maximálny počet tokenov odpovede.
+
+    Returns:
+        Odhadovaný počet tokenov.
+    """
+    return sum(estimate_tokens(message) + MESSAGE_OVERHEAD_TOKENS for message in messages) + max_tokens
+
+
+class Reservation:
+    """Rezervácia rozpočtu jednej požiadavky (počet tokenov sa dá po odpovedi upraviť)."""
+
+    def __init__(self, timestamp: float, tokens: int):
+        self.timestamp = timestamp
+        self.tokens = tokens
+
+
+class RateLimiter:
+    """
+    Limiter požiadaviek s limitmi RPM a TPM v klzavom okne jednej minúty.
+
+    Požiadavky sa obsluhujú v poradí príchodu (FIFO), takže veľká požiadavka nečaká donekonečna
+    za menšími. Jadro je neblokujúce (_try_acquire), nad ním sú blokujúca (acquire)
+    a asynchrónna (acquire_async) varianta.
+    """
+
+    def __init__(self, rpm: Optional[int] = None, tpm: Optional[int] = None, name: str = "LLM"):
+        """
+        Inicializácia.
+
+        Args:
+            rpm: Maximálny počet požiadaviek za minútu (None = bez limitu).
+            tpm: Maximálny počet tokenov za minútu (None = bez limitu).
+            name: Názov (pre logovanie).
+        """
+        self.rpm = rpm
+        self.tpm = tpm
+        self.name = name
+        self._window: deque = deque()
+        self._lock = threading.Lock()
+        self._condition = threading.Condition(self._lock)
+        self._next_ticket = 0
+        self._serving = 0
+        self._abandoned = set()
+        self._paused_until = 0.0
+        self._waits = {'requests': 0, 'queued': 0, 'total': 0.0, 'max': 0.0, 'timeouts': 0,
+                       'cancelled': 0}
+
+    def _prune(self, now: float) -> None:
+        while self._window and now - self._window[0].timestamp >= WINDOW:
+            self._window.popleft()
+
+    def _take_ticket(self) -> int:
+        with self._lock:
+            ticket = self._next_ticket
+            self._next_ticket += 1
+            self._waits['queued'] += 1
+            return ticket
+
+    def _advance(self) -> None:
+        """Posunie frontu za obslúžené a opustené miesta (volá sa so zámkom)."""
+        self._serving += 1
+        while self._serving in self._abandoned:
+            self._abandoned.discard(self._serving)
+            self._serving += 1
+        self._condition.notify_all()
+
+    def _try_acquire(self, ticket: int, tokens: int) -> Tuple[Optional[Reservation], float]:
+        """
+        Pokúsi sa pre miesto vo fronte rezervovať rozpočet bez čakania.
+
+        Returns:
+            Dvojica (rezervácia, 0.0) ak bol rozpočet pridelený, inak (None, odporúčaný počet sekúnd čakania).
+        """
+        now = time.monotonic()
+        with self._lock:
+            if ticket != self._serving:
+                return None, 0.05  # Na rade je skoršia požiadavka (acquire čaká na notifikáciu)
+            if now < self._paused_until:
+                return None, self._paused_until - now
+
+            self._prune(now)
+            waits = [0.0]
+            if self.rpm is not None and len(self._window) >= self.rpm:
+                waits.append(self._window[len(self._window) - self.rpm].timestamp + WINDOW - now)
+            if self.tpm is not None and self._window:
+                # Požiadavka väčšia ako celý limit prejde, keď je okno prázdne
+                excess = sum(entry.tokens for entry in self._window) + min(tokens, self.tpm) - self.tpm
+                if excess > 0:
+                    for entry in self._window:
+                        excess -= entry.tokens
+                        if excess <= 0:
+                            waits.append(entry.timestamp + WINDOW - now)
+                            break
+            wait = max(waits)
+            if wait > 0:
+                return None, wait
+
+            reservation = Reservation(now, tokens)
+            self._window.append(reservation)
+            self._advance()
+            return reservation, 0.0
+
+    def _finish_wait(self, started: float) -> None:
+        waited = time.monotonic() - started
+        with self._lock:
+            self._waits['requests'] += 1
+            self._waits['queued'] -= 1
+            self._waits['total'] += waited
+            self._waits['max'] = max(self._waits['max'], waited)
+        if waited >= 1.0:
+            logger.info(f"{self.name}: požiadavka čakala vo fronte {waited:.1f}s")
+
+    def _abandon(self, ticket: int, timed_out: bool) -> None:
+        """Uvoľní miesto vo fronte po vypršaní (timed_out) alebo zrušení čakania."""
+        with self._lock:
+            self._waits['queued'] -= 1
+            self._waits['timeouts' if timed_out else 'cancelled'] += 1
+            if ticket == self._serving:
+                self._advance()
+            elif ticket > self._serving:
+                self._abandoned.add(ticket)
+
+    def acquire(self, tokens: int, max_wait: float = MAX_QUEUE_WAIT) -> Reservation:
+        """
+        Počká, kým je v rozpočte miesto pre požiadavku (blokujúce volanie).
+
+        Args:
+            tokens: Odhadovaný počet tokenov požiadavky.
+            max_wait: Maximálne čakanie v sekundách.
+
+        Returns:
+            Rezervácia (cez record_usage sa dá upraviť skutočným počtom tokenov).
+
+        Raises:
+            RateLimitTimeout: Ak sa požiadavka nedostala na rad do max_wait sekúnd.
+        """
+        started = time.monotonic()
+        ticket = self._take_ticket()
+        try:
+            while True:
+                reservation, wait = self._try_acquire(ticket, tokens)
+                if reservation is not None:
+                    self._finish_wait(started)
+                    return reservation
+                if time.monotonic() + wait - started > max_wait:
+                    raise RateLimitTimeout(f"{self.name}: rozpočet RPM/TPM nedovolí požiadavku do {max_wait:.0f}s")
+                with self._condition:
+                    self._condition.wait(timeout=wait)
+        except RateLimitTimeout:
+            self._abandon(ticket, timed_out=True)
+            raise
+        except BaseException:
+            # Zrušené čakanie (napr. pomalšia hedged požiadavka) nie je vypršanie limitu
+            self._abandon(ticket, timed_out=False)
+            raise
+
+    async def acquire_async(self, tokens: int, max_wait: float = MAX_QUEUE_WAIT) -> Reservation:
+        """Asynchrónna varianta acquire."""
+        started = time.monotonic()
+        ticket = self._take_ticket()
+        try:
+            while True:
+                reservation, wait = self._try_acquire(ticket, tokens)
+                if reservation is not None:
+                    self._finish_wait(started)
+                    return reservation
+                if time.monotonic() + wait - started > max_wait:
+                    raise RateLimitTimeout(f"{self.name}: rozpočet RPM/TPM nedovolí požiadavku do {max_wait:.0f}s")
+                await asyncio.sleep(wait)
+        except RateLimitTimeout:
+            self._abandon(ticket, timed_out=True)
+            raise
+        except BaseException:
+            # Zrušené čakanie (napr. pomalšia hedged požiadavka) nie je vypršanie limitu
+            self._abandon(ticket, timed_out=False)
+            raise
+
+    def record_usage(self, reservation: Reservation, tokens: Optional[int]) -> None:
+        """
+        Nahradí odhad rezervácie skutočným počtom tokenov z odpovede.
+
+        Args:
+            reservation: Rezervácia z acquire.
+            tokens: Skutočný počet tokenov (None = ponechá sa odhad).
+        """
+        if tokens is None:
+            return
+        with self._condition:
+            reservation.tokens = tokens
+            self._condition.notify_all()
+
+    def pause(self, seconds: float) -> None:
+        """
+        Pozastaví všetky požiadavky (napr. po 429 s Retry-After).
+
+        Args:
+            seconds: Dĺžka pauzy v sekundách.
+        """
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    def stats(self) -> Dict:
+        """
+        Vráti stav limitera a metriky čakania vo fronte.
+
+        Returns:
+            Dictionary {'requests_last_minute', 'tokens_last_minute', 'queued', 'requests',
+            'queue_wait_avg', 'queue_wait_max', 'timeouts', 'cancelled'}; čakanie je None, kým neprešla
+            žiadna požiadavka, 'timeouts' počíta vypršania max_wait a 'cancelled' zrušené čakania.
+        """
+        with self._lock:
+            self._prune(time.monotonic())
+            waits = dict(self._waits)
+            return {
+                'requests_last_minute': len(self._window),
+                'tokens_last_minute': sum(entry.tokens for entry in self._window),
+                'queued': waits['queued'],
+                'requests': waits['requests'],
+                'queue_wait_avg': waits['total'] / waits['requests'] if waits['requests'] else None,
+                'queue_wait_max': waits['max'] if waits['requests'] else None,
+                'timeouts': waits['timeouts'],
+                'cancelled': waits['cancelled'],
+            }
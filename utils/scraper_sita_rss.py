@@ -1,35 +1,74 @@
+import os
 import feedparser
-import requests
 from bs4 import BeautifulSoup
 from utils.logger import logger
+from utils import http_client
+from utils.urls import canonicalize_url
+from utils.concurrency import ConcurrentProcessor
+from utils.disk_cache import DiskCache, make_key, CACHE_DIR
+from utils.politeness import HOST_MAX_IN_FLIGHT
+
+SITA_FEED_URL = "https://www.webnoviny.sk/tag/sita-zdravie/feed/"
+
+# Súbežné sťahovanie plných textov nových článkov (viac ako limit plánovača na host nemá zmysel)
+SITA_MAX_WORKERS = 4
+SITA_MAX_PER_HOST = HOST_MAX_IN_FLIGHT
+
+# Cache plných textov už stiahnutých článkov
+SITA_TEXT_CACHE_PATH = os.path.join(CACHE_DIR, "sita_texts.sqlite3")
+SITA_TEXT_CACHE_TTL = 14 * 24 * 3600  # 14 dní
+
+_text_cache = None
+
+def _get_text_cache():
+    global _text_cache
+    if _text_cache is None:
+        _text_cache = DiskCache(SITA_TEXT_CACHE_PATH, ttl=SITA_TEXT_CACHE_TTL, max_entries=5000)
+    return _text_cache
+
+def _text_key(link):
+    return make_key("sita_text", canonicalize_url(link))
+
+def fetch_full_text(link):
+    """Stiahne plný text článku; vráti None, ak sa text nepodarilo získať."""
+    try:
+        response = http_client.get(link, timeout=10)
+        soup = BeautifulSoup(response.text, 'html.parser')
+        article_body = soup.find('div', class_='article-content')
+        return article_body.get_text() if article_body else None
+    except Exception as e:
+        logger.warning(f"Nepodarilo sa načítať článok {link}: {e}")
+        return None
 
 def fetch_sita_articles():
     try:
         # Alternatívny RSS feed
-        feed = feedparser.parse("https://www.webnoviny.sk/tag/sita-zdravie/feed/")
+        feed_response = http_client.get(SITA_FEED_URL, timeout=10)
+        feed = feedparser.parse(feed_response.content)
+        cache = _get_text_cache()
+
+        # Plné texty známych odkazov z cache, nové sa stiahnu súbežne
+        texts = {entry.link: cache.get(_text_key(entry.link)) for entry in feed.entries}
+        new_links = [link for link, text in texts.items() if text is None]
+        if new_links:
+            processor = ConcurrentProcessor(max_workers=SITA_MAX_WORKERS, max_per_host=SITA_MAX_PER_HOST)
+            for link, text in zip(new_links, processor.map(fetch_full_text, new_links)):
+                if text:
+                    cache.set(_text_key(link), text)
+                    texts[link] = text
+        logger.info(f"SITA: {len(texts) - len(new_links)} článkov z cache, {len(new_links)} nových")
+
         articles = []
-        
         for entry in feed.entries:
-            # Načítanie plného textu z URL
-            full_text = ""
-            try:
-                response = requests.get(entry.link, timeout=10)
-                soup = BeautifulSoup(response.text, 'html.parser')
-                article_body = soup.find('div', class_='article-content')
-                full_text = article_body.get_text() if article_body else entry.description
-            except Exception as e:
-                logger.warning(f"Nepodarilo sa načítať článok {entry.link}: {e}")
-                full_text = entry.description
-            
             articles.append({
                 "title": entry.title,
                 "url": entry.link,
-                "content": full_text
+                "content": texts.get(entry.link) or entry.description
             })
-        
+
         logger.info(f"Načítané {len(articles)} článkov z SITA")
         return articles
-        
+
     except Exception as e:
         logger.error(f"Chyba pri SITA: {str(e)}")
         return []
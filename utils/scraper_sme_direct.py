@@ -1,14 +1,11 @@
-import requests
 from bs4 import BeautifulSoup
 from utils.logger import logger
+from utils import http_client
 
 def fetch_sme_direct():
     try:
         url = "https://zdravie.sme.sk"
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
-        }
-        response = requests.get(url, headers=headers, timeout=10)
+        response = http_client.get(url, timeout=10)
         soup = BeautifulSoup(response.text, 'html.parser')
         
         articles = []
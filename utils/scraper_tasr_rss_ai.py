@@ -1,23 +1,50 @@
+import os
 import feedparser
 from utils.logger import logger
+from utils import http_client
+from utils.disk_cache import DiskCache, make_key, CACHE_DIR
 
 DEFAULT_RSS_URL = "https://www.teraz.sk/rss/zdravie.rss"
 
+# Cache posledných načítaných článkov - pri HTTP 304 sa vrátia namiesto prázdneho zoznamu
+TASR_ARTICLES_CACHE_PATH = os.path.join(CACHE_DIR, "tasr_articles.sqlite3")
+
+_articles_cache = None
+
+def _get_articles_cache():
+    """Vráti (prípadne vytvorí) cache posledných článkov TASR."""
+    global _articles_cache
+    if _articles_cache is None:
+        _articles_cache = DiskCache(TASR_ARTICLES_CACHE_PATH, ttl=http_client.VALIDATOR_CACHE_TTL,
+                                    max_entries=100, max_bytes=None)
+    return _articles_cache
+
 def fetch_tasr_articles(rss_url=DEFAULT_RSS_URL):
     try:
-        feed = feedparser.parse(rss_url)
+        cache_key = make_key("tasr_articles", rss_url)
+        # Vlastný menný priestor validátorov, aby 304 pre tento feed neskrylo zmeny pred news_scraper
+        response = http_client.conditional_get(rss_url, namespace="tasr", timeout=10)
+        if response is None:
+            # 304 Not Modified - vrátia sa články z posledného načítania
+            articles = _get_articles_cache().get(cache_key)
+            if articles:
+                logger.info(f"TASR RSS bez zmeny od posledného načítania, {len(articles)} článkov z cache")
+                return articles
+            # Články z posledného načítania nie sú v cache - feed sa stiahne celý
+            response = http_client.get(rss_url, timeout=10)
+        response.raise_for_status()
+        feed = feedparser.parse(response.content)
         articles = []
-        
         for entry in feed.entries:
             articles.append({
                 "title": entry.get("title", ""),
                 "url": entry.get("link", ""),
                 "content": entry.get("summary", "")
             })
-        
+        if articles:
+            _get_articles_cache().set(cache_key, articles)
         logger.info(f"Načítané {len(articles)} článkov z TASR")
         return articles
-        
     except Exception as e:
         logger.error(f"Chyba pri načítaní TASR RSS: {e}")
         return []
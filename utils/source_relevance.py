@@ -6,8 +6,6 @@ Modul pre testovanie relevancie zdrojov pre zdravotnícke a vedecké správy.
 Implementuje logiku podobnú testu test_relevance.sh, ale ako Python modul.
 """
 
-import requests
-import re
 import logging
 from typing import List, Dict, Tuple, Set, Optional
 # Načítanie premenných z .env súboru
@@ -15,7 +13,16 @@ from dotenv import load_dotenv
 load_dotenv()  # toto načíta premenné z .env súboru do prostredia
 from bs4 import BeautifulSoup
 import os
-import openai
+import time
+import threading
+from urllib.parse import urlparse
+from utils.disk_cache import DiskCache, make_key, CACHE_DIR
+from utils.concurrency import ConcurrentProcessor
+from utils.keyword_matcher import KeywordMatcher
+from utils.text_compressor import compress_text
+from utils import http_client
+from utils.llm_providers import LLMProvider, OpenAICompatibleProvider, get_openai_rate_limiter
+from utils.api_key_manager import get_openai_key_pool
 
 # Konfigurácia loggeru
 logging.basicConfig(
@@ -36,49 +43,130 @@ KEYWORDS = {
     'léky', 'zajímavost', 'věda'
 }
 
+# Varianty kľúčových slov (čeština, slovenčina, angličtina). Porovnáva sa bez diakritiky,
+# variant ukončený '*' je kmeň pre skloňované a odvodené tvary (pozri utils.keyword_matcher).
+# Kmene sa používajú len tam, kde nezachytia bežné slová mimo témy; inak sa tvary vypisujú
+# (napr. 'zdrav*' by zachytil 'zdravím' aj 'zdravý', 'studi*' slovo 'studio', 'cardi*' slovo 'cardigan').
+# Anglické slová sú vždy vypísané, anglické kmene zachytávajú príliš veľa bežných slov.
+KEYWORD_VARIANTS = {
+    'zdraví': ['zdraví', 'zdravie', 'zdravia', 'zdraviu', 'zdravotn*', 'health', 'healthcare'],
+    'medicína': ['medicín*', 'medical', 'lekársk*', 'lékařsk*'],
+    'nemoc': ['nemoc*', 'chorob*', 'ochoren*', 'onemocněn*', 'disease', 'diseases', 'illness', 'illnesses'],
+    'epidemie': ['epidemi*', 'pandemi*', 'epidemic', 'epidemics', 'pandemic', 'pandemics'],
+    'bakterie': ['bakteri*', 'bacteria', 'bacterial', 'bacterium'],
+    'virus': ['virus*', 'vírus*', 'viru', 'viry', 'virů', 'virov*', 'virol*', 'viral'],
+    'infekce': ['infekc*', 'infekčn*', 'infection', 'infections', 'infectious'],
+    'léčba': ['léčb*', 'léčen*', 'léčiv*', 'liečb*', 'liečen*', 'liečiv*', 'terapi*',
+              'therapy', 'therapies', 'treatment', 'treatments'],
+    'prevence': ['prevenc*', 'prevention'],
+    # Bez tvaru 'štúdiu' - bez diakritiky koliduje s českým 'studiu' (ve studiu)
+    'studie': ['studie', 'studii', 'studií', 'studiemi', 'studiím', 'studiích',
+               'štúdia', 'štúdie', 'štúdií', 'štúdiou', 'štúdiám', 'štúdiách', 'štúdiami', 'study', 'studies'],
+    'výzkum': ['výzkum*', 'výskum*', 'research'],
+    'nádor': ['nádor*', 'rakovin*', 'onkolog*', 'tumor', 'tumors', 'tumour', 'tumours', 'cancer', 'cancers'],
+    'srdce': ['srdc*', 'srdeč*', 'kardio*', 'heart', 'hearts', 'cardiac', 'cardiology', 'cardiovascular'],
+    'mozek': ['mozk*', 'mozog', 'mozg*', 'brain', 'brains', 'neurolog*'],
+    'operace': ['operac*', 'operáci*', 'chirurg*', 'surgery', 'surgical'],
+    'léky': ['lék', 'léků', 'lékař*', 'lékárn*', 'liek*', 'lekár*', 'drug', 'drugs', 'medication', 'medications'],
+    'zajímavost': ['zajímavost*', 'zaujímavos*'],
+    # Bez tvarov 'vědě', 'vědu', 'vědou' - bez diakritiky kolidujú so slovesom 'vést' (vede, vedu, vedou)
+    'věda': ['vědy', 'vědec*', 'vědc*', 'vědeck*', 'vedy', 'vedec*', 'vedci', 'vedcov', 'vedeck*',
+             'science', 'sciences', 'scientist', 'scientists', 'scientific'],
+}
+
+# Kaskáda relevancie článkov: najprv lacné skóre z kľúčových slov a metadát,
+# AI sa volá len v neistom pásme (RELEVANCE_REJECT_SCORE < skóre < RELEVANCE_ACCEPT_SCORE)
+RELEVANCE_ACCEPT_SCORE = 4  # Od tohto skóre je článok relevantný bez AI
+RELEVANCE_REJECT_SCORE = 0  # Do tohto skóre (vrátane) je článok nerelevantný bez AI
+TITLE_KEYWORD_WEIGHT = 2  # Kľúčové slovo v názve
+TEXT_KEYWORD_WEIGHT = 1  # Kľúčové slovo v texte
+URL_KEYWORD_WEIGHT = 1  # Kľúčové slovo v ceste URL adresy (rubrika, slug; doména sa nepočíta)
+AI_RELEVANCE_WEIGHT = 5  # Kladný verdikt AI
+
 # Minimálny počet kľúčových slov pre uznanie zdroja ako relevantný
 MIN_KEYWORDS = 1  # Znížené z 3 na 1 podľa požiadavky
 
-# Načítanie API kľúčov z prostredia
-OPENAI_API_KEY = os.getenv("OPENAI_API_KEY_IGHI")  # Upravené podľa vášho .env
-if not OPENAI_API_KEY:
-    # Skús alternatívny kľúč
-    OPENAI_API_KEY = os.getenv("OPENAI_API_KEY_TASR")
-    if not OPENAI_API_KEY:
-        logger.warning("Žiadny OPENAI_API_KEY nie je nastavený v prostredí!")
+# Konfigurácia cache AI verdiktov relevancie
+AI_RELEVANCE_CACHE_PATH = os.path.join(CACHE_DIR, "ai_relevance.sqlite3")
+AI_RELEVANCE_CACHE_TTL = 14 * 24 * 3600  # 14 dní
+AI_RELEVANCE_CACHE_MAX_ENTRIES = 20000
+
+# Konfigurácia cache verdiktov relevancie zdrojov (relevancia rubriky sa mení zriedka)
+SOURCE_VERDICT_CACHE_PATH = os.path.join(CACHE_DIR, "source_verdicts.sqlite3")
+SOURCE_VERDICT_CACHE_TTL = 24 * 3600  # 1 deň
+
+SOURCE_LAST_VERDICT_TTL = 30 * 24 * 3600  # Posledný verdikt pre prípad, že sa stránka nezmenila (HTTP 304)
+
+# Návratová hodnota download_content, ak sa stránka od posledného stiahnutia nezmenila
+NOT_MODIFIED = object()
 
-# Konfigurácia OpenAI
-openai.api_key = OPENAI_API_KEY
+# Súbežnosť pri testovaní viacerých zdrojov
+SOURCE_TEST_MAX_WORKERS = 8
+SOURCE_TEST_MAX_PER_HOST = 2
+
+# Model a timeout AI kontroly relevancie (klient má vlastný kľúč, globálny stav openai sa nemení)
+AI_RELEVANCE_MODEL = "gpt-4o"
+AI_RELEVANCE_TIMEOUT = 30.0
+# Rozpočet tokenov textu článku pre AI kontrolu relevancie
+AI_RELEVANCE_TOKEN_BUDGET = 600
 
 class SourceRelevanceTester:
     """Trieda pre testovanie relevancie zdrojov."""
     
-    def __init__(self, keywords: Optional[Set[str]] = None, min_keywords: int = MIN_KEYWORDS):
+    def __init__(self, keywords: Optional[Set[str]] = None, min_keywords: int = MIN_KEYWORDS,
+                 ai_cache_ttl: Optional[float] = AI_RELEVANCE_CACHE_TTL,
+                 ai_cache_max_entries: Optional[int] = AI_RELEVANCE_CACHE_MAX_ENTRIES,
+                 source_cache_ttl: Optional[float] = SOURCE_VERDICT_CACHE_TTL,
+                 accept_score: int = RELEVANCE_ACCEPT_SCORE,
+                 reject_score: int = RELEVANCE_REJECT_SCORE,
+                 ai_provider: Optional[LLMProvider] = None):
         """
         Inicializácia testera relevancie.
         
         Args:
-            keywords: Set kľúčových slov. Ak None, použijú sa predvolené.
+            keywords: Set kľúčových slov. Ak None, použijú sa predvolené (aj s variantmi KEYWORD_VARIANTS).
             min_keywords: Minimálny počet kľúčových slov pre uznanie zdroja ako relevantný.
+            ai_cache_ttl: Doba platnosti AI verdiktov v cache v sekundách (None = bez expirácie).
+            ai_cache_max_entries: Maximálny počet AI verdiktov v cache.
+            source_cache_ttl: Doba platnosti verdiktov relevancie zdrojov v sekundách.
+            accept_score: Skóre, od ktorého je článok relevantný bez AI kontroly.
+            reject_score: Skóre, do ktorého (vrátane) je článok nerelevantný bez AI kontroly.
+            ai_provider: Poskytovateľ pre AI kontrolu relevancie. Ak None, použije sa OpenAI so zdieľaným poolom kľúčov.
         """
         self.keywords = keywords if keywords is not None else KEYWORDS
         self.min_keywords = min_keywords
-        self.headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-        }
+        self.accept_score = accept_score
+        self.reject_score = reject_score
+        self._stats_lock = threading.Lock()
+        self._relevance_counters = {'articles': 0, 'accepted_locally': 0, 'rejected_locally': 0, 'ai_checks': 0}
+        self.ai_provider = ai_provider or OpenAICompatibleProvider(
+            "OpenAI", None, AI_RELEVANCE_MODEL, timeout=AI_RELEVANCE_TIMEOUT, key_pool=get_openai_key_pool(),
+            rate_limiter=get_openai_rate_limiter())
+        self.keyword_matcher = KeywordMatcher(self.keywords, KEYWORD_VARIANTS if keywords is None else None)
+        self.ai_cache = DiskCache(AI_RELEVANCE_CACHE_PATH, ttl=ai_cache_ttl,
+                                  max_entries=ai_cache_max_entries, max_bytes=None)
+        self.source_cache = DiskCache(SOURCE_VERDICT_CACHE_PATH, ttl=source_cache_ttl,
+                                      max_entries=1000, max_bytes=None)
     
-    def download_content(self, url: str) -> Optional[str]:
+    def download_content(self, url: str, conditional: bool = False) -> Optional[str]:
         """
         Stiahne obsah webovej stránky.
         
         Args:
             url: URL adresa stránky na stiahnutie.
+            conditional: Či sa má použiť podmienená požiadavka (ETag / Last-Modified).
             
         Returns:
-            Obsah stránky ako string alebo None v prípade chyby.
+            Obsah stránky ako string, NOT_MODIFIED ak sa stránka nezmenila (len pri conditional=True)
+            alebo None v prípade chyby.
         """
         try:
-            response = requests.get(url, headers=self.headers, timeout=30)
+            if conditional:
+                response = http_client.conditional_get(url, namespace="source")
+                if response is None:
+                    return NOT_MODIFIED
+            else:
+                response = http_client.get(url)
             response.raise_for_status()
             return response.text
         except Exception as e:
@@ -101,13 +189,8 @@ class SourceRelevanceTester:
                 soup = BeautifulSoup(content, 'html.parser')
                 text_content = soup.get_text().lower()
                 
-                # Hľadanie kľúčových slov
-                found_keywords = set()
-                for keyword in self.keywords:
-                    if re.search(r'\b' + re.escape(keyword.lower()) + r'\b', text_content):
-                        found_keywords.add(keyword)
-                
-                return found_keywords
+                # Hľadanie kľúčových slov (jeden prechod textu)
+                return self.keyword_matcher.matches(text_content)
             except Exception as e:
                 logger.error(f"Chyba pri hľadaní kľúčových slov: {str(e)}")
                 return set()
@@ -124,48 +207,61 @@ class SourceRelevanceTester:
         Returns:
             Tuple (je_relevantný, dôvod)
         """
-        # Ak text je príliš dlhý, skrátime ho
-        if len(text) > 2000:
-            text = text[:2000] + "..."
+        # Dlhý text sa zhustí do rozpočtu tokenov (úvod a vety s kľúčovými slovami relevancie)
+        text = compress_text(text, AI_RELEVANCE_TOKEN_BUDGET, title=title, matcher=self.keyword_matcher)
         
-        if not OPENAI_API_KEY:
+        if not self.ai_provider.available():
             logger.warning("Nemôžem kontrolovať relevanciu pomocou AI - chýba API kľúč")
             return True, "AI kontrola nedostupná, predpokladám relevanciu"
         
+        # Kontrola cache verdiktov (kľúč z hash-u skráteného textu a názvu)
+        cache_key = make_key("ai_relevance", title, text)
+        cached = self.ai_cache.get(cache_key)
+        if cached is not None:
+            logger.info(f"AI relevancia z cache: {cached['reason']}")
+            return cached['is_relevant'], cached['reason']
+        
         try:
             # Použitie OpenAI API na kontrolu relevancie
-            response = openai.chat.completions.create(
-                model="gpt-4o",
-                messages=[
-                    {"role": "system", "content": "Si asistent, ktorý hodnotí relevanciu článkov z oblasti zdravia, medicíny a vedy. Tvoja úloha je určiť, či je článok relevantný pre ľudí zaujímajúcich sa o zdravotnícke a vedecké informácie."},
-                    {"role": "user", "content": f"Zhodnoť, či je nasledujúci článok relevantný z hľadiska zdravia, medicíny alebo vedy. Odpovedaj len 'ÁNO' alebo 'NIE' a dôvod.\n\nNÁZOV: {title}\n\nOBSAH: {text}"}
-                ],
+            result = self.ai_provider.complete(
+                "Si asistent, ktorý hodnotí relevanciu článkov z oblasti zdravia, medicíny a vedy. Tvoja úloha je určiť, či je článok relevantný pre ľudí zaujímajúcich sa o zdravotnícke a vedecké informácie.",
+                f"Zhodnoť, či je nasledujúci článok relevantný z hľadiska zdravia, medicíny alebo vedy. Odpovedaj len 'ÁNO' alebo 'NIE' a dôvod.\n\nNÁZOV: {title}\n\nOBSAH: {text}",
                 temperature=0.1,
                 max_tokens=100
-            )
-            
-            result = response.choices[0].message.content.strip()
+            ).strip()
             logger.info(f"AI relevancia: {result}")
             
             # Kontrola odpovede
             is_relevant = "ÁNO" in result.upper() or "ANO" in result.upper() or "YES" in result.upper()
+            
+            # Uloženie verdiktu do cache (chybové stavy sa neukladajú)
+            self.ai_cache.set(cache_key, {'is_relevant': is_relevant, 'reason': result, 'timestamp': time.time()})
             return is_relevant, result
         
         except Exception as e:
             logger.error(f"Chyba pri kontrole AI relevancie: {str(e)}")
             return True, f"Chyba pri AI kontrole: {str(e)}, predpokladám relevanciu"
     
-    def test_source(self, name: str, url: str) -> Dict:
+    def test_source(self, name: str, url: str, use_cache: bool = True) -> Dict:
         """
         Otestuje relevantnosť zdroja.
         
         Args:
             name: Názov zdroja.
             url: URL adresa zdroja.
+            use_cache: Či sa má použiť verdikt z cache (platný SOURCE_VERDICT_CACHE_TTL).
             
         Returns:
             Dictionary s výsledkami testu.
         """
+        cache_key = make_key("source", url)
+        if use_cache:
+            cached = self.source_cache.get(cache_key)
+            if cached is not None:
+                cached['found_keywords'] = set(cached['found_keywords'])
+                logger.info(f"Relevancia zdroja {name} z cache: {'relevantný' if cached['is_relevant'] else 'nerelevantný'}")
+                return cached
+        
         logger.info(f"Testujem relevanciu: {name}")
         logger.info(f"URL: {url}")
         
@@ -182,8 +278,15 @@ class SourceRelevanceTester:
             'error': None
         }
         
-        # Stiahnutie obsahu
-        content = self.download_content(url)
+        # Podmienené stiahnutie obsahu - ak sa stránka nezmenila (304), platí posledný verdikt
+        last_key = make_key("source_last", url)
+        previous = self.source_cache.get(last_key)
+        content = self.download_content(url, conditional=previous is not None)
+        if content is NOT_MODIFIED:
+            logger.info(f"Stránka zdroja {name} sa nezmenila, používam posledný verdikt")
+            self.source_cache.set(cache_key, previous)
+            previous['found_keywords'] = set(previous['found_keywords'])
+            return previous
         if not content:
             result['error'] = "Chyba pri sťahovaní obsahu"
             return result
@@ -219,19 +322,27 @@ class SourceRelevanceTester:
             if not ai_relevant:
                 logger.info(f"❌ Zdroj nie je relevantný podľa AI: {ai_reason}")
         
+        # Uloženie verdiktu do cache (s TTL) a posledného verdiktu (pre prípad HTTP 304)
+        cached = dict(result)
+        cached['found_keywords'] = sorted(found_keywords)
+        self.source_cache.set(cache_key, cached)
+        self.source_cache.set(last_key, cached, ttl=SOURCE_LAST_VERDICT_TTL)
+        
         return result
     
-    def test_sources(self, sources: List[Dict[str, str]]) -> List[Dict]:
+    def test_sources(self, sources: List[Dict[str, str]], use_cache: bool = True,
+                     max_workers: int = SOURCE_TEST_MAX_WORKERS) -> List[Dict]:
         """
-        Otestuje relevanciu viacerých zdrojov.
+        Otestuje relevanciu viacerých zdrojov (súbežne).
         
         Args:
             sources: Zoznam zdrojov na otestovanie. Každý zdroj je dictionary s kľúčmi 'name' a 'url'.
+            use_cache: Či sa majú použiť verdikty z cache.
+            max_workers: Maximálny počet súbežne testovaných zdrojov.
             
         Returns:
-            Zoznam výsledkov testov.
+            Zoznam výsledkov testov v poradí zdrojov.
         """
-        results = []
         total_sources = len(sources)
         relevant_sources = 0
         error_sources = 0
@@ -240,10 +351,16 @@ class SourceRelevanceTester:
         logger.info("TESTOVANIE RELEVANCIE ZDRAVOTNÍCKYCH A VEDECKÝCH ZDROJOV")
         logger.info("==============================================")
         
-        for source in sources:
-            logger.info("----------------------------------------------")
-            result = self.test_source(source['name'], source['url'])
-            results.append(result)
+        processor = ConcurrentProcessor(max_workers, SOURCE_TEST_MAX_PER_HOST)
+        results = processor.map_items(lambda source: self.test_source(source['name'], source['url'], use_cache),
+                                      sources, key=lambda source: source['url'])
+        
+        for index, source in enumerate(sources):
+            if results[index] is None:
+                # Neočakávaná chyba počas testu (výnimka je zalogovaná v ConcurrentProcessor)
+                results[index] = {'name': source['name'], 'url': source['url'], 'is_relevant': False,
+                                  'found_keywords': set(), 'keyword_count': 0, 'error': "Chyba pri testovaní"}
+            result = results[index]
             
             if result['error']:
                 error_sources += 1
@@ -275,73 +392,124 @@ class SourceRelevanceTester:
         
         return results
 
-    def check_article_relevance(self, article: Dict) -> Tuple[bool, int, str]:
+    def _count(self, counter: str) -> None:
+        """Zvýši počítadlo kaskády relevancie (volá sa z viacerých vlákien)."""
+        with self._stats_lock:
+            self._relevance_counters[counter] += 1
+
+    def relevance_stats(self) -> Dict[str, int]:
         """
-        Skontroluje relevanciu článku kombináciou kľúčových slov a AI.
+        Vráti počítadlá kaskády relevancie článkov.
+        
+        Returns:
+            Dictionary s počtom článkov, lokálne prijatých a zamietnutých článkov,
+            AI kontrol a ušetrených AI volaní.
+        """
+        with self._stats_lock:
+            stats = dict(self._relevance_counters)
+        stats['ai_calls_avoided'] = stats['accepted_locally'] + stats['rejected_locally']
+        return stats
+
+    def score_article(self, article: Dict) -> Tuple[int, List[str]]:
+        """
+        Lacné skóre relevancie článku z kľúčových slov v názve, texte a URL adrese.
         
         Args:
             article: Dictionary s informáciami o článku.
             
         Returns:
-            Tuple (je_relevantný, relevance_score, dôvod)
+            Tuple (skóre, zoznam dôvodov)
         """
-        # Inicializácia skóre relevancie
         relevance_score = 0
         reasons = []
         
-        # 1. Kontrola kľúčových slov v názve
-        title = article.get('title', '').lower()
-        title_keywords = []
-        for keyword in self.keywords:
-            if re.search(r'\b' + re.escape(keyword.lower()) + r'\b', title):
-                relevance_score += 2  # Názov má vyššiu váhu
-                title_keywords.append(keyword)
-        
+        # 1. Kľúčové slová v názve
+        title_keywords = list(self.keyword_matcher.find(article.get('title', '')))
+        relevance_score += TITLE_KEYWORD_WEIGHT * len(title_keywords)  # Názov má vyššiu váhu
         if title_keywords:
             reasons.append(f"Názov obsahuje kľúčové slová: {', '.join(title_keywords)}")
         
-        # 2. Kontrola kľúčových slov v texte
-        text = article.get('text', '').lower()
-        text_keywords = []
-        for keyword in self.keywords:
-            if re.search(r'\b' + re.escape(keyword.lower()) + r'\b', text):
-                relevance_score += 1
-                text_keywords.append(keyword)
-        
+        # 2. Kľúčové slová v texte
+        text_keywords = list(self.keyword_matcher.find(article.get('text', '')))
+        relevance_score += TEXT_KEYWORD_WEIGHT * len(text_keywords)
         if text_keywords:
             reasons.append(f"Text obsahuje kľúčové slová: {', '.join(text_keywords)}")
         
-        # 3. AI kontrola relevancie
+        # 3. Metadáta: rubrika a slug v ceste URL adresy (napr. /zdravie/, /veda/), doména sa nepočíta
+        url_path = urlparse(article.get('store_url') or article.get('url') or '').path
+        url_keywords = list(self.keyword_matcher.find(url_path))
+        relevance_score += URL_KEYWORD_WEIGHT * len(url_keywords)
+        if url_keywords:
+            reasons.append(f"URL obsahuje kľúčové slová: {', '.join(url_keywords)}")
+        
+        return relevance_score, reasons
+
+    def check_article_relevance(self, article: Dict) -> Tuple[bool, int, str]:
+        """
+        Skontroluje relevanciu článku kaskádou: najprv lokálne skóre z kľúčových slov
+        a metadát, AI sa volá len pre články v neistom pásme skóre.
+        
+        Args:
+            article: Dictionary s informáciami o článku.
+            
+        Returns:
+            Tuple (je_relevantný, relevance_score, dôvod)
+        """
+        self._count('articles')
+        relevance_score, reasons = self.score_article(article)
+        
+        # Jasné prípady rozhodne lokálne skóre
+        if relevance_score >= self.accept_score:
+            self._count('accepted_locally')
+            reasons.append(f"Relevantný podľa skóre {relevance_score} (prah {self.accept_score}), bez AI kontroly")
+            return True, relevance_score, " | ".join(reasons)
+        
         article_text = article.get('text', '')
         article_title = article.get('title', '')
         
-        if article_text:
-            ai_relevant, ai_reason = self.check_ai_relevance(article_text, article_title)
-            if ai_relevant:
-                relevance_score += 5  # AI relevancia má najvyššiu váhu
-                reasons.append(f"AI označilo článok ako relevantný: {ai_reason}")
-            else:
-                reasons.append(f"AI označilo článok ako nerelevantný: {ai_reason}")
-        
-        # Vyhodnotenie celkovej relevancie
-        is_relevant = relevance_score >= 1  # Stačí aspoň 1 bod relevancie
+        if relevance_score <= self.reject_score or not article_text:
+            self._count('rejected_locally')
+            reasons.append(f"Nerelevantný podľa skóre {relevance_score}, bez AI kontroly")
+            return False, relevance_score, " | ".join(reasons)
+        
+        # Neisté pásmo: rozhodne AI
+        self._count('ai_checks')
+        ai_relevant, ai_reason = self.check_ai_relevance(article_text, article_title)
+        if ai_relevant:
+            relevance_score += AI_RELEVANCE_WEIGHT  # AI relevancia má najvyššiu váhu
+            reasons.append(f"AI označilo článok ako relevantný: {ai_reason}")
+        else:
+            reasons.append(f"AI označilo článok ako nerelevantný: {ai_reason}")
         
-        return is_relevant, relevance_score, " | ".join(reasons)
+        return ai_relevant, relevance_score, " | ".join(reasons)
 
 # Zoznam predvolených zdrojov na testovanie
+# Voliteľné kľúče 'strategy', 'feed_url' a 'link_pattern' určujú spôsob získavania odkazov (pozri utils.link_discovery)
 DEFAULT_SOURCES = [
-    {"name": "Seznam Zprávy Tech", "url": "https://www.seznamzpravy.cz/sekce/tech-technologie-veda-431"},
-    {"name": "Seznam Zprávy Jídlo", "url": "https://www.seznamzpravy.cz/sekce/magazin-jidlo-485"},
-    {"name": "Seznam Zprávy Životní styl", "url": "https://www.seznamzpravy.cz/sekce/magazin-zivotni-styl-195"},
-    {"name": "Seznam Zprávy Návody", "url": "https://www.seznamzpravy.cz/sekce/tech-technologie-navody-434"},
-    {"name": "Seznam Zprávy Historie", "url": "https://www.seznamzpravy.cz/sekce/magazin-historie-231"},
-    {"name": "Aktuálně.cz Zdravotnictví", "url": "https://zpravy.aktualne.cz/zdravotnictvi/l~i:keyword:95/"},
-    {"name": "Ministr zdraví", "url": "https://www.ministrzdravi.cz/medialni-vystupy/"},
-    {"name": "Zdravé zprávy - Aktuality", "url": "https://www.zdravezpravy.cz/rubrika/aktuality/"},
-    {"name": "Zdravé zprávy - Zdravotnictví", "url": "https://www.zdravezpravy.cz/rubrika/zdravotnictvi/"},
-    {"name": "Medical Tribune", "url": "https://www.tribune.cz/vsechny-clanky/"},
-    {"name": "České noviny - RSS", "url": "https://www.ceskenoviny.cz/sluzby/rss/magazin.php"},
-    {"name": "České noviny - Magazín", "url": "https://www.ceskenoviny.cz/magazin/"}
+    {"name": "Seznam Zprávy Tech", "url": "https://www.seznamzpravy.cz/sekce/tech-technologie-veda-431",
+     "strategy": "anchors", "link_pattern": r"/clanek/"},
+    {"name": "Seznam Zprávy Jídlo", "url": "https://www.seznamzpravy.cz/sekce/magazin-jidlo-485",
+     "strategy": "anchors", "link_pattern": r"/clanek/"},
+    {"name": "Seznam Zprávy Životní styl", "url": "https://www.seznamzpravy.cz/sekce/magazin-zivotni-styl-195",
+     "strategy": "anchors", "link_pattern": r"/clanek/"},
+    {"name": "Seznam Zprávy Návody", "url": "https://www.seznamzpravy.cz/sekce/tech-technologie-navody-434",
+     "strategy": "anchors", "link_pattern": r"/clanek/"},
+    {"name": "Seznam Zprávy Historie", "url": "https://www.seznamzpravy.cz/sekce/magazin-historie-231",
+     "strategy": "anchors", "link_pattern": r"/clanek/"},
+    {"name": "Aktuálně.cz Zdravotnictví", "url": "https://zpravy.aktualne.cz/zdravotnictvi/l~i:keyword:95/",
+     "strategy": "anchors", "link_pattern": r"/r~[0-9a-f]+/"},
+    {"name": "Ministr zdraví", "url": "https://www.ministrzdravi.cz/medialni-vystupy/",
+     "strategy": "autodiscover"},
+    {"name": "Zdravé zprávy - Aktuality", "url": "https://www.zdravezpravy.cz/rubrika/aktuality/",
+     "strategy": "autodiscover"},
+    {"name": "Zdravé zprávy - Zdravotnictví", "url": "https://www.zdravezpravy.cz/rubrika/zdravotnictvi/",
+     "strategy": "autodiscover"},
+    {"name": "Medical Tribune", "url": "https://www.tribune.cz/vsechny-clanky/",
+     "strategy": "autodiscover"},
+    {"name": "České noviny - RSS", "url": "https://www.ceskenoviny.cz/sluzby/rss/magazin.php",
+     "strategy": "feed", "feed_url": "https://www.ceskenoviny.cz/sluzby/rss/magazin.php"},
+    {"name": "České noviny - Magazín", "url": "https://www.ceskenoviny.cz/magazin/",
+     "strategy": "anchors", "link_pattern": r"/zpravy/.+/\d+"}
 ]
 
 def test_default_sources():
@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Modul pre zhustenie textu článku pred odoslaním jazykovému modelu alebo prekladaču.
+Implementuje odstránenie balastu (cookies, "prečítajte si aj", medailóny autorov, zdieľanie),
+extraktívny výber viet (úvod článku a vety s najväčšou hustotou kľúčových slov)
+a orezanie na rozpočet tokenov počítaný tokenizerom modelu (tiktoken, inak odhad).
+"""
+
+import re
+import logging
+import threading
+from typing import Iterable, List, Optional, Tuple
+from utils.keyword_matcher import KeywordMatcher, PREFIX_MARKER, fold
+from utils.rate_limiter import CHARS_PER_TOKEN, estimate_tokens
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+logger = logging.getLogger("text_compressor")
+
+# Model, ktorého tokenizer sa použije na počítanie tokenov
+TOKENIZER_MODEL = "gpt-4o"
+FALLBACK_ENCODING = "cl100k_base"
+
+# Počet úvodných viet článku, ktoré sa zachovajú prednostne
+LEAD_SENTENCES = 3
+
+# Balast sa hľadá len v krátkych odsekoch (dlhší odsek so slovom "cookies" je obsah článku)
+BOILERPLATE_MAX_LENGTH = 300
+
+# Vzory odsekov s balastom (sk/cs/en), porovnávajú sa s textom bez diakritiky a malými písmenami
+BOILERPLATE_PATTERNS = [
+    r'^(pouzivame|pouzivaji|we use|(this (web)?site|tento web|tato stranka|tieto stranky|tyto stranky) '
+    r'(uses|pouziva|pouzivaji))\b.{0,60}\bcookie', r'\bsubory cookie\b',
+    r'\bcookie (policy|settings)\b', r'\bsouhlas\w* se zpracovanim\b', r'\bsuhlas\w* so spracovanim\b',
+    r'^(precitajte|citajte|prectete|ctete) si (aj|tiez|take|dalsie)\b', r'^suvisiace( clanky)?\b',
+    r'^(read|see) (also|more)\b', r'^related( articles| stories)?\b', r'^(more|also) on\b',
+    r'^(sledujte|sleduj) nas\b', r'^follow us\b',
+    r'^(zdielat|zdielajte|sdilet|share)( (clanok|this( article)?|on \w+))?\s*:?$',
+    # Výzvy na odber len na začiatku odseku (krátky odsek článku o newsletteri je obsah)
+    r'^newsletter\w*\b', r'^(odoberajte|subscribe|prihlaste sa na odber)\b',
+    r'\ball rights reserved\b', r'\bvsetky prava vyhradene\b', r'\bvsechna prava vyhrazena\b', r'^©',
+    # Medailóny autorov len na začiatku odseku (veta článku "MUDr. X je redaktorom ..." sa nesmie stratiť)
+    r'^(autor|autorka|author)\s*:', r'^(je|bol|byl|byla|bola) (redaktor|redaktorka|novinar|novinarka)\w*\b',
+    r'^(is|was) an? (reporter|journalist|correspondent|editor|writer)\b', r'^writes about\b',
+    r'^(foto|photo|zdroj foto|ilustracna snimka|ilustracni foto)\s*:', r'^(reklama|advertisement|inzercia)$',
+]
+_BOILERPLATE = re.compile('|'.join(f'(?:{pattern})' for pattern in BOILERPLATE_PATTERNS))
+
+_SENTENCE_SPLIT = re.compile(r'(?<=[.!?…])\s+(?=["„“‚(]?[A-ZÁÄČĎÉĚÍĹĽŇÓÔŔŘŠŤÚŮÝŽ0-9])')
+_WORD = re.compile(r'\w+')
+
+# Minimálna dĺžka slova z názvu, ktoré sa berie ako kľúčové slovo
+TITLE_WORD_MIN_LENGTH = 4
+# Dĺžka kmeňa slov z názvu (zachytí skloňované tvary)
+TITLE_STEM_LENGTH = 5
+
+_encoding = None
+_encoding_loaded = False
+_encoding_lock = threading.Lock()
+
+
+def _get_encoding():
+    """Vráti tokenizer modelu (None, ak tiktoken nie je dostupný alebo sa kódovanie nepodarilo načítať)."""
+    global _encoding, _encoding_loaded
+    if _encoding_loaded:
+        return _encoding
+    with _encoding_lock:
+        if not _encoding_loaded:
+            if tiktoken is None:
+                logger.warning("Balík tiktoken nie je nainštalovaný, počet tokenov sa bude odhadovať podľa dĺžky textu")
+            else:
+                try:
+                    try:
+                        _encoding = tiktoken.encoding_for_model(TOKENIZER_MODEL)
+                    except KeyError:
+                        _encoding = tiktoken.get_encoding(FALLBACK_ENCODING)
+                except Exception as e:
+                    logger.warning(f"Tokenizer tiktoken sa nepodarilo načítať, počet tokenov sa bude odhadovať "
+                                   f"podľa dĺžky textu: {str(e)}")
+            _encoding_loaded = True
+    return _encoding
+
+
+def load_tokenizer() -> bool:
+    """
+    Načíta tokenizer vopred (pri štarte), aby sa prípadný prechod na odhad zalogoval raz a hneď,
+    nie až pri prvom článku.
+
+    Returns:
+        True ak sa tokeny počítajú tokenizerom modelu, False ak sa odhadujú.
+    """
+    return _get_encoding() is not None
+
+
+def count_tokens(text: Optional[str]) -> int:
+    """
+    Spočíta tokeny textu tokenizerom modelu (bez tiktoken odhadom podľa dĺžky).
+
+    Args:
+        text: Text.
+
+    Returns:
+        Počet tokenov.
+    """
+    if not text:
+        return 0
+    encoding = _get_encoding()
+    if encoding is None:
+        return estimate_tokens(text)
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """
+    Oreže text na max_tokens tokenov (bez tiktoken podľa odhadovaného počtu znakov na token).
+
+    Args:
+        text: Text.
+        max_tokens: Maximálny počet tokenov.
+
+    Returns:
+        Orezaný text.
+    """
+    encoding = _get_encoding()
+    if encoding is None:
+        return text[:int(max_tokens * CHARS_PER_TOKEN)]
+    tokens = encoding.encode(text, disallowed_special=())
+    return encoding.decode(tokens[:max_tokens]) if len(tokens) > max_tokens else text
+
+
+def strip_boilerplate(text: str) -> str:
+    """
+    Odstráni z textu odseky s balastom (lišty cookies, odkazy "prečítajte si aj", medailóny autorov,
+    výzvy na zdieľanie a odber) a opakujúce sa odseky.
+
+    Args:
+        text: Text článku (odseky oddelené novými riadkami).
+
+    Returns:
+        Text bez balastu.
+    """
+    kept = []
+    seen = set()
+    for paragraph in text.splitlines():
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+        folded = fold(paragraph)
+        if folded in seen:
+            continue
+        seen.add(folded)
+        if len(paragraph) <= BOILERPLATE_MAX_LENGTH and _BOILERPLATE.search(folded):
+            continue
+        kept.append(paragraph)
+    return "\n\n".join(kept)
+
+
+def split_sentences(text: str) -> List[Tuple[int, str]]:
+    """
+    Rozdelí text na vety.
+
+    Args:
+        text: Text (odseky oddelené novými riadkami).
+
+    Returns:
+        Zoznam dvojíc (index odseku, veta).
+    """
+    sentences = []
+    paragraphs = [paragraph.strip() for paragraph in text.splitlines() if paragraph.strip()]
+    for index, paragraph in enumerate(paragraphs):
+        sentences.extend((index, sentence) for sentence in _SENTENCE_SPLIT.split(paragraph) if sentence.strip())
+    return sentences
+
+
+def title_matcher(title: str) -> Optional[KeywordMatcher]:
+    """
+    Zostaví index kľúčových slov z názvu článku (dlhšie slová ako kmene).
+
+    Args:
+        title: Názov článku.
+
+    Returns:
+        KeywordMatcher alebo None, ak názov neobsahuje vhodné slová.
+    """
+    words = [word for word in dict.fromkeys(_WORD.findall(fold(title or '')))
+             if len(word) >= TITLE_WORD_MIN_LENGTH and not word.isdigit()]
+    if not words:
+        return None
+    variants = {word: [word[:TITLE_STEM_LENGTH] + PREFIX_MARKER] for word in words if len(word) > TITLE_STEM_LENGTH}
+    return KeywordMatcher(words, variants)
+
+
+def _score(sentence: str, matchers: Iterable[KeywordMatcher]) -> float:
+    """Hustota kľúčových slov vo vete (počet výskytov na slovo)."""
+    words = len(_WORD.findall(sentence))
+    if not words:
+        return 0.0
+    hits = sum(len(positions) for matcher in matchers for positions in matcher.find(sentence).values())
+    return hits / words
+
+
+def compress_text(text: str, max_tokens: int, title: Optional[str] = None,
+                  matcher: Optional[KeywordMatcher] = None, lead_sentences: int = LEAD_SENTENCES) -> str:
+    """
+    Zhustí text článku do rozpočtu tokenov. Text, ktorý sa do rozpočtu zmestí, sa nemení. Inak najprv
+    odstráni balast; ak sa text ani potom nezmestí, vyberie úvodné vety a potom vety s najväčšou hustotou kľúčových slov (z názvu a z matcher),
+    kým neminie rozpočet. Vybrané vety zostanú v pôvodnom poradí a odsekoch.
+
+    Args:
+        text: Text článku.
+        max_tokens: Rozpočet tokenov.
+        title: Názov článku (jeho slová sa berú ako kľúčové slová).
+        matcher: Ďalšie kľúčové slová (napr. index relevancie).
+        lead_sentences: Počet úvodných viet, ktoré majú prednosť.
+
+    Returns:
+        Zhustený text.
+    """
+    if not text or count_tokens(text) <= max_tokens:
+        return text
+    cleaned = strip_boilerplate(text)
+    if count_tokens(cleaned) <= max_tokens:
+        return cleaned
+
+    sentences = split_sentences(cleaned)
+    matchers = [m for m in (title_matcher(title), matcher) if m is not None]
+    costs = [count_tokens(sentence) + 1 for _, sentence in sentences]
+
+    # Poradie výberu: úvod článku, potom podľa hustoty kľúčových slov (pri zhode skoršia veta)
+    lead = list(range(min(lead_sentences, len(sentences))))
+    rest = sorted(range(len(lead), len(sentences)),
+                  key=lambda index: (-_score(sentences[index][1], matchers), index))
+
+    selected = set()
+    budget = max_tokens
+    for index in lead + rest:
+        if costs[index] <= budget:
+            selected.add(index)
+            budget -= costs[index]
+
+    if not selected:
+        # Ani prvá veta sa nezmestí - orezanie podľa tokenov
+        return truncate_to_tokens(cleaned, max_tokens)
+
+    paragraphs: List[List[str]] = []
+    last_paragraph = None
+    for index in sorted(selected):
+        paragraph, sentence = sentences[index]
+        if paragraph != last_paragraph:
+            paragraphs.append([])
+            last_paragraph = paragraph
+        paragraphs[-1].append(sentence)
+
+    compressed = "\n\n".join(" ".join(paragraph) for paragraph in paragraphs)
+    logger.debug(f"Text zhustený z {len(sentences)} na {len(selected)} viet")
+    return compressed
@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Modul pre preklad textov do slovenčiny.
+Implementuje dávkový preklad cez DeepL (primárne) a Google Translate (záložne)
+a perzistentnú cache prekladov na úrovni jednotlivých segmentov.
+"""
+
+import os
+import logging
+import hashlib
+from typing import Dict, List, Optional, Tuple
+# Načítanie premenných z .env súboru
+from dotenv import load_dotenv
+load_dotenv()  # toto načíta premenné z .env súboru do prostredia
+from utils.disk_cache import DiskCache, make_key, CACHE_DIR
+from utils import http_client
+from utils.text_compressor import compress_text, count_tokens
+
+logger = logging.getLogger("translator")
+
+# API kľúče prekladačov
+DEEPL_API_KEY = os.getenv("DEEPL_API_KEY")
+GOOGLE_TRANSLATE_API_KEY = os.getenv("GOOGLE_TRANSLATE_API_KEY")
+
+DEEPL_URL = "https://api.deepl.com/v2/translate"
+GOOGLE_TRANSLATE_URL = "https://translation.googleapis.com/language/translate/v2"
+
+# Limity jednej požiadavky (DeepL: max 50 textov a 128 KiB, Google: max 128 segmentov)
+DEEPL_MAX_TEXTS = 50
+DEEPL_MAX_BYTES = 120 * 1024
+GOOGLE_MAX_TEXTS = 128
+GOOGLE_MAX_CHARS = 30000
+
+# Maximálna dĺžka jedného segmentu v tokenoch (dlhší segment sa zhustí výberom viet)
+MAX_SEGMENT_TOKENS = 3000
+
+# Konfigurácia cache prekladov
+TRANSLATION_CACHE_PATH = os.path.join(CACHE_DIR, "translations.sqlite3")
+TRANSLATION_CACHE_TTL = 90 * 24 * 3600  # 90 dní
+TRANSLATION_CACHE_MAX_ENTRIES = 50000
+TRANSLATION_CACHE_MAX_BYTES = 200 * 1024 * 1024  # 200 MB
+
+TARGET_LANG = 'sk'
+
+
+def _chunk(texts: List[str], max_texts: int, max_size: int, size_of) -> List[List[int]]:
+    """
+    Rozdelí indexy textov do dávok podľa limitu počtu textov a veľkosti.
+
+    Args:
+        texts: Zoznam textov.
+        max_texts: Maximálny počet textov v dávke.
+        max_size: Maximálna veľkosť dávky.
+        size_of: Funkcia, ktorá vráti veľkosť textu.
+
+    Returns:
+        Zoznam dávok (zoznamov indexov).
+    """
+    batches = []
+    current: List[int] = []
+    current_size = 0
+
+    for index, text in enumerate(texts):
+        size = size_of(text)
+        if current and (len(current) >= max_texts or current_size + size > max_size):
+            batches.append(current)
+            current, current_size = [], 0
+        current.append(index)
+        current_size += size
+
+    if current:
+        batches.append(current)
+    return batches
+
+
+class Translator:
+    """Trieda pre dávkový preklad textov do slovenčiny s cache segmentov."""
+
+    def __init__(self, deepl_api_key: Optional[str] = DEEPL_API_KEY,
+                 google_api_key: Optional[str] = GOOGLE_TRANSLATE_API_KEY,
+                 cache: Optional[DiskCache] = None):
+        """
+        Inicializácia prekladača.
+
+        Args:
+            deepl_api_key: API kľúč pre DeepL.
+            google_api_key: API kľúč pre Google Translate.
+            cache: Cache prekladov. Ak None, použije sa predvolená cache na disku.
+        """
+        self.deepl_api_key = deepl_api_key
+        self.google_api_key = google_api_key
+        self.cache = cache if cache is not None else DiskCache(
+            TRANSLATION_CACHE_PATH, ttl=TRANSLATION_CACHE_TTL,
+            max_entries=TRANSLATION_CACHE_MAX_ENTRIES, max_bytes=TRANSLATION_CACHE_MAX_BYTES)
+
+    @staticmethod
+    def _cache_key(text: str, source_lang: str) -> str:
+        """Kľúč cache pre segment (zdrojový jazyk + hash textu)."""
+        return make_key("translation", source_lang, TARGET_LANG, hashlib.sha256(text.encode('utf-8')).hexdigest())
+
+    @staticmethod
+    def _prepare(text: str) -> str:
+        """Zhustí príliš dlhý segment (kratšie segmenty sa prekladajú bez zmeny)."""
+        if count_tokens(text) > MAX_SEGMENT_TOKENS:
+            return compress_text(text, MAX_SEGMENT_TOKENS)
+        return text
+
+    def _translate_deepl(self, texts: List[str], source_lang: str) -> Optional[List[str]]:
+        """
+        Preloží jednu dávku textov pomocou DeepL.
+
+        Returns:
+            Zoznam prekladov alebo None v prípade chyby.
+        """
+        try:
+            headers = {
+                'Authorization': f'DeepL-Auth-Key {self.deepl_api_key}',
+                'Content-Type': 'application/json',
+            }
+            data = {
+                'text': texts,
+                'target_lang': TARGET_LANG.upper(),
+                'source_lang': source_lang.upper()
+            }
+            response = http_client.post(DEEPL_URL, headers=headers, json=data, timeout=30)
+
+            if response.status_code == 200:
+                result = response.json()
+                translations = result.get('translations', [])
+                if len(translations) == len(texts):
+                    return [translation['text'] for translation in translations]
+            logger.warning(f"DeepL API vrátilo chybový kód: {response.status_code}")
+        except Exception as e:
+            logger.warning(f"Chyba pri preklade pomocou DeepL: {str(e)}")
+        return None
+
+    def _translate_google(self, texts: List[str], source_lang: str) -> Optional[List[str]]:
+        """
+        Preloží jednu dávku textov pomocou Google Translate.
+
+        Returns:
+            Zoznam prekladov alebo None v prípade chyby.
+        """
+        try:
+            payload = {
+                'q': texts,
+                'target': TARGET_LANG,
+                'source': source_lang,
+                'format': 'text'
+            }
+            response = http_client.post(f"{GOOGLE_TRANSLATE_URL}?key={self.google_api_key}", json=payload, timeout=30)
+
+            if response.status_code == 200:
+                translations = response.json().get('data', {}).get('translations', [])
+                if len(translations) == len(texts):
+                    return [translation['translatedText'] for translation in translations]
+            logger.warning(f"Google Translate API vrátilo chybový kód: {response.status_code}")
+        except Exception as e:
+            logger.warning(f"Chyba pri preklade pomocou Google Translate: {str(e)}")
+        return None
+
+    def _translate_uncached(self, texts: List[str], source_lang: str) -> Dict[str, str]:
+        """
+        Preloží texty, ktoré nie sú v cache, v čo najmenšom počte požiadaviek.
+
+        Args:
+            texts: Unikátne texty na preklad.
+            source_lang: Zdrojový jazyk.
+
+        Returns:
+            Dictionary {pôvodný text: preklad} pre úspešne preložené texty.
+        """
+        translated: Dict[str, str] = {}
+        remaining = list(texts)
+
+        # 1. Pokus: DeepL (primárna metóda)
+        if self.deepl_api_key:
+            failed = []
+            for batch in _chunk(remaining, DEEPL_MAX_TEXTS, DEEPL_MAX_BYTES, lambda t: len(t.encode('utf-8'))):
+                batch_texts = [remaining[i] for i in batch]
+                result = self._translate_deepl(batch_texts, source_lang)
+                if result is None:
+                    failed.extend(batch_texts)
+                    continue
+                translated.update(zip(batch_texts, result))
+            if translated:
+                logger.info(f"Preložených {len(translated)} segmentov pomocou DeepL API")
+            remaining = failed
+        else:
+            logger.warning("DEEPL_API_KEY nie je nastavený, skúšam Google Translate")
+
+        # 2. Pokus: Google Translate (fallback)
+        if remaining and self.google_api_key:
+            google_count = 0
+            for batch in _chunk(remaining, GOOGLE_MAX_TEXTS, GOOGLE_MAX_CHARS, len):
+                batch_texts = [remaining[i] for i in batch]
+                result = self._translate_google(batch_texts, source_lang)
+                if result is None:
+                    continue
+                translated.update(zip(batch_texts, result))
+                google_count += len(batch_texts)
+            if google_count:
+                logger.info(f"Preložených {google_count} segmentov pomocou Google Translate API")
+        elif remaining:
+            logger.warning("GOOGLE_TRANSLATE_API_KEY nie je nastavený, preklad nebude vykonaný")
+
+        return translated
+
+    def translate_batch(self, texts: List[str], source_lang: str) -> List[str]:
+        """
+        Preloží zoznam textov z jedného zdrojového jazyka do slovenčiny.
+
+        Args:
+            texts: Zoznam textov na preklad.
+            source_lang: Zdrojový jazyk textov.
+
+        Returns:
+            Zoznam prekladov v rovnakom poradí. Texty, ktoré sa nepodarilo preložiť,
+            sa vrátia v pôvodnom znení.
+        """
+        return self.translate_segments([(text, source_lang) for text in texts])
+
+    def translate_segments(self, segments: List[Tuple[str, str]]) -> List[str]:
+        """
+        Preloží segmenty s rôznymi zdrojovými jazykmi (napr. názvy a texty všetkých článkov behu).
+
+        Args:
+            segments: Zoznam dvojíc (text, zdrojový jazyk).
+
+        Returns:
+            Zoznam prekladov v rovnakom poradí ako vstupné segmenty.
+        """
+        results: List[Optional[str]] = [None] * len(segments)
+        missing: Dict[str, List[str]] = {}  # jazyk -> unikátne texty bez prekladu v cache
+
+        for index, (text, source_lang) in enumerate(segments):
+            if not text or not text.strip() or source_lang == TARGET_LANG:
+                results[index] = text
+                continue
+
+            prepared = self._prepare(text)
+            cached = self.cache.get(self._cache_key(prepared, source_lang))
+            if cached is not None:
+                results[index] = cached
+            elif prepared not in missing.setdefault(source_lang, []):
+                missing[source_lang].append(prepared)
+
+        cached_count = sum(1 for result in results if result is not None)
+        if any(missing.values()):
+            logger.info(f"Preklad: {cached_count} segmentov z cache alebo bez potreby prekladu, {sum(len(t) for t in missing.values())} na preklad")
+
+        translated_by_lang = {}
+        for source_lang, texts in missing.items():
+            if not texts:
+                continue
+            translated = self._translate_uncached(texts, source_lang)
+            for original, translation in translated.items():
+                self.cache.set(self._cache_key(original, source_lang), translation)
+            translated_by_lang[source_lang] = translated
+
+        for index, (text, source_lang) in enumerate(segments):
+            if results[index] is not None:
+                continue
+            prepared = self._prepare(text)
+            translation = translated_by_lang.get(source_lang, {}).get(prepared)
+            if translation is None:
+                logger.error("Všetky metódy prekladu zlyhali. Vraciam originálny text.")
+                translation = prepared
+            results[index] = translation
+
+        return results
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Modul pre prácu s URL adresami.
+Implementuje kanonický tvar URL adresy (kľúč úložiska článkov, cache odpovedí a textov).
+"""
+
+from urllib.parse import urlparse, urlunparse, parse_qsl, urlencode
+
+# Sledovacie parametre URL adries, ktoré neovplyvňujú obsah (utm_* sa odstraňujú vždy);
+# parametre ako ref či source môžu na niektorých portáloch určovať obsah, preto sa nechávajú
+TRACKING_PARAMS = {'fbclid', 'gclid', 'dclid', 'mc_cid', 'mc_eid', 'sznclid'}
+
+
+def canonicalize_url(url: str) -> str:
+    """
+    Vráti kanonický tvar URL adresy (bez fragmentu, sledovacích parametrov a koncového lomítka).
+
+    Args:
+        url: URL adresa.
+
+    Returns:
+        Kanonická URL adresa.
+    """
+    try:
+        parsed = urlparse(url.strip())
+    except Exception:
+        return url.strip()
+
+    query = [(key, value) for key, value in parse_qsl(parsed.query, keep_blank_values=True)
+             if not key.lower().startswith('utm_') and key.lower() not in TRACKING_PARAMS]
+    path = parsed.path.rstrip('/') or '/'
+
+    return urlunparse((
+        parsed.scheme.lower() or 'https',
+        parsed.netloc.lower(),
+        path,
+        parsed.params,
+        urlencode(sorted(query)),
+        ''
+    ))